@@ -0,0 +1,31 @@
+# food_rescuer/build_recipe_indexes.py
+# Offline step that precomputes the recipe index artifacts too slow to build mid-conversation
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.recipe_retrieval import RecipeRetriever
+
+def build_indexes(data_dir=None, k=20):
+    """
+    Build and save the recipe index artifacts next to the processed recipes
+
+    Args:
+        data_dir: Optional directory with processed_recipes.json (default data/processed)
+        k: Number of neighbours to keep per recipe in the similarity graph
+    """
+    print("Loading recipe database...")
+    recipe_retriever = RecipeRetriever(data_dir=data_dir)
+
+    recipe_retriever.save_instruction_index()
+    recipe_retriever.save_duplicate_clusters()
+    recipe_retriever.build_similarity_graph(k=k)
+
+    print("Recipe indexes built")
+
+if __name__ == "__main__":
+    # Usage: python build_recipe_indexes.py [data_dir]
+    build_indexes(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,270 @@
+# food_rescuer/intent_benchmark.py
+# Measures accuracy and latency of the intent classifiers on a labeled utterance corpus
+
+import os
+import sys
+import json
+import copy
+import time
+import contextlib
+import numpy as np
+from collections import Counter
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.intent_classifier import IntentClassifier
+from models.linear_intent_classifier import LinearIntentClassifier
+from utils.utterance_cache import UtteranceCache
+
+def build_corpus(regex_classifier, dl_classifier=None):
+    """
+    Build a labeled corpus from the classifiers' own examples
+
+    Args:
+        regex_classifier: IntentClassifier whose get_example_phrases are used
+        dl_classifier: Optional DeepLearningIntentClassifier whose intent_examples are used
+
+    Returns:
+        list: (text, intent) tuples without duplicates
+    """
+    corpus = []
+    if dl_classifier is not None:
+        for intent, examples in dl_classifier.intent_examples.items():
+            corpus.extend((text, intent) for text in examples)
+
+    for intent in regex_classifier.intent_patterns:
+        examples = regex_classifier.get_example_phrases(intent)
+        if examples != ["No examples available for this intent"]:
+            corpus.extend((text, intent) for text in examples)
+
+    return list(dict.fromkeys(corpus))
+
+def load_corpus(path):
+    """
+    Load a labeled corpus from a JSON list of {"text": ..., "intent": ...} objects
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        list: (text, intent) tuples
+    """
+    with open(path, 'r') as f:
+        return [(item['text'], item['intent']) for item in json.load(f)]
+
+def split_examples(intent_examples, holdout_every=5):
+    """
+    Split labeled examples into a training set and a held-out test set
+
+    Every holdout_every-th example of each intent is held out, so the split is
+    the same on every run.
+
+    Args:
+        intent_examples: Dict of intent -> list of example texts
+        holdout_every: One in this many examples is held out
+
+    Returns:
+        tuple: (dict of intent -> training examples, list of held-out (text, intent) tuples)
+    """
+    train_examples, held_out = {}, []
+    for intent, examples in intent_examples.items():
+        train_examples[intent] = [text for i, text in enumerate(examples) if i % holdout_every != holdout_every - 1]
+        held_out.extend((text, intent) for i, text in enumerate(examples) if i % holdout_every == holdout_every - 1)
+    return train_examples, held_out
+
+def _reset_caches(classifier):
+    """Empty any utterance cache so every input pays the full classification cost"""
+    for candidate in (classifier, getattr(classifier, '_dl_classifier', None)):
+        cache = getattr(candidate, 'cache', None)
+        if cache is not None:
+            cache.clear()
+
+def _stats_delta(before, after):
+    """Subtract two nested dicts of counters, e.g. two get_stats snapshots"""
+    if isinstance(after, dict):
+        return {key: _stats_delta(before.get(key, 0) if isinstance(before, dict) else 0, value)
+                for key, value in after.items()}
+    return after - before
+
+def evaluate_classifier(classifier, corpus):
+    """
+    Classify every utterance in the corpus, timing each call
+
+    Args:
+        classifier: Any object with a classify(text) method returning a dict with 'intent'
+        corpus: List of (text, intent) tuples
+
+    Returns:
+        dict: accuracy, per-intent precision/recall/f1/support, latency percentiles
+              (milliseconds) and throughput (utterances per second)
+    """
+    # Warm up lazily loaded models outside the measurement
+    classifier.classify("warm up")
+    _reset_caches(classifier)
+    stats_before = classifier.get_stats() if hasattr(classifier, 'get_stats') else None
+
+    predictions = []
+    latencies = []
+    for text, _ in corpus:
+        start_time = time.perf_counter()
+        result = classifier.classify(text)
+        latencies.append((time.perf_counter() - start_time) * 1000.0)
+        predictions.append(result['intent'])
+
+    # Tier counts of the sequential pass only (not the warm-up or the batch pass)
+    stats = _stats_delta(stats_before, classifier.get_stats()) if stats_before is not None else None
+
+    labels = [intent for _, intent in corpus]
+    true_positives = Counter(label for label, predicted in zip(labels, predictions) if label == predicted)
+    predicted_counts = Counter(predictions)
+    label_counts = Counter(labels)
+
+    per_intent = {}
+    for intent in sorted(label_counts):
+        precision = true_positives[intent] / predicted_counts[intent] if predicted_counts[intent] else 0.0
+        recall = true_positives[intent] / label_counts[intent]
+        per_intent[intent] = {
+            'precision': round(precision, 4),
+            'recall': round(recall, 4),
+            'f1': round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0,
+            'support': label_counts[intent]
+        }
+
+    latencies = np.array(latencies)
+    report = {
+        'utterances': len(corpus),
+        'accuracy': round(sum(true_positives.values()) / len(corpus), 4) if corpus else 0.0,
+        'per_intent': per_intent,
+        'latency_ms': {
+            'p50': round(float(np.percentile(latencies, 50)), 4),
+            'p95': round(float(np.percentile(latencies, 95)), 4),
+            'p99': round(float(np.percentile(latencies, 99)), 4),
+            'mean': round(float(latencies.mean()), 4)
+        } if len(latencies) else {},
+        'throughput_per_s': round(len(corpus) / (latencies.sum() / 1000.0), 1) if latencies.sum() else None
+    }
+
+    # Batched throughput for classifiers that support it
+    if hasattr(classifier, 'classify_batch') and corpus:
+        _reset_caches(classifier)
+        start_time = time.perf_counter()
+        classifier.classify_batch([text for text, _ in corpus])
+        elapsed = time.perf_counter() - start_time
+        report['batch_throughput_per_s'] = round(len(corpus) / elapsed, 1) if elapsed else None
+
+    if stats is not None:
+        report['classifier_stats'] = stats
+
+    return report
+
+def _held_out_embedding_classifier(dl_classifier, train_examples):
+    """
+    Copy of the embedding classifier that only knows the training examples
+
+    The copy gets its own cache and example matrix; nothing is saved to disk.
+    """
+    classifier = copy.copy(dl_classifier)
+    classifier.intent_examples = train_examples
+    classifier.intents = list(train_examples)
+    classifier.cache = UtteranceCache()
+    classifier._update_embeddings()
+    classifier._build_example_matrix()
+    return classifier
+
+def run_held_out(regex_classifier, dl_classifier):
+    """
+    Benchmark the classifiers on embedding examples they were not trained on
+
+    The embedding and linear classifiers are rebuilt from the training split
+    of the embedding classifier's examples and tested on the held-out split.
+    The regex patterns are hand-written, so for them this is just a smaller
+    test set.
+
+    Args:
+        regex_classifier: IntentClassifier
+        dl_classifier: DeepLearningIntentClassifier whose intent_examples are split
+
+    Returns:
+        dict: Train and test sizes and one report per classifier
+    """
+    train_examples, test_corpus = split_examples(dl_classifier.intent_examples)
+    classifiers = {'regex': regex_classifier}
+
+    if dl_classifier.model is not None:
+        classifiers['embedding'] = _held_out_embedding_classifier(dl_classifier, train_examples)
+
+    linear_classifier = LinearIntentClassifier()
+    linear_classifier.train([text for examples in train_examples.values() for text in examples],
+                            [intent for intent, examples in train_examples.items() for _ in examples])
+    classifiers['linear'] = linear_classifier
+
+    return {
+        'train_size': sum(len(examples) for examples in train_examples.values()),
+        'test_size': len(test_corpus),
+        'classifiers': {name: evaluate_classifier(classifier, test_corpus) for name, classifier in classifiers.items()}
+    }
+
+def run_benchmark(corpus_path=None):
+    """
+    Benchmark the pattern, deep learning, cascading and linear classifiers
+
+    The deep learning classifier (and the cascade that uses it) is skipped
+    when its sentence transformer model can't be loaded, and the linear
+    classifier when it hasn't been trained yet.
+
+    The default corpus is the classifiers' own training examples, so its
+    accuracies are training-set accuracies (the embedding classifier scores
+    nearly 100% by construction). The report therefore also has a 'held_out'
+    section (see run_held_out) measuring accuracy on unseen examples.
+
+    Args:
+        corpus_path: Optional JSON corpus; by default the classifiers' examples are used
+
+    Returns:
+        dict: Corpus size and source, one report per classifier and, for the
+              default corpus, the held-out reports
+    """
+    regex_classifier = IntentClassifier()
+    classifiers = {'regex': regex_classifier}
+
+    dl_classifier = None
+    try:
+        from models.dl_intent_classifier import DeepLearningIntentClassifier
+        from models.cascade_intent_classifier import CascadeIntentClassifier
+        dl_classifier = DeepLearningIntentClassifier()
+        if dl_classifier.model is not None:
+            classifiers['embedding'] = dl_classifier
+            classifiers['cascade'] = CascadeIntentClassifier(regex_classifier, dl_classifier)
+    except Exception as e:
+        print(f"Skipping the deep learning classifiers: {e}", file=sys.stderr)
+
+    linear_classifier = LinearIntentClassifier()
+    if linear_classifier.weights is not None:
+        classifiers['linear'] = linear_classifier
+
+    corpus = load_corpus(corpus_path) if corpus_path else build_corpus(regex_classifier, dl_classifier)
+
+    report = {
+        'corpus_size': len(corpus),
+        'corpus_source': corpus_path or 'classifier training examples',
+        'classifiers': {name: evaluate_classifier(classifier, corpus) for name, classifier in classifiers.items()}
+    }
+    if not corpus_path and dl_classifier is not None:
+        report['held_out'] = run_held_out(regex_classifier, dl_classifier)
+    return report
+
+if __name__ == "__main__":
+    # Usage: python intent_benchmark.py [corpus.json] [report.json]
+    corpus_path = sys.argv[1] if len(sys.argv) > 1 else None
+
+    # Keep model loading messages out of the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = json.dumps(run_benchmark(corpus_path), indent=2)
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'w') as f:
+            f.write(report)
+        print(f"Saved benchmark report to {sys.argv[2]}", file=sys.stderr)
+    else:
+        print(report)
@@ -0,0 +1,140 @@
+# food_rescuer/models/cascade_intent_classifier.py
+# Tiered intent classification: regex patterns first, sentence embeddings only when needed
+
+import time
+import bisect
+from collections import Counter
+from models.intent_classifier import IntentClassifier
+
+class CascadeIntentClassifier:
+    """
+    Runs the pattern-based IntentClassifier first and only falls back to the
+    deep learning classifier when no pattern matched the whole input
+
+    Tiers:
+        regex: an anchored pattern matched (confidence 1.0), accepted immediately
+        embedding: the deep learning classifier recognized the input
+        fallback: the deep learning classifier didn't, so the pattern result
+                  (partial match, ingredient discussion or unknown) is kept
+    """
+
+    TIERS = ('regex', 'embedding', 'fallback')
+
+    # Upper bounds (in milliseconds) of the latency histogram buckets; the last bucket is open
+    LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+    def __init__(self, regex_classifier=None, dl_classifier=None, model_name='all-MiniLM-L6-v2', cache=None):
+        """
+        Initialize the cascade
+
+        Args:
+            regex_classifier: Optional IntentClassifier instance
+            dl_classifier: Optional DeepLearningIntentClassifier instance; if not given one
+                           is created the first time an input needs it
+            model_name: Sentence transformer model for the lazily created classifier
+            cache: Optional UtteranceCache for the lazily created classifier
+        """
+        self.regex_classifier = regex_classifier or IntentClassifier()
+        self._dl_classifier = dl_classifier
+        self.model_name = model_name
+        self.cache = cache
+
+        self.tier_counts = Counter()
+        self.latency_histograms = {tier: [0] * (len(self.LATENCY_BUCKETS_MS) + 1) for tier in self.TIERS}
+
+    @property
+    def dl_classifier(self):
+        """Deep learning classifier, loaded on first use"""
+        if self._dl_classifier is None:
+            # Imported here so regex-only sessions never load the transformer
+            from models.dl_intent_classifier import DeepLearningIntentClassifier
+            self._dl_classifier = DeepLearningIntentClassifier(self.model_name, cache=self.cache)
+        return self._dl_classifier
+
+    def classify(self, text):
+        """
+        Classify the user's input into an intent
+
+        Args:
+            text: User input text
+
+        Returns:
+            dict: Intent classification with entities, plus the 'tier' that produced it
+        """
+        start_time = time.perf_counter()
+
+        regex_result = self.regex_classifier.classify(text)
+        if regex_result['confidence'] >= 1.0:
+            result, tier = regex_result, 'regex'
+        else:
+            result, tier = self._combine(regex_result, self.dl_classifier.classify(text))
+
+        self._record(tier, (time.perf_counter() - start_time) * 1000.0)
+        result['tier'] = tier
+        return result
+
+    def classify_batch(self, texts):
+        """
+        Classify many user inputs, sending only the unresolved ones to the embedding model
+
+        Latency is recorded as the batch time per input.
+
+        Args:
+            texts: List of user input texts
+
+        Returns:
+            list: One classification dict per text, as classify would return
+        """
+        start_time = time.perf_counter()
+
+        results = self.regex_classifier.classify_batch(texts)
+        tiers = ['regex'] * len(results)
+        unresolved = [i for i, result in enumerate(results) if result['confidence'] < 1.0]
+        if unresolved:
+            dl_results = self.dl_classifier.classify_batch([texts[i] for i in unresolved])
+            for i, dl_result in zip(unresolved, dl_results):
+                results[i], tiers[i] = self._combine(results[i], dl_result)
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000.0 / max(len(texts), 1)
+        for result, tier in zip(results, tiers):
+            self._record(tier, elapsed_ms)
+            result['tier'] = tier
+        return results
+
+    def _combine(self, regex_result, dl_result):
+        """
+        Pick between a partial/unknown pattern result and the embedding result
+
+        Args:
+            regex_result: Result of the pattern-based classifier
+            dl_result: Result of the deep learning classifier
+
+        Returns:
+            tuple: (result, tier)
+        """
+        if dl_result['intent'] == 'unknown':
+            return regex_result, 'fallback'
+
+        # Pattern captures are more precise than the embedding classifier's extraction
+        if dl_result['intent'] == regex_result['intent'] and regex_result['entities']:
+            dl_result['entities'] = regex_result['entities']
+        return dl_result, 'embedding'
+
+    def _record(self, tier, elapsed_ms):
+        """Count a classification and add its latency to the tier's histogram"""
+        self.tier_counts[tier] += 1
+        self.latency_histograms[tier][bisect.bisect_left(self.LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def get_stats(self):
+        """
+        Get per-tier counts and latency histograms
+
+        Returns:
+            dict: 'counts' of tier -> classifications and 'latency_ms' of tier ->
+                  {bucket label -> count}, where '<=N' counts latencies up to N ms
+        """
+        labels = [f"<={bound}" for bound in self.LATENCY_BUCKETS_MS] + [f">{self.LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            'counts': {tier: self.tier_counts[tier] for tier in self.TIERS},
+            'latency_ms': {tier: dict(zip(labels, self.latency_histograms[tier])) for tier in self.TIERS}
+        }
@@ -0,0 +1,144 @@
+# food_rescuer/models/ingredient_hierarchy.py
+# Taxonomy of ingredient names used to expand generic terms ("cheese") to specific ones
+
+import re
+import numpy as np
+from collections import defaultdict
+from utils.ingredient_normalizer import singularize, canonicalize_ingredient
+
+def ingredient_tokens(name):
+    """
+    Split an ingredient name into its set of singular word tokens
+
+    Args:
+        name: Ingredient name
+
+    Returns:
+        frozenset: Word tokens (digits and fractions are ignored)
+    """
+    return frozenset(singularize(word) for word in re.findall(r'[a-z]+', name.lower()))
+
+class IngredientHierarchy:
+    """
+    Directed acyclic graph of ingredient names with precomputed closures
+
+    An ingredient is an ancestor of another when its tokens are a subset of the
+    other's ("cheese" -> "cheddar cheese"), and a category is an ancestor
+    of every ingredient containing one of its members ("dairy" -> "skim milk").
+    Names with the same tokens ("egg", "eggs") are ancestors of each other.
+    Ingredient nodes keep the ids of the names they are built from; category
+    nodes that are not also ingredients get ids after them.
+    """
+
+    def __init__(self, ingredient_names, category_maps=None):
+        """
+        Build the hierarchy and its ancestor/descendant closures
+
+        Args:
+            ingredient_names: List of ingredient names; node i is ingredient_names[i]
+            category_maps: Optional list of dicts mapping ingredient -> category name
+        """
+        self.num_ingredients = len(ingredient_names)
+        self.node_names = list(ingredient_names)
+        self.node_ids = {name: i for i, name in enumerate(self.node_names)}
+        self.node_tokens = [ingredient_tokens(name) for name in self.node_names]
+
+        # Token -> ingredient nodes containing it
+        self.token_postings = defaultdict(list)
+        for i, tokens in enumerate(self.node_tokens):
+            for token in tokens:
+                self.token_postings[token].append(i)
+        self.token_postings = {token: np.array(nodes, dtype=np.int32)
+                               for token, nodes in self.token_postings.items()}
+
+        # Category members from every source
+        members = defaultdict(set)
+        for category_map in category_maps or []:
+            for ingredient, category in category_map.items():
+                if category:
+                    members[canonicalize_ingredient(category)].add(ingredient.lower())
+        for category in members:
+            if category not in self.node_ids:
+                self.node_ids[category] = len(self.node_names)
+                self.node_names.append(category)
+                self.node_tokens.append(frozenset())
+
+        # Descendant closures: token supersets, plus everything containing a category member
+        descendants = []
+        for i, name in enumerate(self.node_names):
+            related = [self._supersets(self.node_tokens[i])] if self.node_tokens[i] else []
+            related.extend(self._supersets(ingredient_tokens(member)) for member in members.get(name, ()))
+            nodes = np.unique(np.concatenate(related)) if related else np.zeros(0, dtype=np.int32)
+            descendants.append(nodes[nodes != i])
+
+        self.descendant_indptr = np.zeros(len(descendants) + 1, dtype=np.int64)
+        np.cumsum([len(nodes) for nodes in descendants], out=self.descendant_indptr[1:])
+        self.descendant_ids = (np.concatenate(descendants).astype(np.int32) if descendants
+                               else np.zeros(0, dtype=np.int32))
+
+        # Ancestor closures are the transpose of the descendant closures
+        owners = np.repeat(np.arange(len(descendants), dtype=np.int32), np.diff(self.descendant_indptr))
+        order = np.lexsort((owners, self.descendant_ids))
+        self.ancestor_ids = owners[order]
+        self.ancestor_indptr = np.zeros(len(descendants) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.descendant_ids, minlength=len(descendants)), out=self.ancestor_indptr[1:])
+
+        print(f"Built ingredient hierarchy with {len(self.node_names)} nodes "
+              f"({len(self.descendant_ids)} ancestor links)")
+
+    def _supersets(self, tokens):
+        """Get the ingredient nodes whose tokens include all of the given tokens"""
+        nodes = None
+        for token in sorted(tokens, key=lambda t: len(self.token_postings.get(t, ()))):
+            postings = self.token_postings.get(token)
+            if postings is None:
+                return np.zeros(0, dtype=np.int32)
+            nodes = postings if nodes is None else np.intersect1d(nodes, postings, assume_unique=True)
+            if len(nodes) == 0:
+                break
+        return nodes if nodes is not None else np.zeros(0, dtype=np.int32)
+
+    def _subsets(self, tokens):
+        """Get the ingredient nodes whose (non-empty) tokens all appear in the given tokens"""
+        postings = [self.token_postings[token] for token in tokens if token in self.token_postings]
+        if not postings:
+            return np.zeros(0, dtype=np.int32)
+        nodes, hits = np.unique(np.concatenate(postings), return_counts=True)
+        sizes = np.array([len(self.node_tokens[i]) for i in nodes])
+        return nodes[hits == sizes].astype(np.int32)
+
+    def descendants(self, name):
+        """Get the node ids of every ingredient more specific than name (excluding itself)"""
+        i = self.node_ids.get(name)
+        if i is None:
+            tokens = ingredient_tokens(name)
+            return self._supersets(tokens) if tokens else np.zeros(0, dtype=np.int32)
+        return self.descendant_ids[self.descendant_indptr[i]:self.descendant_indptr[i + 1]]
+
+    def ancestors(self, name):
+        """Get the node ids of every ingredient or category more generic than name (excluding itself)"""
+        i = self.node_ids.get(name)
+        if i is None:
+            return self._subsets(ingredient_tokens(name))
+        return self.ancestor_ids[self.ancestor_indptr[i]:self.ancestor_indptr[i + 1]]
+
+    def related_ingredients(self, name):
+        """
+        Get the ingredient nodes a pantry item can stand in for or be satisfied by
+
+        This is the item itself, its descendants (a generic "cheese" covers
+        "cheddar cheese") and its ingredient ancestors ("cheddar cheese" covers
+        a recipe that just asks for "cheese").
+
+        Args:
+            name: Ingredient or category name
+
+        Returns:
+            numpy.ndarray: Sorted ingredient node ids (ids below num_ingredients)
+        """
+        nodes = [self.descendants(name), self.ancestors(name)]
+        i = self.node_ids.get(name)
+        if i is not None:
+            nodes.append(np.array([i], dtype=np.int32))
+        nodes = np.unique(np.concatenate(nodes))
+        return nodes[nodes < self.num_ingredients].astype(np.int32)
@@ -0,0 +1,352 @@
+# food_rescuer/models/linear_intent_classifier.py
+# Lightweight intent classifier: logistic regression over hashed n-grams, distilled from the embedding model
+
+import os
+import sys
+import re
+import zlib
+import numpy as np
+
+# Add parent directory to path so the module also runs as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.utterance_cache import normalize_utterance
+from utils.entity_extraction import extract_ingredients
+
+class LinearIntentClassifier:
+    """
+    Multinomial logistic regression over hashed word and character n-grams
+
+    Trained in plain NumPy on labeled examples plus pseudo-labels from the
+    DeepLearningIntentClassifier (see distill), so classification needs no
+    transformer at all. Implements the same classify contract as the other
+    intent classifiers and can be passed to ConversationManager directly.
+    """
+
+    # Maximum number of words whose feature ids are cached
+    WORD_CACHE_SIZE = 50000
+
+    def __init__(self, num_features=2 ** 16, min_confidence=0.5, model_path=None):
+        """
+        Initialize the classifier, loading a saved model if there is one
+
+        Args:
+            num_features: Number of hash buckets for the n-gram features
+            min_confidence: Minimum probability for an intent to be returned
+            model_path: Optional .npz file for the model (default: data/processed/linear_intent_model.npz)
+        """
+        self.num_features = num_features
+        self.min_confidence = min_confidence
+        self.model_path = model_path or os.path.join(self._get_data_dir(), 'linear_intent_model.npz')
+
+        self.intents = []
+        self.weights = None
+        self.bias = None
+        self._word_ids = {}
+
+        if os.path.exists(self.model_path):
+            self.load()
+
+    def _get_data_dir(self):
+        """Get the data directory for storing the model"""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        project_dir = os.path.dirname(current_dir)
+        return os.path.join(project_dir, 'data', 'processed')
+
+    def _word_features(self, word):
+        """
+        Get the hashed feature ids of a word: the word itself plus its character 3-5 grams
+
+        crc32 is used as the hash because, unlike hash(), it is stable across runs.
+        Ids are cached per word since the vocabulary of user inputs is small.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            numpy.ndarray: Feature ids
+        """
+        ids = self._word_ids.get(word)
+        if ids is None:
+            marked = f"<{word}>"
+            grams = [f"w:{word}"] + [f"c:{marked[i:i + n]}" for n in (3, 4, 5) for i in range(len(marked) - n + 1)]
+            ids = np.array([zlib.crc32(gram.encode('utf-8')) for gram in grams], dtype=np.int64) % self.num_features
+            if len(self._word_ids) < self.WORD_CACHE_SIZE:
+                self._word_ids[word] = ids
+        return ids
+
+    def _features(self, text):
+        """
+        Hash a text into its n-gram feature ids
+
+        Features are the word and character n-grams of every word plus the word
+        bigrams. Repeated n-grams keep their repeats, so the feature vector is
+        the n-gram counts; it is scaled by 1/sqrt(len(ids)) wherever it is used.
+
+        Args:
+            text: User input text
+
+        Returns:
+            numpy.ndarray: Feature ids (empty if the text has no words)
+        """
+        words = re.findall(r"[a-z0-9']+", normalize_utterance(text))
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+
+        bigrams = [zlib.crc32(f"b:{first} {second}".encode('utf-8')) for first, second in zip(words, words[1:])]
+        return np.concatenate([self._word_features(word) for word in words] +
+                              [np.array(bigrams, dtype=np.int64) % self.num_features])
+
+    def _feature_matrix(self, texts):
+        """
+        Build the sparse feature matrix of several texts
+
+        Args:
+            texts: List of texts
+
+        Returns:
+            tuple: (concatenated feature ids, number of ids per text)
+        """
+        features = [self._features(text) for text in texts]
+        lengths = np.array([len(ids) for ids in features], dtype=np.int64)
+        return (np.concatenate(features) if features else np.zeros(0, dtype=np.int64)), lengths
+
+    def _sum_groups(self, values, lengths):
+        """
+        Sum consecutive groups of rows
+
+        Args:
+            values: 2D array of rows
+            lengths: Number of rows in each group (empty groups sum to zero)
+
+        Returns:
+            numpy.ndarray: One summed row per group
+        """
+        sums = np.zeros((len(lengths), values.shape[1]), dtype=np.float64)
+        nonempty = lengths > 0
+        if nonempty.any():
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            sums[nonempty] = np.add.reduceat(values, starts[nonempty], axis=0)
+        return sums
+
+    def _logits(self, weights, bias, ids, lengths):
+        """Multiply a sparse feature matrix by the weights"""
+        scale = 1.0 / np.sqrt(np.maximum(lengths, 1))
+        return self._sum_groups(weights[ids], lengths) * scale[:, None] + bias
+
+    def _softmax(self, logits):
+        """Row-wise softmax"""
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exponentials = np.exp(logits)
+        return exponentials / exponentials.sum(axis=-1, keepdims=True)
+
+    def train(self, texts, labels, sample_weights=None, epochs=200, learning_rate=0.1, l2=1e-4):
+        """
+        Fit the model with full-batch Adam on the softmax cross-entropy
+
+        Only the hash buckets that occur in the training texts are optimized;
+        the others keep a zero weight.
+
+        Args:
+            texts: List of training texts
+            labels: Intent of each text ('unknown' is learned like any other intent)
+            sample_weights: Optional weight per text (e.g. lower for pseudo-labels)
+            epochs: Number of gradient steps
+            learning_rate: Adam step size
+            l2: L2 regularization strength
+
+        Returns:
+            bool: False if no text had any features (or weight), leaving the model unchanged
+        """
+        sample_weights = np.ones(len(texts)) if sample_weights is None else np.asarray(sample_weights, dtype=np.float64)
+        ids, lengths = self._feature_matrix(texts)
+
+        # Texts without any word carry no signal
+        keep = lengths > 0
+        if not keep.any() or sample_weights[keep].sum() <= 0:
+            print("No training text has any features, keeping the current model")
+            return False
+        labels = [label for label, kept in zip(labels, keep) if kept]
+        sample_weights = sample_weights[keep] / sample_weights[keep].sum()
+        lengths = lengths[keep]
+
+        self.intents = list(dict.fromkeys(labels))
+        intent_ids = {intent: i for i, intent in enumerate(self.intents)}
+        targets = np.zeros((len(labels), len(self.intents)))
+        targets[np.arange(len(labels)), [intent_ids[label] for label in labels]] = 1.0
+
+        # Compact the hash buckets to the ones in use and group the entries by bucket
+        buckets, columns = np.unique(ids, return_inverse=True)
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        scale = 1.0 / np.sqrt(lengths)
+        order = np.argsort(columns, kind='stable')
+        column_lengths = np.bincount(columns, minlength=len(buckets))
+
+        weights = np.zeros((len(buckets), len(self.intents)))
+        bias = np.zeros(len(self.intents))
+
+        # Adam moments
+        moments = [np.zeros_like(weights), np.zeros_like(bias)]
+        squares = [np.zeros_like(weights), np.zeros_like(bias)]
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+
+        print(f"Training linear intent classifier on {len(labels)} examples, {len(self.intents)} intents...")
+        for step in range(1, epochs + 1):
+            probabilities = self._softmax(self._logits(weights, bias, columns, lengths))
+            errors = (probabilities - targets) * (sample_weights * scale)[:, None]
+
+            # Transposed sparse product: sum each bucket's entries of the row errors
+            weight_gradient = self._sum_groups(errors[rows[order]], column_lengths) + l2 * weights
+            gradients = (weight_gradient, (probabilities - targets).T @ sample_weights)
+
+            for parameter, gradient, moment, square in zip((weights, bias), gradients, moments, squares):
+                moment *= beta1
+                moment += (1 - beta1) * gradient
+                square *= beta2
+                square += (1 - beta2) * gradient ** 2
+                parameter -= learning_rate * (moment / (1 - beta1 ** step)) / (np.sqrt(square / (1 - beta2 ** step)) + epsilon)
+
+        predictions = self._logits(weights, bias, columns, lengths).argmax(axis=1)
+        accuracy = (predictions == targets.argmax(axis=1)).mean() if len(labels) else 0.0
+        print(f"Training accuracy: {accuracy:.3f}")
+
+        self.weights = np.zeros((self.num_features, len(self.intents)), dtype=np.float32)
+        self.weights[buckets] = weights
+        self.bias = bias.astype(np.float32)
+        return True
+
+    def distill(self, dl_classifier, utterances=(), pseudo_label_weight=0.5, **train_args):
+        """
+        Train on the embedding classifier's examples plus its labels for logged utterances
+
+        Args:
+            dl_classifier: DeepLearningIntentClassifier (only its intent_examples and
+                           classify_batch are used, so this module never imports it)
+            utterances: Unlabeled user utterances (e.g. from conversation logs)
+            pseudo_label_weight: Training weight of a pseudo-labeled utterance
+                                 relative to a hand-written example
+            **train_args: Passed on to train
+        """
+        texts, labels, weights = [], [], []
+        for intent, examples in dl_classifier.intent_examples.items():
+            texts.extend(examples)
+            labels.extend([intent] * len(examples))
+            weights.extend([1.0] * len(examples))
+
+        known = set(texts)
+        utterances = [text for text in dict.fromkeys(utterances) if text and text not in known]
+        if utterances:
+            print(f"Labeling {len(utterances)} logged utterances with the embedding classifier...")
+            for text, result in zip(utterances, dl_classifier.classify_batch(utterances)):
+                texts.append(text)
+                labels.append(result['intent'])
+                weights.append(pseudo_label_weight)
+
+        if self.train(texts, labels, weights, **train_args):
+            self.save()
+
+    def classify(self, text):
+        """
+        Classify user input text into an intent
+
+        Args:
+            text: User input text
+
+        Returns:
+            dict: Intent classification with confidence score and entities
+        """
+        if not text or self.weights is None:
+            return {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+
+        ids = self._features(text)
+        if not len(ids):
+            return {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+
+        logits = self.weights[ids].sum(axis=0) / np.sqrt(len(ids)) + self.bias
+        return self._classification_result(text, self._softmax(logits))
+
+    def classify_batch(self, texts):
+        """
+        Classify many user inputs with one sparse matrix product
+
+        Args:
+            texts: List of user input texts
+
+        Returns:
+            list: One classification dict per text, as classify would return
+        """
+        if self.weights is None:
+            return [{'intent': 'unknown', 'confidence': 0.0, 'entities': {}} for _ in texts]
+
+        ids, lengths = self._feature_matrix([text or '' for text in texts])
+        probabilities = self._softmax(self._logits(self.weights, self.bias, ids, lengths))
+        return [self._classification_result(text, row) if length else
+                {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+                for text, row, length in zip(texts, probabilities, lengths)]
+
+    def _classification_result(self, text, probabilities):
+        """Turn a text's intent probabilities into a classification with entities"""
+        best = int(np.argmax(probabilities))
+        intent, confidence = self.intents[best], float(probabilities[best])
+        if confidence < self.min_confidence:
+            intent = 'unknown'
+
+        entities = {}
+        if intent in ('search_by_ingredients', 'declare_ingredients'):
+            ingredients = extract_ingredients(text)
+            if ingredients:
+                entities['ingredients'] = ingredients
+
+        return {'intent': intent, 'confidence': confidence, 'entities': entities}
+
+    def save(self):
+        """Save the model, replacing any previous one atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.model_path)), exist_ok=True)
+        temp_path = self.model_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, weights=self.weights, bias=self.bias, intents=np.array(self.intents),
+                     num_features=self.num_features)
+        os.replace(temp_path, self.model_path)
+        print(f"Saved linear intent classifier to {self.model_path}")
+
+    def load(self):
+        """Load a saved model"""
+        try:
+            with np.load(self.model_path) as data:
+                self.weights = data['weights']
+                self.bias = data['bias']
+                self.intents = data['intents'].tolist()
+                self.num_features = int(data['num_features'])
+            self._word_ids = {}
+            print(f"Loaded linear intent classifier from {self.model_path}")
+        except Exception as e:
+            print(f"Error loading linear intent classifier: {e}")
+            self.weights = self.bias = None
+
+# Train the classifier if run directly
+if __name__ == "__main__":
+    from models.dl_intent_classifier import DeepLearningIntentClassifier
+
+    # Optional log file with one user utterance per line for pseudo-labeling
+    utterances = []
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            utterances = [line.strip() for line in f if line.strip()]
+
+    classifier = LinearIntentClassifier()
+    classifier.distill(DeepLearningIntentClassifier(), utterances)
+
+    test_inputs = [
+        "What can I make with eggs, flour, and milk?",
+        "I have cheese, tomatoes, and basil",
+        "Show me that recipe",
+        "What's the next step?",
+        "Yes",
+        "No",
+        "Hello"
+    ]
+
+    print("\nTesting linear intent classification:")
+    for input_text in test_inputs:
+        result = classifier.classify(input_text)
+        print(f"Input: {input_text} -> {result['intent']} (confidence: {result['confidence']:.4f})")
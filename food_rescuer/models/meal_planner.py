@@ -0,0 +1,115 @@
+# food_rescuer/models/meal_planner.py
+# Plans a set of meals that together use as much of the pantry as possible
+
+import heapq
+import numpy as np
+
+class MealPlanner:
+    """Picks several recipes that jointly cover the user's available ingredients"""
+
+    def __init__(self, recipe_retriever):
+        """
+        Initialize the meal planner
+
+        Args:
+            recipe_retriever: RecipeRetriever instance whose index is used for planning
+        """
+        self.recipe_retriever = recipe_retriever
+
+        # Per-recipe attributes used by the optional limits
+        recipes = recipe_retriever.recipes
+        self.recipe_minutes = np.array(
+            [recipe.get('minutes') or 0 for recipe in recipes], dtype=np.float64
+        )
+        self.recipe_calories = np.array(
+            [recipe['nutrition'][0] if recipe.get('nutrition') else 0 for recipe in recipes],
+            dtype=np.float64
+        )
+
+    def plan_meals(self, available_ingredients, num_meals=7, max_minutes=None, max_calories=None,
+                   ingredient_weights=None, exclude_ingredients=None):
+        """
+        Plan meals that use up as many of the available ingredients as possible
+
+        Covering the pantry is a submodular set-cover problem, so the plan is built
+        greedily: each step adds the recipe that covers the most (weighted) pantry
+        items not yet used. Gains only shrink as the plan grows, which lets a
+        priority queue re-evaluate just the recipes at the top (lazy greedy).
+
+        Args:
+            available_ingredients: List of ingredients the user has
+            num_meals: Number of recipes to pick
+            max_minutes: Optional maximum preparation time per recipe
+            max_calories: Optional maximum calories per recipe
+            ingredient_weights: Optional dict of ingredient -> weight (default 1.0 each)
+            exclude_ingredients: Optional ingredients or allergen groups to avoid
+
+        Returns:
+            dict: 'meals' as a list of (recipe, used_ingredients) tuples in the order
+                  they were picked, plus the 'covered' and 'uncovered' ingredients
+        """
+        retriever = self.recipe_retriever
+        ingredient_weights = ingredient_weights or {}
+
+        # Distinct pantry items, keyed by parsed name
+        pantry = {}
+        for ingredient in available_ingredients:
+            name = retriever.parse_user_ingredients([ingredient])[0]
+            pantry.setdefault(name, ingredient)
+        pantry_names = list(pantry.keys())
+        weights = np.array([ingredient_weights.get(pantry[name], 1.0) for name in pantry_names])
+
+        # Invert the pantry postings into recipe -> pantry items it uses
+        item_recipes = [retriever.recipes_with_ingredient(name) for name in pantry_names]
+        if not item_recipes or not sum(len(recipes) for recipes in item_recipes):
+            return {'meals': [], 'covered': [], 'uncovered': list(pantry.values())}
+
+        recipe_column = np.concatenate(item_recipes)
+        item_column = np.repeat(np.arange(len(pantry_names)), [len(recipes) for recipes in item_recipes])
+
+        # Apply the optional limits before planning
+        allowed = np.ones(len(recipe_column), dtype=bool)
+        if max_minutes is not None:
+            allowed &= self.recipe_minutes[recipe_column] <= max_minutes
+        if max_calories is not None:
+            allowed &= self.recipe_calories[recipe_column] <= max_calories
+        if exclude_ingredients:
+            allowed &= ~np.isin(recipe_column, retriever.excluded_recipe_indices(exclude_ingredients))
+        recipe_column, item_column = recipe_column[allowed], item_column[allowed]
+
+        order = np.argsort(recipe_column, kind='stable')
+        recipe_column, item_column = recipe_column[order], item_column[order]
+        recipe_ids, starts = np.unique(recipe_column, return_index=True)
+        recipe_items = np.split(item_column, starts[1:]) if len(recipe_ids) else []
+
+        # Initial gains are the full weight of each recipe's pantry items;
+        # ties go to recipes with fewer ingredients (less to buy)
+        heap = [
+            (-weights[items].sum(), retriever.recipe_ingredient_counts[recipe_idx], recipe_idx, position)
+            for position, (recipe_idx, items) in enumerate(zip(recipe_ids, recipe_items))
+        ]
+        heapq.heapify(heap)
+
+        covered = np.zeros(len(pantry_names), dtype=bool)
+        meals = []
+        while heap and len(meals) < num_meals:
+            neg_gain, size, recipe_idx, position = heapq.heappop(heap)
+            items = recipe_items[position]
+            gain = weights[items[~covered[items]]].sum()
+
+            if gain <= 0:
+                continue
+
+            # Stale bound: push back with the current gain unless it still beats the next entry
+            if heap and (-gain, size, recipe_idx) > heap[0][:3]:
+                heapq.heappush(heap, (-gain, size, recipe_idx, position))
+                continue
+
+            covered[items] = True
+            meals.append((retriever.recipes[recipe_idx], [pantry[pantry_names[i]] for i in np.unique(items)]))
+
+        return {
+            'meals': meals,
+            'covered': [pantry[name] for name, flag in zip(pantry_names, covered) if flag],
+            'uncovered': [pantry[name] for name, flag in zip(pantry_names, covered) if not flag]
+        }
@@ -1,1013 +1,2468 @@
-# # food_rescuer/models/recipe_retrieval.py
-# # Recipe search and ranking system based on available ingredients
-
-# import os
-# import json
-# import numpy as np
-# from collections import defaultdict
-# from sentence_transformers import SentenceTransformer
-
-# class RecipeRetriever:
-#     """Searches for and ranks recipes based on available ingredients"""
-    
-#     def __init__(self, data_dir=None, embedding_model='all-MiniLM-L6-v2'):
-#         """
-#         Initialize the recipe retriever
-        
-#         Args:
-#             data_dir: Directory containing the processed recipe data
-#             embedding_model: Name of the sentence transformer model to use
-#         """
-#         # Set default data directory if not provided
-#         if data_dir is None:
-#             # Get the directory where this script is located
-#             current_dir = os.path.dirname(os.path.abspath(__file__))
-#             # Go up one level to the project root
-#             project_dir = os.path.dirname(current_dir)
-#             data_dir = os.path.join(project_dir, 'data', 'processed')
-        
-#         self.data_dir = data_dir
-#         self.recipes = []
-#         self.ingredient_to_recipes = defaultdict(list)
-#         self.recipe_embeddings = None
-#         self.recipe_ingredients = []
-        
-#         # Load the sentence transformer model for semantic search
-#         try:
-#             self.embedding_model = SentenceTransformer(embedding_model)
-#             self.use_semantic_search = True
-#         except:
-#             print("Warning: Sentence transformer model not available, falling back to keyword search")
-#             self.use_semantic_search = False
-        
-#         # Load recipes
-#         self._load_recipes()
-        
-#         # Create ingredient index for faster lookup
-#         self._create_ingredient_index()
-        
-#         # Pre-compute recipe embeddings for semantic search if available
-#         if self.use_semantic_search:
-#             self._compute_recipe_embeddings()
-    
-#     def _load_recipes(self):
-#         """Load recipes from the processed data directory"""
-#         recipes_path = os.path.join(self.data_dir, 'processed_recipes.json')
-        
-#         if not os.path.exists(recipes_path):
-#             print(f"Warning: No processed recipes found at {recipes_path}")
-#             return
-        
-#         with open(recipes_path, 'r') as f:
-#             self.recipes = json.load(f)
-        
-#         print(f"Loaded {len(self.recipes)} recipes")
-    
-#     def _create_ingredient_index(self):
-#         """Create an index mapping ingredients to recipes for faster search"""
-#         print("Creating ingredient index...")
-        
-#         for i, recipe in enumerate(self.recipes):
-#             for ingredient in recipe.get('ingredients', []):
-#                 ingredient_lower = ingredient.lower()
-#                 self.ingredient_to_recipes[ingredient_lower].append(i)
-        
-#         print(f"Created index with {len(self.ingredient_to_recipes)} ingredients")
-    
-#     def _compute_recipe_embeddings(self):
-#         """Compute ingredient embeddings for all recipes to enable semantic search"""
-#         if not self.recipes or not self.use_semantic_search:
-#             return
-        
-#         print("Computing recipe embeddings for semantic search...")
-        
-#         # Extract ingredient lists as text
-#         self.recipe_ingredients = [
-#             ' '.join(recipe.get('ingredients', [])) for recipe in self.recipes
-#         ]
-        
-#         # Compute embeddings
-#         self.recipe_embeddings = self.embedding_model.encode(self.recipe_ingredients)
-        
-#         print("Recipe embeddings computed")
-    
-#     def find_recipes(self, available_ingredients, max_results=10, min_ingredients_matched=1, search_mode='coverage'):
-#         """
-#         Find recipes that can be made with available ingredients
-        
-#         Args:
-#             available_ingredients: List of ingredients the user has
-#             max_results: Maximum number of recipes to return
-#             min_ingredients_matched: Minimum number of ingredients that must match
-#             search_mode: 'coverage' (% of recipe ingredients available) or 
-#                         'count' (total number of matching ingredients) or
-#                         'semantic' (semantic similarity to available ingredients)
-            
-#         Returns:
-#             list: List of (recipe, score, matched_ingredients, missing_ingredients) tuples
-#         """
-#         if not self.recipes:
-#             return []
-        
-#         # Normalize ingredient names
-#         available_ingredients = [ing.lower() for ing in available_ingredients]
-        
-#         if search_mode == 'semantic' and self.use_semantic_search:
-#             return self._semantic_search(available_ingredients, max_results)
-#         else:
-#             return self._keyword_search(available_ingredients, max_results, min_ingredients_matched, search_mode)
-    
-#     def _keyword_search(self, available_ingredients, max_results, min_ingredients_matched, search_mode):
-#         """Find recipes using keyword matching of ingredients"""
-#         # Find candidate recipes (any recipe that uses at least one available ingredient)
-#         candidate_recipes = set()
-#         for ingredient in available_ingredients:
-#             candidate_recipes.update(self.ingredient_to_recipes.get(ingredient, []))
-        
-#         # Score candidate recipes
-#         recipe_scores = []
-        
-#         for recipe_idx in candidate_recipes:
-#             recipe = self.recipes[recipe_idx]
-#             recipe_ingredients = [ing.lower() for ing in recipe.get('ingredients', [])]
-            
-#             # Find matching and missing ingredients
-#             matched_ingredients = [ing for ing in recipe_ingredients if ing in available_ingredients]
-#             missing_ingredients = [ing for ing in recipe_ingredients if ing not in available_ingredients]
-            
-#             # Skip if too few ingredients match
-#             if len(matched_ingredients) < min_ingredients_matched:
-#                 continue
-            
-#             # Calculate score based on search mode
-#             if search_mode == 'coverage':
-#                 # Percentage of recipe ingredients that are available
-#                 score = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
-#             elif search_mode == 'count':
-#                 # Total number of matching ingredients
-#                 score = len(matched_ingredients)
-#             else:
-#                 # Default to coverage
-#                 score = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
-            
-#             recipe_scores.append((recipe, score, matched_ingredients, missing_ingredients))
-        
-#         # Sort recipes by score in descending order
-#         recipe_scores.sort(key=lambda x: x[1], reverse=True)
-        
-#         # Return top results
-#         return recipe_scores[:max_results]
-    
-#     def _semantic_search(self, available_ingredients, max_results):
-#         """Find recipes using semantic similarity of ingredients"""
-#         if not self.recipe_embeddings is not None:
-#             print("Semantic search unavailable - fallback to keyword search")
-#             return self._keyword_search(available_ingredients, max_results, 1, 'coverage')
-        
-#         # Create query embedding from available ingredients
-#         query = ' '.join(available_ingredients)
-#         query_embedding = self.embedding_model.encode(query)
-        
-#         # Calculate similarity to all recipes
-#         similarities = []
-        
-#         for i, recipe_embedding in enumerate(self.recipe_embeddings):
-#             # Calculate cosine similarity
-#             similarity = np.dot(query_embedding, recipe_embedding) / (
-#                 np.linalg.norm(query_embedding) * np.linalg.norm(recipe_embedding)
-#             )
-            
-#             recipe = self.recipes[i]
-#             recipe_ingredients = [ing.lower() for ing in recipe.get('ingredients', [])]
-            
-#             # Find matching and missing ingredients
-#             matched_ingredients = [ing for ing in recipe_ingredients if ing in available_ingredients]
-#             missing_ingredients = [ing for ing in recipe_ingredients if ing not in available_ingredients]
-            
-#             # Create a combined score that considers both semantic similarity and ingredient coverage
-#             coverage = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
-#             combined_score = 0.7 * similarity + 0.3 * coverage  # Weight semantic similarity higher
-            
-#             similarities.append((recipe, combined_score, matched_ingredients, missing_ingredients))
-        
-#         # Sort by similarity score
-#         similarities.sort(key=lambda x: x[1], reverse=True)
-        
-#         # Return top results
-#         return similarities[:max_results]
-
-#     # Add this method to your RecipeRetriever class
-
-#     def get_recipe_by_id(self, recipe_id):
-#         """
-#         Retrieve a specific recipe by ID
-        
-#         Args:
-#             recipe_id: ID of the recipe to retrieve
-            
-#         Returns:
-#             dict: Recipe details or None if not found
-#         """
-#         # Check if recipe_id is in the recipes dictionary
-#         if isinstance(self.recipes, dict) and recipe_id in self.recipes:
-#             return self.recipes[recipe_id]
-        
-#         # If recipes is a list, search by id field
-#         if isinstance(self.recipes, list):
-#             for recipe in self.recipes:
-#                 if recipe.get('id') == recipe_id:
-#                     return recipe
-        
-#         # If we have a more complex structure, iterate through values
-#         if isinstance(self.recipes, dict):
-#             for recipe in self.recipes.values():
-#                 if recipe.get('id') == recipe_id:
-#                     return recipe
-        
-#         return None
-
-#     def get_recipe_by_name(self, recipe_name):
-#         """
-#         Retrieve a recipe by its name
-        
-#         Args:
-#             recipe_name: Name of the recipe to retrieve
-            
-#         Returns:
-#             dict: Recipe details or None if not found
-#         """
-#         recipe_name_lower = recipe_name.lower()
-        
-#         # If recipes is a list, search by name field
-#         if isinstance(self.recipes, list):
-#             for recipe in self.recipes:
-#                 if recipe.get('name', '').lower() == recipe_name_lower:
-#                     return recipe
-        
-#         # If recipes is a dictionary, search values
-#         if isinstance(self.recipes, dict):
-#             for recipe in self.recipes.values():
-#                 if recipe.get('name', '').lower() == recipe_name_lower:
-#                     return recipe
-        
-#         # If no exact match, try partial matching
-#         if isinstance(self.recipes, list):
-#             matching_recipes = []
-#             for recipe in self.recipes:
-#                 if recipe_name_lower in recipe.get('name', '').lower():
-#                     matching_recipes.append(recipe)
-#         else:
-#             matching_recipes = []
-#             for recipe in self.recipes.values():
-#                 if recipe_name_lower in recipe.get('name', '').lower():
-#                     matching_recipes.append(recipe)
-        
-#         # Return the first partial match if any
-#         return matching_recipes[0] if matching_recipes else None
-        
-#     def get_recipe_details(self, recipe_id):
-#         """
-#         Get detailed information about a specific recipe
-        
-#         Args:
-#             recipe_id: ID of the recipe to retrieve
-            
-#         Returns:
-#             dict: Recipe details or None if not found
-#         """
-#         # Find recipe by ID
-#         for recipe in self.recipes:
-#             if recipe.get('id') == recipe_id:
-#                 return recipe
-        
-#         return None
-    
-#     def find_recipes_by_name(self, query, max_results=10):
-#         """
-#         Search for recipes by name
-        
-#         Args:
-#             query: Search term to match against recipe names
-#             max_results: Maximum number of results to return
-            
-#         Returns:
-#             list: Matching recipes
-#         """
-#         query = query.lower()
-#         matching_recipes = []
-        
-#         for recipe in self.recipes:
-#             name = recipe.get('name', '').lower()
-#             if query in name:
-#                 matching_recipes.append(recipe)
-        
-#         # Sort by exact matches first, then alphabetically
-#         matching_recipes.sort(key=lambda r: (0 if query == r.get('name', '').lower() else 1, r.get('name', '')))
-        
-#         return matching_recipes[:max_results]
-    
-#     def suggest_additional_ingredients(self, recipe, available_ingredients):
-#         """
-#         Suggest additional ingredients that would enhance a recipe
-        
-#         Args:
-#             recipe: Recipe to enhance
-#             available_ingredients: Ingredients the user already has
-            
-#         Returns:
-#             list: Suggested additional ingredients
-#         """
-#         # Get recipe ingredients
-#         recipe_ingredients = set(ing.lower() for ing in recipe.get('ingredients', []))
-#         available_ingredients = set(ing.lower() for ing in available_ingredients)
-        
-#         # Find similar recipes
-#         similar_recipes = []
-#         for other_recipe in self.recipes:
-#             if other_recipe.get('id') == recipe.get('id'):
-#                 continue
-                
-#             other_ingredients = set(ing.lower() for ing in other_recipe.get('ingredients', []))
-            
-#             # Calculate Jaccard similarity
-#             intersection = len(recipe_ingredients.intersection(other_ingredients))
-#             union = len(recipe_ingredients.union(other_ingredients))
-#             similarity = intersection / union if union > 0 else 0
-            
-#             if similarity > 0.5:  # Consider recipes with >50% ingredient overlap
-#                 similar_recipes.append((other_recipe, similarity))
-        
-#         # Sort by similarity
-#         similar_recipes.sort(key=lambda x: x[1], reverse=True)
-        
-#         # Identify enhancement ingredients from similar recipes
-#         enhancement_ingredients = set()
-#         for similar_recipe, _ in similar_recipes[:5]:  # Look at top 5 similar recipes
-#             similar_ingredients = set(ing.lower() for ing in similar_recipe.get('ingredients', []))
-            
-#             # Find ingredients that are in similar recipe but not in original recipe
-#             extra_ingredients = similar_ingredients - recipe_ingredients
-            
-#             # Only suggest ingredients the user already has
-#             available_extras = extra_ingredients.intersection(available_ingredients)
-#             enhancement_ingredients.update(available_extras)
-        
-#         return list(enhancement_ingredients)
-#     # Add or update this method in your RecipeRetriever class
-
-#     def get_recipe_with_formatted_ingredients(self, recipe_id=None, recipe_name=None, recipe_index=None):
-#         """
-#         Retrieve a recipe with properly parsed ingredient quantities
-        
-#         Args:
-#             recipe_id: Optional ID to find by ID
-#             recipe_name: Optional name to find by name
-#             recipe_index: Optional index from suggested recipes
-            
-#         Returns:
-#             dict: Recipe with formatted ingredients or None if not found
-#         """
-#         recipe = None
-        
-#         # Try to get by ID first
-#         if recipe_id:
-#             recipe = self.get_recipe_by_id(recipe_id)
-        
-#         # Try to get by name
-#         if not recipe and recipe_name:
-#             recipe = self.get_recipe_by_name(recipe_name)
-        
-#         # Try to get by index
-#         if not recipe and recipe_index is not None:
-#             # Handle different data structures
-#             if isinstance(self.recipes, list) and 0 <= recipe_index < len(self.recipes):
-#                 recipe = self.recipes[recipe_index]
-#             elif isinstance(self.recipes, dict) and 0 <= recipe_index < len(self.recipes):
-#                 recipe_id = list(self.recipes.keys())[recipe_index]
-#                 recipe = self.recipes[recipe_id]
-        
-#         if not recipe:
-#             return None
-        
-#         # Create a deep copy to avoid modifying original
-#         import copy
-#         formatted_recipe = copy.deepcopy(recipe)
-        
-#         # Format ingredients with quantities
-#         if 'ingredients' in formatted_recipe:
-#             ingredient_list = []
-#             for ingredient in formatted_recipe['ingredients']:
-#                 # Parse ingredient string into components
-#                 import re
-                
-#                 # Pattern for extracting quantity and ingredient
-#                 # This pattern is designed to handle quantities at the beginning of the string
-#                 # Example: "60 unsalted butter" or "1⁄4 icing sugar"
-#                 quantity_pattern = r'^(\d+(?:\s*\d*\/\d*|\s*\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s+(.+)$'
-                
-#                 match = re.match(quantity_pattern, ingredient)
-#                 if match:
-#                     quantity = match.group(1).strip()
-#                     name = match.group(2).strip()
-                    
-#                     # Check if quantity is "None" (a common value in the dataset)
-#                     if quantity.lower() == 'none':
-#                         quantity = ''
-#                         name = ingredient
-                    
-#                     ingredient_list.append({
-#                         'name': name,
-#                         'quantity': quantity,
-#                         'original': ingredient
-#                     })
-#                 else:
-#                     # If the pattern doesn't match, try to find any numbers at the beginning
-#                     alternate_match = re.match(r'^(\d+(?:\s*\d*\/\d*)?\s*(?:\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s*(.*)$', ingredient)
-#                     if alternate_match and alternate_match.group(1).strip() and alternate_match.group(2).strip():
-#                         quantity = alternate_match.group(1).strip()
-#                         name = alternate_match.group(2).strip()
-                        
-#                         ingredient_list.append({
-#                             'name': name,
-#                             'quantity': quantity,
-#                             'original': ingredient
-#                         })
-#                     else:
-#                         # Fallback if no pattern matched
-#                         ingredient_list.append({
-#                             'name': ingredient,
-#                             'quantity': '',
-#                             'original': ingredient
-#                         })
-            
-#             formatted_recipe['formatted_ingredients'] = ingredient_list
-        
-#         return formatted_recipe
-
-# # Test the recipe retriever if run directly
-# if __name__ == "__main__":
-#     retriever = RecipeRetriever()
-    
-#     # Example search
-#     test_ingredients = ["flour", "sugar", "eggs", "butter"]
-#     print(f"\nSearching for recipes with ingredients: {', '.join(test_ingredients)}")
-    
-#     results = retriever.find_recipes(test_ingredients, max_results=5)
-    
-#     print(f"\nFound {len(results)} matching recipes:")
-#     for recipe, score, matched, missing in results:
-#         print(f"Recipe: {recipe.get('name')} (Score: {score:.2f})")
-#         print(f"  Matched ingredients: {', '.join(matched[:3])}{'...' if len(matched) > 3 else ''}")
-#         print(f"  Missing ingredients: {', '.join(missing[:3])}{'...' if len(missing) > 3 else ''}")
-
-# Modified RecipeRetriever class with improved ingredient matching
-# This version will match ingredients regardless of quantities
-
-import os
-import json
-import re
-import numpy as np
-from collections import defaultdict
-from sentence_transformers import SentenceTransformer
-
-class RecipeRetriever:
-    """Searches for and ranks recipes based on available ingredients"""
-    
-    def __init__(self, data_dir=None, embedding_model='all-MiniLM-L6-v2'):
-        """
-        Initialize the recipe retriever
-        
-        Args:
-            data_dir: Directory containing the processed recipe data
-            embedding_model: Name of the sentence transformer model to use
-        """
-        # Set default data directory if not provided
-        if data_dir is None:
-            # Get the directory where this script is located
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Go up one level to the project root
-            project_dir = os.path.dirname(current_dir)
-            data_dir = os.path.join(project_dir, 'data', 'processed')
-        
-        self.data_dir = data_dir
-        self.recipes = []
-        self.ingredient_to_recipes = defaultdict(list)
-        self.recipe_embeddings = None
-        self.recipe_ingredients = []
-        
-        # Store parsed ingredients for each recipe
-        self.parsed_recipe_ingredients = []
-        
-        # Load the sentence transformer model for semantic search
-        try:
-            self.embedding_model = SentenceTransformer(embedding_model)
-            self.use_semantic_search = True
-        except:
-            print("Warning: Sentence transformer model not available, falling back to keyword search")
-            self.use_semantic_search = False
-        
-        # Load recipes
-        self._load_recipes()
-        
-        # Create ingredient index for faster lookup
-        self._create_ingredient_index()
-        
-        # Pre-compute recipe embeddings for semantic search if available
-        if self.use_semantic_search:
-            self._compute_recipe_embeddings()
-    
-    def _load_recipes(self):
-        """Load recipes from the processed data directory"""
-        recipes_path = os.path.join(self.data_dir, 'processed_recipes.json')
-        
-        if not os.path.exists(recipes_path):
-            print(f"Warning: No processed recipes found at {recipes_path}")
-            return
-        
-        with open(recipes_path, 'r') as f:
-            self.recipes = json.load(f)
-        
-        print(f"Loaded {len(self.recipes)} recipes")
-    
-    def _parse_ingredient(self, ingredient_text):
-        """
-        Parse an ingredient string to separate name from quantity
-        
-        Args:
-            ingredient_text: Raw ingredient text (e.g., "2 eggs" or "1/2 cup flour")
-        
-        Returns:
-            tuple: (name, quantity) where name is the ingredient name without quantity
-        """
-        # Pattern to match quantity at the beginning of the string
-        # This handles numbers, fractions, and units
-        quantity_pattern = r'^(\d+(?:\s*\d*\/\d*|\s*\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s+(.+)$'
-        
-        match = re.match(quantity_pattern, ingredient_text)
-        if match:
-            quantity = match.group(1).strip()
-            name = match.group(2).strip()
-            
-            # Check if quantity is "None" (a common value in the dataset)
-            if quantity.lower() == 'none':
-                quantity = ''
-                name = ingredient_text
-            
-            return name, quantity
-        
-        # If the pattern doesn't match, try another approach
-        alternate_match = re.match(r'^(\d+(?:\s*\d*\/\d*)?\s*(?:\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s*(.*)$', ingredient_text)
-        if alternate_match and alternate_match.group(1).strip() and alternate_match.group(2).strip():
-            quantity = alternate_match.group(1).strip()
-            name = alternate_match.group(2).strip()
-            return name, quantity
-        
-        # If no quantity found, return the original text as the name
-        return ingredient_text, ''
-    
-    def _create_ingredient_index(self):
-        """Create an index mapping ingredients to recipes for faster search"""
-        print("Creating ingredient index...")
-        
-        # Pre-parse all ingredients to extract names without quantities
-        self.parsed_recipe_ingredients = []
-        
-        for i, recipe in enumerate(self.recipes):
-            recipe_parsed_ingredients = []
-            
-            for ingredient in recipe.get('ingredients', []):
-                ingredient_name, quantity = self._parse_ingredient(ingredient.lower())
-                recipe_parsed_ingredients.append((ingredient_name, quantity))
-                
-                # Index by ingredient name (without quantity)
-                self.ingredient_to_recipes[ingredient_name].append(i)
-            
-            self.parsed_recipe_ingredients.append(recipe_parsed_ingredients)
-        
-        print(f"Created index with {len(self.ingredient_to_recipes)} ingredients")
-    
-    def _compute_recipe_embeddings(self):
-        """Compute ingredient embeddings for all recipes to enable semantic search"""
-        if not self.recipes or not self.use_semantic_search:
-            return
-        
-        print("Computing recipe embeddings for semantic search...")
-        
-        # Extract ingredient lists as text (using parsed ingredient names without quantities)
-        self.recipe_ingredients = [
-            ' '.join([name for name, _ in recipe_ingredients]) 
-            for recipe_ingredients in self.parsed_recipe_ingredients
-        ]
-        
-        # Compute embeddings
-        self.recipe_embeddings = self.embedding_model.encode(self.recipe_ingredients)
-        
-        print("Recipe embeddings computed")
-    
-    def parse_user_ingredients(self, user_ingredients):
-        """
-        Parse user-provided ingredients to handle cases with and without quantities
-        
-        Args:
-            user_ingredients: List of ingredient strings (may include quantities)
-            
-        Returns:
-            list: List of parsed ingredient names without quantities
-        """
-        parsed_ingredients = []
-        
-        for ingredient in user_ingredients:
-            # Parse to get just the ingredient name
-            name, _ = self._parse_ingredient(ingredient.lower())
-            parsed_ingredients.append(name)
-        
-        return parsed_ingredients
-    
-    def find_recipes(self, available_ingredients, max_results=10, min_ingredients_matched=1, search_mode='coverage'):
-        """
-        Find recipes that can be made with available ingredients
-        
-        Args:
-            available_ingredients: List of ingredients the user has
-            max_results: Maximum number of recipes to return
-            min_ingredients_matched: Minimum number of ingredients that must match
-            search_mode: 'coverage' (% of recipe ingredients available) or 
-                        'count' (total number of matching ingredients) or
-                        'semantic' (semantic similarity to available ingredients)
-            
-        Returns:
-            list: List of (recipe, score, matched_ingredients, missing_ingredients) tuples
-        """
-        if not self.recipes:
-            return []
-        
-        # Parse user ingredients to extract names without quantities
-        parsed_user_ingredients = self.parse_user_ingredients(available_ingredients)
-        
-        if search_mode == 'semantic' and self.use_semantic_search:
-            return self._semantic_search(parsed_user_ingredients, max_results)
-        else:
-            return self._keyword_search(parsed_user_ingredients, max_results, min_ingredients_matched, search_mode)
-    
-    def _keyword_search(self, parsed_user_ingredients, max_results, min_ingredients_matched, search_mode):
-        """Find recipes using keyword matching of ingredients"""
-        # Find candidate recipes (any recipe that uses at least one available ingredient)
-        candidate_recipes = set()
-        for ingredient in parsed_user_ingredients:
-            candidate_recipes.update(self.ingredient_to_recipes.get(ingredient, []))
-        
-        # Score candidate recipes
-        recipe_scores = []
-        
-        for recipe_idx in candidate_recipes:
-            recipe = self.recipes[recipe_idx]
-            recipe_parsed_ingredients = self.parsed_recipe_ingredients[recipe_idx]
-            
-            # Get just the ingredient names (without quantities)
-            recipe_ingredient_names = [name for name, _ in recipe_parsed_ingredients]
-            
-            # Find matching and missing ingredients
-            matched_ingredients = []
-            missing_ingredients = []
-            
-            for name in recipe_ingredient_names:
-                if any(user_ing in name or name in user_ing for user_ing in parsed_user_ingredients):
-                    matched_ingredients.append(name)
-                else:
-                    missing_ingredients.append(name)
-            
-            # Skip if too few ingredients match
-            if len(matched_ingredients) < min_ingredients_matched:
-                continue
-            
-            # Calculate score based on search mode
-            if search_mode == 'coverage':
-                # Percentage of recipe ingredients that are available
-                score = len(matched_ingredients) / len(recipe_ingredient_names) if recipe_ingredient_names else 0
-            elif search_mode == 'count':
-                # Total number of matching ingredients
-                score = len(matched_ingredients)
-            else:
-                # Default to coverage
-                score = len(matched_ingredients) / len(recipe_ingredient_names) if recipe_ingredient_names else 0
-            
-            recipe_scores.append((recipe, score, matched_ingredients, missing_ingredients))
-        
-        # Sort recipes by score in descending order
-        recipe_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top results
-        return recipe_scores[:max_results]
-    
-    def _semantic_search(self, parsed_user_ingredients, max_results):
-        """Find recipes using semantic similarity of ingredients"""
-        if not self.recipe_embeddings is not None:
-            print("Semantic search unavailable - fallback to keyword search")
-            return self._keyword_search(parsed_user_ingredients, max_results, 1, 'coverage')
-        
-        # Create query embedding from available ingredients
-        query = ' '.join(parsed_user_ingredients)
-        query_embedding = self.embedding_model.encode(query)
-        
-        # Calculate similarity to all recipes
-        similarities = []
-        
-        for i, recipe_embedding in enumerate(self.recipe_embeddings):
-            # Calculate cosine similarity
-            similarity = np.dot(query_embedding, recipe_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(recipe_embedding)
-            )
-            
-            recipe = self.recipes[i]
-            recipe_parsed_ingredients = self.parsed_recipe_ingredients[i]
-            
-            # Get just the ingredient names (without quantities)
-            recipe_ingredient_names = [name for name, _ in recipe_parsed_ingredients]
-            
-            # Find matching and missing ingredients
-            matched_ingredients = []
-            missing_ingredients = []
-            
-            for name in recipe_ingredient_names:
-                if any(user_ing in name or name in user_ing for user_ing in parsed_user_ingredients):
-                    matched_ingredients.append(name)
-                else:
-                    missing_ingredients.append(name)
-            
-            # Create a combined score that considers both semantic similarity and ingredient coverage
-            coverage = len(matched_ingredients) / len(recipe_ingredient_names) if recipe_ingredient_names else 0
-            combined_score = 0.7 * similarity + 0.3 * coverage  # Weight semantic similarity higher
-            
-            similarities.append((recipe, combined_score, matched_ingredients, missing_ingredients))
-        
-        # Sort by similarity score
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top results
-        return similarities[:max_results]
-
-    def get_recipe_by_id(self, recipe_id):
-        """
-        Retrieve a specific recipe by ID
-        
-        Args:
-            recipe_id: ID of the recipe to retrieve
-            
-        Returns:
-            dict: Recipe details or None if not found
-        """
-        # Check if recipe_id is in the recipes dictionary
-        if isinstance(self.recipes, dict) and recipe_id in self.recipes:
-            return self.recipes[recipe_id]
-        
-        # If recipes is a list, search by id field
-        if isinstance(self.recipes, list):
-            for recipe in self.recipes:
-                if recipe.get('id') == recipe_id:
-                    return recipe
-        
-        # If we have a more complex structure, iterate through values
-        if isinstance(self.recipes, dict):
-            for recipe in self.recipes.values():
-                if recipe.get('id') == recipe_id:
-                    return recipe
-        
-        return None
-
-    def get_recipe_by_name(self, recipe_name):
-        """
-        Retrieve a recipe by its name
-        
-        Args:
-            recipe_name: Name of the recipe to retrieve
-            
-        Returns:
-            dict: Recipe details or None if not found
-        """
-        recipe_name_lower = recipe_name.lower()
-        
-        # If recipes is a list, search by name field
-        if isinstance(self.recipes, list):
-            for recipe in self.recipes:
-                if recipe.get('name', '').lower() == recipe_name_lower:
-                    return recipe
-        
-        # If recipes is a dictionary, search values
-        if isinstance(self.recipes, dict):
-            for recipe in self.recipes.values():
-                if recipe.get('name', '').lower() == recipe_name_lower:
-                    return recipe
-        
-        # If no exact match, try partial matching
-        if isinstance(self.recipes, list):
-            matching_recipes = []
-            for recipe in self.recipes:
-                if recipe_name_lower in recipe.get('name', '').lower():
-                    matching_recipes.append(recipe)
-        else:
-            matching_recipes = []
-            for recipe in self.recipes.values():
-                if recipe_name_lower in recipe.get('name', '').lower():
-                    matching_recipes.append(recipe)
-        
-        # Return the first partial match if any
-        return matching_recipes[0] if matching_recipes else None
-        
-    def get_recipe_details(self, recipe_id):
-        """
-        Get detailed information about a specific recipe
-        
-        Args:
-            recipe_id: ID of the recipe to retrieve
-            
-        Returns:
-            dict: Recipe details or None if not found
-        """
-        # Find recipe by ID
-        for recipe in self.recipes:
-            if recipe.get('id') == recipe_id:
-                return recipe
-        
-        return None
-    
-    def find_recipes_by_name(self, query, max_results=10):
-        """
-        Search for recipes by name
-        
-        Args:
-            query: Search term to match against recipe names
-            max_results: Maximum number of results to return
-            
-        Returns:
-            list: Matching recipes
-        """
-        query = query.lower()
-        matching_recipes = []
-        
-        for recipe in self.recipes:
-            name = recipe.get('name', '').lower()
-            if query in name:
-                matching_recipes.append(recipe)
-        
-        # Sort by exact matches first, then alphabetically
-        matching_recipes.sort(key=lambda r: (0 if query == r.get('name', '').lower() else 1, r.get('name', '')))
-        
-        return matching_recipes[:max_results]
-    
-    def suggest_additional_ingredients(self, recipe, available_ingredients):
-        """
-        Suggest additional ingredients that would enhance a recipe
-        
-        Args:
-            recipe: Recipe to enhance
-            available_ingredients: Ingredients the user already has
-            
-        Returns:
-            list: Suggested additional ingredients
-        """
-        # Parse user ingredients
-        parsed_user_ingredients = self.parse_user_ingredients(available_ingredients)
-        
-        # Find recipe index
-        recipe_id = recipe.get('id')
-        recipe_idx = None
-        for i, r in enumerate(self.recipes):
-            if r.get('id') == recipe_id:
-                recipe_idx = i
-                break
-        
-        if recipe_idx is None:
-            return []
-            
-        # Get recipe ingredient names
-        recipe_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[recipe_idx]]
-        recipe_ingredients = set(recipe_ingredient_names)
-        
-        # Find similar recipes
-        similar_recipes = []
-        for i, other_recipe in enumerate(self.recipes):
-            if other_recipe.get('id') == recipe_id:
-                continue
-                
-            other_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[i]]
-            other_ingredients = set(other_ingredient_names)
-            
-            # Calculate Jaccard similarity
-            intersection = len(recipe_ingredients.intersection(other_ingredients))
-            union = len(recipe_ingredients.union(other_ingredients))
-            similarity = intersection / union if union > 0 else 0
-            
-            if similarity > 0.5:  # Consider recipes with >50% ingredient overlap
-                similar_recipes.append((other_recipe, i, similarity))
-        
-        # Sort by similarity
-        similar_recipes.sort(key=lambda x: x[2], reverse=True)
-        
-        # Identify enhancement ingredients from similar recipes
-        enhancement_ingredients = set()
-        for _, similar_idx, _ in similar_recipes[:5]:  # Look at top 5 similar recipes
-            similar_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[similar_idx]]
-            similar_ingredients = set(similar_ingredient_names)
-            
-            # Find ingredients that are in similar recipe but not in original recipe
-            extra_ingredients = similar_ingredients - recipe_ingredients
-            
-            # Check if user has any of these extra ingredients
-            for extra in extra_ingredients:
-                if any(user_ing in extra or extra in user_ing for user_ing in parsed_user_ingredients):
-                    enhancement_ingredients.add(extra)
-        
-        return list(enhancement_ingredients)
-
-    def get_recipe_with_formatted_ingredients(self, recipe_id=None, recipe_name=None, recipe_index=None):
-        """
-        Retrieve a recipe with properly parsed ingredient quantities
-        
-        Args:
-            recipe_id: Optional ID to find by ID
-            recipe_name: Optional name to find by name
-            recipe_index: Optional index from suggested recipes
-            
-        Returns:
-            dict: Recipe with formatted ingredients or None if not found
-        """
-        recipe = None
-        recipe_idx = None
-        
-        # Try to get by ID first
-        if recipe_id:
-            for i, r in enumerate(self.recipes):
-                if r.get('id') == recipe_id:
-                    recipe = r
-                    recipe_idx = i
-                    break
-        
-        # Try to get by name
-        if not recipe and recipe_name:
-            for i, r in enumerate(self.recipes):
-                if r.get('name', '').lower() == recipe_name.lower():
-                    recipe = r
-                    recipe_idx = i
-                    break
-        
-        # Try to get by index
-        if not recipe and recipe_index is not None:
-            if isinstance(self.recipes, list) and 0 <= recipe_index < len(self.recipes):
-                recipe = self.recipes[recipe_index]
-                recipe_idx = recipe_index
-        
-        if not recipe or recipe_idx is None:
-            return None
-        
-        # Create a deep copy to avoid modifying original
-        import copy
-        formatted_recipe = copy.deepcopy(recipe)
-        
-        # Get parsed ingredients if available
-        if recipe_idx < len(self.parsed_recipe_ingredients):
-            parsed_ingredients = self.parsed_recipe_ingredients[recipe_idx]
-            
-            # Format ingredients with quantities
-            ingredient_list = []
-            for i, (name, quantity) in enumerate(parsed_ingredients):
-                # Get the original ingredient string
-                original = recipe.get('ingredients', [])[i] if i < len(recipe.get('ingredients', [])) else f"{quantity} {name}"
-                
-                ingredient_list.append({
-                    'name': name,
-                    'quantity': quantity,
-                    'original': original
-                })
-            
-            formatted_recipe['formatted_ingredients'] = ingredient_list
-        else:
-            # Fallback to the original implementation if parsed ingredients not available
-            ingredient_list = []
-            for ingredient in formatted_recipe.get('ingredients', []):
-                name, quantity = self._parse_ingredient(ingredient)
-                
-                ingredient_list.append({
-                    'name': name,
-                    'quantity': quantity,
-                    'original': ingredient
-                })
-            
-            formatted_recipe['formatted_ingredients'] = ingredient_list
-        
-        return formatted_recipe
-
-# Test the recipe retriever if run directly
-if __name__ == "__main__":
-    retriever = RecipeRetriever()
-    
-    # Example search
-    test_ingredients = ["flour", "sugar", "eggs", "butter"]
-    print(f"\nSearching for recipes with ingredients: {', '.join(test_ingredients)}")
-    
-    results = retriever.find_recipes(test_ingredients, max_results=5)
-    
-    print(f"\nFound {len(results)} matching recipes:")
-    for recipe, score, matched, missing in results:
-        print(f"Recipe: {recipe.get('name')} (Score: {score:.2f})")
-        print(f"  Matched ingredients: {', '.join(matched[:3])}{'...' if len(matched) > 3 else ''}")
+# # food_rescuer/models/recipe_retrieval.py
+# # Recipe search and ranking system based on available ingredients
+
+# import os
+# import json
+# import numpy as np
+# from collections import defaultdict
+# from sentence_transformers import SentenceTransformer
+
+# class RecipeRetriever:
+#     """Searches for and ranks recipes based on available ingredients"""
+    
+#     def __init__(self, data_dir=None, embedding_model='all-MiniLM-L6-v2'):
+#         """
+#         Initialize the recipe retriever
+        
+#         Args:
+#             data_dir: Directory containing the processed recipe data
+#             embedding_model: Name of the sentence transformer model to use
+#         """
+#         # Set default data directory if not provided
+#         if data_dir is None:
+#             # Get the directory where this script is located
+#             current_dir = os.path.dirname(os.path.abspath(__file__))
+#             # Go up one level to the project root
+#             project_dir = os.path.dirname(current_dir)
+#             data_dir = os.path.join(project_dir, 'data', 'processed')
+        
+#         self.data_dir = data_dir
+#         self.recipes = []
+#         self.ingredient_to_recipes = defaultdict(list)
+#         self.recipe_embeddings = None
+#         self.recipe_ingredients = []
+        
+#         # Load the sentence transformer model for semantic search
+#         try:
+#             self.embedding_model = SentenceTransformer(embedding_model)
+#             self.use_semantic_search = True
+#         except:
+#             print("Warning: Sentence transformer model not available, falling back to keyword search")
+#             self.use_semantic_search = False
+        
+#         # Load recipes
+#         self._load_recipes()
+        
+#         # Create ingredient index for faster lookup
+#         self._create_ingredient_index()
+        
+#         # Pre-compute recipe embeddings for semantic search if available
+#         if self.use_semantic_search:
+#             self._compute_recipe_embeddings()
+    
+#     def _load_recipes(self):
+#         """Load recipes from the processed data directory"""
+#         recipes_path = os.path.join(self.data_dir, 'processed_recipes.json')
+        
+#         if not os.path.exists(recipes_path):
+#             print(f"Warning: No processed recipes found at {recipes_path}")
+#             return
+        
+#         with open(recipes_path, 'r') as f:
+#             self.recipes = json.load(f)
+        
+#         print(f"Loaded {len(self.recipes)} recipes")
+    
+#     def _create_ingredient_index(self):
+#         """Create an index mapping ingredients to recipes for faster search"""
+#         print("Creating ingredient index...")
+        
+#         for i, recipe in enumerate(self.recipes):
+#             for ingredient in recipe.get('ingredients', []):
+#                 ingredient_lower = ingredient.lower()
+#                 self.ingredient_to_recipes[ingredient_lower].append(i)
+        
+#         print(f"Created index with {len(self.ingredient_to_recipes)} ingredients")
+    
+#     def _compute_recipe_embeddings(self):
+#         """Compute ingredient embeddings for all recipes to enable semantic search"""
+#         if not self.recipes or not self.use_semantic_search:
+#             return
+        
+#         print("Computing recipe embeddings for semantic search...")
+        
+#         # Extract ingredient lists as text
+#         self.recipe_ingredients = [
+#             ' '.join(recipe.get('ingredients', [])) for recipe in self.recipes
+#         ]
+        
+#         # Compute embeddings
+#         self.recipe_embeddings = self.embedding_model.encode(self.recipe_ingredients)
+        
+#         print("Recipe embeddings computed")
+    
+#     def find_recipes(self, available_ingredients, max_results=10, min_ingredients_matched=1, search_mode='coverage'):
+#         """
+#         Find recipes that can be made with available ingredients
+        
+#         Args:
+#             available_ingredients: List of ingredients the user has
+#             max_results: Maximum number of recipes to return
+#             min_ingredients_matched: Minimum number of ingredients that must match
+#             search_mode: 'coverage' (% of recipe ingredients available) or 
+#                         'count' (total number of matching ingredients) or
+#                         'semantic' (semantic similarity to available ingredients)
+            
+#         Returns:
+#             list: List of (recipe, score, matched_ingredients, missing_ingredients) tuples
+#         """
+#         if not self.recipes:
+#             return []
+        
+#         # Normalize ingredient names
+#         available_ingredients = [ing.lower() for ing in available_ingredients]
+        
+#         if search_mode == 'semantic' and self.use_semantic_search:
+#             return self._semantic_search(available_ingredients, max_results)
+#         else:
+#             return self._keyword_search(available_ingredients, max_results, min_ingredients_matched, search_mode)
+    
+#     def _keyword_search(self, available_ingredients, max_results, min_ingredients_matched, search_mode):
+#         """Find recipes using keyword matching of ingredients"""
+#         # Find candidate recipes (any recipe that uses at least one available ingredient)
+#         candidate_recipes = set()
+#         for ingredient in available_ingredients:
+#             candidate_recipes.update(self.ingredient_to_recipes.get(ingredient, []))
+        
+#         # Score candidate recipes
+#         recipe_scores = []
+        
+#         for recipe_idx in candidate_recipes:
+#             recipe = self.recipes[recipe_idx]
+#             recipe_ingredients = [ing.lower() for ing in recipe.get('ingredients', [])]
+            
+#             # Find matching and missing ingredients
+#             matched_ingredients = [ing for ing in recipe_ingredients if ing in available_ingredients]
+#             missing_ingredients = [ing for ing in recipe_ingredients if ing not in available_ingredients]
+            
+#             # Skip if too few ingredients match
+#             if len(matched_ingredients) < min_ingredients_matched:
+#                 continue
+            
+#             # Calculate score based on search mode
+#             if search_mode == 'coverage':
+#                 # Percentage of recipe ingredients that are available
+#                 score = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
+#             elif search_mode == 'count':
+#                 # Total number of matching ingredients
+#                 score = len(matched_ingredients)
+#             else:
+#                 # Default to coverage
+#                 score = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
+            
+#             recipe_scores.append((recipe, score, matched_ingredients, missing_ingredients))
+        
+#         # Sort recipes by score in descending order
+#         recipe_scores.sort(key=lambda x: x[1], reverse=True)
+        
+#         # Return top results
+#         return recipe_scores[:max_results]
+    
+#     def _semantic_search(self, available_ingredients, max_results):
+#         """Find recipes using semantic similarity of ingredients"""
+#         if not self.recipe_embeddings is not None:
+#             print("Semantic search unavailable - fallback to keyword search")
+#             return self._keyword_search(available_ingredients, max_results, 1, 'coverage')
+        
+#         # Create query embedding from available ingredients
+#         query = ' '.join(available_ingredients)
+#         query_embedding = self.embedding_model.encode(query)
+        
+#         # Calculate similarity to all recipes
+#         similarities = []
+        
+#         for i, recipe_embedding in enumerate(self.recipe_embeddings):
+#             # Calculate cosine similarity
+#             similarity = np.dot(query_embedding, recipe_embedding) / (
+#                 np.linalg.norm(query_embedding) * np.linalg.norm(recipe_embedding)
+#             )
+            
+#             recipe = self.recipes[i]
+#             recipe_ingredients = [ing.lower() for ing in recipe.get('ingredients', [])]
+            
+#             # Find matching and missing ingredients
+#             matched_ingredients = [ing for ing in recipe_ingredients if ing in available_ingredients]
+#             missing_ingredients = [ing for ing in recipe_ingredients if ing not in available_ingredients]
+            
+#             # Create a combined score that considers both semantic similarity and ingredient coverage
+#             coverage = len(matched_ingredients) / len(recipe_ingredients) if recipe_ingredients else 0
+#             combined_score = 0.7 * similarity + 0.3 * coverage  # Weight semantic similarity higher
+            
+#             similarities.append((recipe, combined_score, matched_ingredients, missing_ingredients))
+        
+#         # Sort by similarity score
+#         similarities.sort(key=lambda x: x[1], reverse=True)
+        
+#         # Return top results
+#         return similarities[:max_results]
+
+#     # Add this method to your RecipeRetriever class
+
+#     def get_recipe_by_id(self, recipe_id):
+#         """
+#         Retrieve a specific recipe by ID
+        
+#         Args:
+#             recipe_id: ID of the recipe to retrieve
+            
+#         Returns:
+#             dict: Recipe details or None if not found
+#         """
+#         # Check if recipe_id is in the recipes dictionary
+#         if isinstance(self.recipes, dict) and recipe_id in self.recipes:
+#             return self.recipes[recipe_id]
+        
+#         # If recipes is a list, search by id field
+#         if isinstance(self.recipes, list):
+#             for recipe in self.recipes:
+#                 if recipe.get('id') == recipe_id:
+#                     return recipe
+        
+#         # If we have a more complex structure, iterate through values
+#         if isinstance(self.recipes, dict):
+#             for recipe in self.recipes.values():
+#                 if recipe.get('id') == recipe_id:
+#                     return recipe
+        
+#         return None
+
+#     def get_recipe_by_name(self, recipe_name):
+#         """
+#         Retrieve a recipe by its name
+        
+#         Args:
+#             recipe_name: Name of the recipe to retrieve
+            
+#         Returns:
+#             dict: Recipe details or None if not found
+#         """
+#         recipe_name_lower = recipe_name.lower()
+        
+#         # If recipes is a list, search by name field
+#         if isinstance(self.recipes, list):
+#             for recipe in self.recipes:
+#                 if recipe.get('name', '').lower() == recipe_name_lower:
+#                     return recipe
+        
+#         # If recipes is a dictionary, search values
+#         if isinstance(self.recipes, dict):
+#             for recipe in self.recipes.values():
+#                 if recipe.get('name', '').lower() == recipe_name_lower:
+#                     return recipe
+        
+#         # If no exact match, try partial matching
+#         if isinstance(self.recipes, list):
+#             matching_recipes = []
+#             for recipe in self.recipes:
+#                 if recipe_name_lower in recipe.get('name', '').lower():
+#                     matching_recipes.append(recipe)
+#         else:
+#             matching_recipes = []
+#             for recipe in self.recipes.values():
+#                 if recipe_name_lower in recipe.get('name', '').lower():
+#                     matching_recipes.append(recipe)
+        
+#         # Return the first partial match if any
+#         return matching_recipes[0] if matching_recipes else None
+        
+#     def get_recipe_details(self, recipe_id):
+#         """
+#         Get detailed information about a specific recipe
+        
+#         Args:
+#             recipe_id: ID of the recipe to retrieve
+            
+#         Returns:
+#             dict: Recipe details or None if not found
+#         """
+#         # Find recipe by ID
+#         for recipe in self.recipes:
+#             if recipe.get('id') == recipe_id:
+#                 return recipe
+        
+#         return None
+    
+#     def find_recipes_by_name(self, query, max_results=10):
+#         """
+#         Search for recipes by name
+        
+#         Args:
+#             query: Search term to match against recipe names
+#             max_results: Maximum number of results to return
+            
+#         Returns:
+#             list: Matching recipes
+#         """
+#         query = query.lower()
+#         matching_recipes = []
+        
+#         for recipe in self.recipes:
+#             name = recipe.get('name', '').lower()
+#             if query in name:
+#                 matching_recipes.append(recipe)
+        
+#         # Sort by exact matches first, then alphabetically
+#         matching_recipes.sort(key=lambda r: (0 if query == r.get('name', '').lower() else 1, r.get('name', '')))
+        
+#         return matching_recipes[:max_results]
+    
+#     def suggest_additional_ingredients(self, recipe, available_ingredients):
+#         """
+#         Suggest additional ingredients that would enhance a recipe
+        
+#         Args:
+#             recipe: Recipe to enhance
+#             available_ingredients: Ingredients the user already has
+            
+#         Returns:
+#             list: Suggested additional ingredients
+#         """
+#         # Get recipe ingredients
+#         recipe_ingredients = set(ing.lower() for ing in recipe.get('ingredients', []))
+#         available_ingredients = set(ing.lower() for ing in available_ingredients)
+        
+#         # Find similar recipes
+#         similar_recipes = []
+#         for other_recipe in self.recipes:
+#             if other_recipe.get('id') == recipe.get('id'):
+#                 continue
+                
+#             other_ingredients = set(ing.lower() for ing in other_recipe.get('ingredients', []))
+            
+#             # Calculate Jaccard similarity
+#             intersection = len(recipe_ingredients.intersection(other_ingredients))
+#             union = len(recipe_ingredients.union(other_ingredients))
+#             similarity = intersection / union if union > 0 else 0
+            
+#             if similarity > 0.5:  # Consider recipes with >50% ingredient overlap
+#                 similar_recipes.append((other_recipe, similarity))
+        
+#         # Sort by similarity
+#         similar_recipes.sort(key=lambda x: x[1], reverse=True)
+        
+#         # Identify enhancement ingredients from similar recipes
+#         enhancement_ingredients = set()
+#         for similar_recipe, _ in similar_recipes[:5]:  # Look at top 5 similar recipes
+#             similar_ingredients = set(ing.lower() for ing in similar_recipe.get('ingredients', []))
+            
+#             # Find ingredients that are in similar recipe but not in original recipe
+#             extra_ingredients = similar_ingredients - recipe_ingredients
+            
+#             # Only suggest ingredients the user already has
+#             available_extras = extra_ingredients.intersection(available_ingredients)
+#             enhancement_ingredients.update(available_extras)
+        
+#         return list(enhancement_ingredients)
+#     # Add or update this method in your RecipeRetriever class
+
+#     def get_recipe_with_formatted_ingredients(self, recipe_id=None, recipe_name=None, recipe_index=None):
+#         """
+#         Retrieve a recipe with properly parsed ingredient quantities
+        
+#         Args:
+#             recipe_id: Optional ID to find by ID
+#             recipe_name: Optional name to find by name
+#             recipe_index: Optional index from suggested recipes
+            
+#         Returns:
+#             dict: Recipe with formatted ingredients or None if not found
+#         """
+#         recipe = None
+        
+#         # Try to get by ID first
+#         if recipe_id:
+#             recipe = self.get_recipe_by_id(recipe_id)
+        
+#         # Try to get by name
+#         if not recipe and recipe_name:
+#             recipe = self.get_recipe_by_name(recipe_name)
+        
+#         # Try to get by index
+#         if not recipe and recipe_index is not None:
+#             # Handle different data structures
+#             if isinstance(self.recipes, list) and 0 <= recipe_index < len(self.recipes):
+#                 recipe = self.recipes[recipe_index]
+#             elif isinstance(self.recipes, dict) and 0 <= recipe_index < len(self.recipes):
+#                 recipe_id = list(self.recipes.keys())[recipe_index]
+#                 recipe = self.recipes[recipe_id]
+        
+#         if not recipe:
+#             return None
+        
+#         # Create a deep copy to avoid modifying original
+#         import copy
+#         formatted_recipe = copy.deepcopy(recipe)
+        
+#         # Format ingredients with quantities
+#         if 'ingredients' in formatted_recipe:
+#             ingredient_list = []
+#             for ingredient in formatted_recipe['ingredients']:
+#                 # Parse ingredient string into components
+#                 import re
+                
+#                 # Pattern for extracting quantity and ingredient
+#                 # This pattern is designed to handle quantities at the beginning of the string
+#                 # Example: "60 unsalted butter" or "1⁄4 icing sugar"
+#                 quantity_pattern = r'^(\d+(?:\s*\d*\/\d*|\s*\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s+(.+)$'
+                
+#                 match = re.match(quantity_pattern, ingredient)
+#                 if match:
+#                     quantity = match.group(1).strip()
+#                     name = match.group(2).strip()
+                    
+#                     # Check if quantity is "None" (a common value in the dataset)
+#                     if quantity.lower() == 'none':
+#                         quantity = ''
+#                         name = ingredient
+                    
+#                     ingredient_list.append({
+#                         'name': name,
+#                         'quantity': quantity,
+#                         'original': ingredient
+#                     })
+#                 else:
+#                     # If the pattern doesn't match, try to find any numbers at the beginning
+#                     alternate_match = re.match(r'^(\d+(?:\s*\d*\/\d*)?\s*(?:\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s*(.*)$', ingredient)
+#                     if alternate_match and alternate_match.group(1).strip() and alternate_match.group(2).strip():
+#                         quantity = alternate_match.group(1).strip()
+#                         name = alternate_match.group(2).strip()
+                        
+#                         ingredient_list.append({
+#                             'name': name,
+#                             'quantity': quantity,
+#                             'original': ingredient
+#                         })
+#                     else:
+#                         # Fallback if no pattern matched
+#                         ingredient_list.append({
+#                             'name': ingredient,
+#                             'quantity': '',
+#                             'original': ingredient
+#                         })
+            
+#             formatted_recipe['formatted_ingredients'] = ingredient_list
+        
+#         return formatted_recipe
+
+# # Test the recipe retriever if run directly
+# if __name__ == "__main__":
+#     retriever = RecipeRetriever()
+    
+#     # Example search
+#     test_ingredients = ["flour", "sugar", "eggs", "butter"]
+#     print(f"\nSearching for recipes with ingredients: {', '.join(test_ingredients)}")
+    
+#     results = retriever.find_recipes(test_ingredients, max_results=5)
+    
+#     print(f"\nFound {len(results)} matching recipes:")
+#     for recipe, score, matched, missing in results:
+#         print(f"Recipe: {recipe.get('name')} (Score: {score:.2f})")
+#         print(f"  Matched ingredients: {', '.join(matched[:3])}{'...' if len(matched) > 3 else ''}")
+#         print(f"  Missing ingredients: {', '.join(missing[:3])}{'...' if len(missing) > 3 else ''}")
+
+# Modified RecipeRetriever class with improved ingredient matching
+# This version will match ingredients regardless of quantities
+
+import os
+import sys
+import json
+import re
+import itertools
+import copy
+import time
+import hashlib
+import numpy as np
+from collections import defaultdict, Counter, OrderedDict
+
+# Add parent directory to path so the module also runs as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Semantic search is optional; without sentence_transformers searches fall back to keywords
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+from models.ingredient_hierarchy import IngredientHierarchy
+from utils.ingredient_normalizer import canonicalize_ingredient, singularize
+
+# Generic exclusions (allergies, "-free" diets) and the specific ingredients they cover
+ALLERGEN_GROUPS = {
+    'nuts': ['nut', 'almond', 'cashew', 'pecan', 'walnut', 'hazelnut', 'pistachio', 'macadamia',
+             'pine nut', 'brazil nut', 'peanut', 'praline', 'marzipan', 'nutella'],
+    'tree nuts': ['almond', 'cashew', 'pecan', 'walnut', 'hazelnut', 'pistachio', 'macadamia',
+                  'pine nut', 'brazil nut', 'praline', 'marzipan'],
+    'peanuts': ['peanut'],
+    'shellfish': ['shrimp', 'prawn', 'crab', 'crabmeat', 'lobster', 'scallop', 'clam', 'mussel',
+                  'oyster', 'crawfish', 'crayfish', 'langoustine'],
+    'fish': ['fish', 'salmon', 'tuna', 'cod', 'tilapia', 'halibut', 'trout', 'anchovy', 'anchovies',
+             'sardine', 'mackerel', 'haddock', 'snapper', 'swordfish', 'catfish'],
+    'dairy': ['milk', 'buttermilk', 'cheese', 'butter', 'cream', 'yogurt', 'yoghurt', 'ghee', 'whey',
+              'casein', 'parmesan', 'mozzarella', 'cheddar', 'ricotta', 'feta'],
+    'lactose': ['milk', 'buttermilk', 'cheese', 'cream', 'yogurt', 'yoghurt', 'whey'],
+    'gluten': ['flour', 'wheat', 'bread', 'breadcrumb', 'pasta', 'noodle', 'barley', 'rye', 'couscous',
+               'semolina', 'cracker', 'spaghetti', 'macaroni', 'tortilla', 'biscuit'],
+    'eggs': ['egg', 'mayonnaise', 'meringue'],
+    'soy': ['soy', 'soya', 'tofu', 'tempeh', 'edamame', 'miso'],
+    'sesame': ['sesame', 'tahini'],
+    'meat': ['meat', 'chicken', 'beef', 'pork', 'lamb', 'veal', 'bacon', 'ham', 'sausage', 'turkey',
+             'duck', 'venison', 'prosciutto', 'pancetta', 'chorizo', 'salami', 'pepperoni', 'gelatin'],
+}
+
+# Group terms that are also part of unrelated ingredient names ("peanut butter" is not
+# dairy); an ingredient line only matches the term outside these phrases
+EXCLUSION_EXCEPTIONS = {
+    'butter': ['peanut butter', 'almond butter', 'cashew butter', 'nut butter', 'apple butter',
+               'cocoa butter', 'sunflower butter'],
+    'milk': ['coconut milk', 'almond milk', 'soy milk', 'rice milk', 'oat milk', 'non-dairy milk',
+             'nondairy milk', 'dairy-free milk'],
+    'cream': ['coconut cream', 'cream of tartar', 'cream of coconut'],
+    'dairy': ['non-dairy', 'nondairy', 'dairy-free'],
+    'egg': ['egg substitute', 'egg replacer'],
+}
+
+# Diet labels and the ingredients or allergen groups each one rules out. Diets that
+# are not about avoiding ingredients (keto, low-carb, kosher, ...) map to nothing.
+DIET_EXCLUSIONS = {
+    'vegetarian': ['meat', 'fish', 'shellfish'],
+    'vegan': ['meat', 'fish', 'shellfish', 'dairy', 'eggs', 'honey'],
+    'pescatarian': ['meat'],
+    'gluten-free': ['gluten'],
+    'dairy-free': ['dairy'],
+    'lactose-free': ['lactose'],
+    'nut-free': ['nuts'],
+    'egg-free': ['eggs'],
+    'soy-free': ['soy'],
+    'keto': [],
+    'ketogenic': [],
+    'low-carb': [],
+    'paleo': [],
+    'kosher': [],
+    'halal': [],
+}
+
+# Number of set bits in every byte value, for bitmap popcounts
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+class SearchResults(list):
+    """
+    List of search results with information about how the search ran
+    
+    Attributes:
+        exhaustive: False when a deadline stopped the search before every candidate was scored
+        info: Dict with the number of candidates found and scored and the elapsed time
+        facets: Dict of tag -> number of matching recipes with that tag (when requested)
+    """
+    
+    def __init__(self, results=(), exhaustive=True, info=None, facets=None):
+        super().__init__(results)
+        self.exhaustive = exhaustive
+        self.info = info or {}
+        self.facets = facets or {}
+
+
+class RecipeRetriever:
+    """Searches for and ranks recipes based on available ingredients"""
+    
+    # Candidates scored between deadline checks in deadline-bounded searches
+    DEADLINE_BATCH_SIZE = 256
+    
+    # Recipe fields embedded for semantic search and their default query weights
+    EMBEDDING_FIELDS = ('name', 'tags', 'ingredients')
+    DEFAULT_FIELD_WEIGHTS = {'name': 0.3, 'tags': 0.2, 'ingredients': 0.5}
+    
+    # Order of the values in each recipe's 'nutrition' list (calories in kcal, sodium
+    # and cholesterol in mg, everything else in grams)
+    NUTRITION_FIELDS = ('calories', 'fat', 'saturated_fat', 'cholesterol', 'sodium',
+                        'carbohydrates', 'fiber', 'sugar', 'protein')
+    
+    def __init__(self, data_dir=None, embedding_model='all-MiniLM-L6-v2', substitution_kb=None):
+        """
+        Initialize the recipe retriever
+        
+        Args:
+            data_dir: Directory containing the processed recipe data
+            embedding_model: Name of the sentence transformer model to use
+            substitution_kb: Optional SubstitutionKnowledgeBase whose categories extend
+                             the ingredient hierarchy
+        """
+        # Set default data directory if not provided
+        if data_dir is None:
+            # Get the directory where this script is located
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            # Go up one level to the project root
+            project_dir = os.path.dirname(current_dir)
+            data_dir = os.path.join(project_dir, 'data', 'processed')
+        
+        self.data_dir = data_dir
+        self.recipes = []
+        self.ingredient_to_recipes = defaultdict(list)
+        self.recipe_embeddings = None
+        self.normalized_embeddings = None
+        self.field_embeddings = None
+        self.embedding_model_name = embedding_model
+        self.substitution_kb = substitution_kb
+        self.recipe_ingredients = []
+        self.minhash_sketches = None
+        self.similarity_graph = None
+        
+        # Counters for searches and deadline cutoffs
+        self.search_metrics = Counter()
+        
+        # Store parsed ingredients for each recipe
+        self.parsed_recipe_ingredients = []
+        
+        # Load the sentence transformer model for semantic search
+        try:
+            self.embedding_model = SentenceTransformer(embedding_model)
+            self.use_semantic_search = True
+        except:
+            print("Warning: Sentence transformer model not available, falling back to keyword search")
+            self.use_semantic_search = False
+        
+        # Load recipes
+        self._load_recipes()
+        
+        # Create ingredient index for faster lookup
+        self._create_ingredient_index()
+        
+        # Load (or build) the full-text index over recipe instructions
+        self._load_instruction_index()
+        
+        # Pre-compute recipe embeddings for semantic search if available
+        if self.use_semantic_search:
+            self._compute_recipe_embeddings()
+    
+    def _load_recipes(self):
+        """Load recipes from the processed data directory"""
+        recipes_path = os.path.join(self.data_dir, 'processed_recipes.json')
+        
+        if not os.path.exists(recipes_path):
+            print(f"Warning: No processed recipes found at {recipes_path}")
+            return
+        
+        with open(recipes_path, 'r') as f:
+            self.recipes = json.load(f)
+        
+        print(f"Loaded {len(self.recipes)} recipes")
+    
+    def _parse_ingredient(self, ingredient_text):
+        """
+        Parse an ingredient string to separate name from quantity
+        
+        Args:
+            ingredient_text: Raw ingredient text (e.g., "2 eggs" or "1/2 cup flour")
+        
+        Returns:
+            tuple: (name, quantity) where name is the ingredient name without quantity
+        """
+        # Pattern to match quantity at the beginning of the string
+        # This handles numbers, fractions, and units
+        quantity_pattern = r'^(\d+(?:\s*\d*\/\d*|\s*\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s+(.+)$'
+        
+        match = re.match(quantity_pattern, ingredient_text)
+        if match:
+            quantity = match.group(1).strip()
+            name = match.group(2).strip()
+            
+            # Check if quantity is "None" (a common value in the dataset)
+            if quantity.lower() == 'none':
+                quantity = ''
+                name = ingredient_text
+            
+            return name, quantity
+        
+        # If the pattern doesn't match, try another approach
+        alternate_match = re.match(r'^(\d+(?:\s*\d*\/\d*)?\s*(?:\d*⁄\d*)?\s*(?:[a-zA-Z]+)?)\s*(.*)$', ingredient_text)
+        if alternate_match and alternate_match.group(1).strip() and alternate_match.group(2).strip():
+            quantity = alternate_match.group(1).strip()
+            name = alternate_match.group(2).strip()
+            return name, quantity
+        
+        # If no quantity found, return the original text as the name
+        return ingredient_text, ''
+    
+    def _create_ingredient_index(self):
+        """Create an index mapping ingredients to recipes for faster search"""
+        print("Creating ingredient index...")
+        
+        # Pre-parse all ingredients to extract names without quantities
+        self.parsed_recipe_ingredients = []
+        
+        for i, recipe in enumerate(self.recipes):
+            recipe_parsed_ingredients = []
+            
+            for ingredient in recipe.get('ingredients', []):
+                ingredient_name, quantity = self._parse_ingredient(ingredient.lower())
+                recipe_parsed_ingredients.append((ingredient_name, quantity))
+                
+                # Index by canonical ingredient name ("garlic, minced" -> "garlic")
+                self.ingredient_to_recipes[canonicalize_ingredient(ingredient_name)].append(i)
+            
+            self.parsed_recipe_ingredients.append(recipe_parsed_ingredients)
+        
+        print(f"Created index with {len(self.ingredient_to_recipes)} ingredients")
+        
+        # Build the integer arrays used for vectorized scoring
+        self._build_sparse_index()
+        
+        # Build the taxonomy used to expand generic ingredients
+        self._build_ingredient_hierarchy()
+        
+        # Group near-duplicate recipes so results can show one per cluster
+        self._load_duplicate_clusters()
+        
+        # Bitmaps of the recipes carrying each tag, for tag filters and facet counts
+        self._build_tag_index()
+        
+        # Nutrition values for range filters and target-macro search
+        self._build_nutrition_matrix()
+    
+    def _build_tag_index(self):
+        """Build one packed bitmap (bit i = recipe i) per tag"""
+        self.tag_ids = {}
+        rows, columns = [], []
+        for i, recipe in enumerate(self.recipes):
+            for tag in recipe.get('tags') or []:
+                tag = tag.lower().strip()
+                if tag:
+                    rows.append(self.tag_ids.setdefault(tag, len(self.tag_ids)))
+                    columns.append(i)
+        self.tag_names = list(self.tag_ids.keys())
+        
+        tag_matrix = np.zeros((len(self.tag_names), len(self.recipes)), dtype=bool)
+        tag_matrix[rows, columns] = True
+        self.tag_bitmaps = np.packbits(tag_matrix, axis=1)
+    
+    def _recipe_bitmap(self, recipe_indices):
+        """Pack a set of recipe indices into a bitmap shaped like the tag bitmaps"""
+        mask = np.zeros(len(self.recipes), dtype=bool)
+        mask[recipe_indices] = True
+        return np.packbits(mask)
+    
+    def _tag_filter(self, tags_all=None, tags_any=None):
+        """
+        Get the recipes passing the tag filters
+        
+        Args:
+            tags_all: Tags every recipe must have
+            tags_any: Tags of which every recipe must have at least one
+            
+        Returns:
+            numpy.ndarray: Sorted recipe indices
+        """
+        bitmap = np.full(self.tag_bitmaps.shape[1], 0xFF, dtype=np.uint8)
+        empty = np.zeros_like(bitmap)
+        for tag in tags_all or []:
+            tag_id = self.tag_ids.get(tag.lower().strip())
+            bitmap &= self.tag_bitmaps[tag_id] if tag_id is not None else empty
+        if tags_any:
+            any_bitmap = empty.copy()
+            for tag in tags_any:
+                tag_id = self.tag_ids.get(tag.lower().strip())
+                if tag_id is not None:
+                    any_bitmap |= self.tag_bitmaps[tag_id]
+            bitmap &= any_bitmap
+        return np.flatnonzero(np.unpackbits(bitmap, count=len(self.recipes))).astype(np.int32)
+    
+    def tag_facets(self, recipe_indices):
+        """
+        Count how many of the given recipes carry each tag
+        
+        Args:
+            recipe_indices: Indices of the recipes to count over (e.g. everything a search matched)
+            
+        Returns:
+            dict: tag -> count for every tag with a non-zero count, largest first
+        """
+        if not self.tag_names:
+            return {}
+        counts = POPCOUNT_TABLE[self.tag_bitmaps & self._recipe_bitmap(recipe_indices)].sum(axis=1)
+        order = np.lexsort((np.arange(len(counts)), -counts))
+        return {self.tag_names[i]: int(counts[i]) for i in order if counts[i]}
+    
+    def _build_nutrition_matrix(self):
+        """
+        Build the recipe x nutrient matrices
+        
+        nutrition_matrix holds the raw values (NaN for recipes without nutrition data)
+        and nutrition_normalized the per-field standardized log1p values, so distances
+        compare relative differences and one huge sodium outlier can't dominate.
+        """
+        num_fields = len(self.NUTRITION_FIELDS)
+        self.nutrition_matrix = np.full((len(self.recipes), num_fields), np.nan, dtype=np.float32)
+        for i, recipe in enumerate(self.recipes):
+            values = recipe.get('nutrition') or []
+            if len(values) == num_fields:
+                self.nutrition_matrix[i] = values
+        
+        log_values = np.log1p(np.maximum(self.nutrition_matrix, 0))
+        has_values = ~np.isnan(log_values[:, 0])
+        if has_values.any():
+            self.nutrition_mean = log_values[has_values].mean(axis=0)
+            self.nutrition_std = log_values[has_values].std(axis=0)
+        else:
+            self.nutrition_mean = np.zeros(num_fields, dtype=np.float32)
+            self.nutrition_std = np.ones(num_fields, dtype=np.float32)
+        self.nutrition_std[self.nutrition_std == 0] = 1.0
+        self.nutrition_normalized = ((log_values - self.nutrition_mean) / self.nutrition_std).astype(np.float32)
+    
+    def _nutrition_columns(self, fields):
+        """Map nutrient names to matrix columns, skipping (and reporting) unknown ones"""
+        columns = {}
+        for field in fields:
+            if field in self.NUTRITION_FIELDS:
+                columns[field] = self.NUTRITION_FIELDS.index(field)
+            else:
+                print(f"Unknown nutrition field '{field}', expected one of {', '.join(self.NUTRITION_FIELDS)}")
+        return columns
+    
+    def _nutrition_filter(self, nutrition_ranges):
+        """
+        Get the recipes whose nutrition values fall inside every range
+        
+        Args:
+            nutrition_ranges: Dict of nutrient -> (min, max); either bound may be None
+            
+        Returns:
+            numpy.ndarray: Sorted recipe indices (recipes without nutrition data never pass)
+        """
+        passing = ~np.isnan(self.nutrition_matrix[:, 0])
+        for field, column in self._nutrition_columns(nutrition_ranges).items():
+            low, high = nutrition_ranges[field]
+            if low is not None:
+                passing &= self.nutrition_matrix[:, column] >= low
+            if high is not None:
+                passing &= self.nutrition_matrix[:, column] <= high
+        return np.flatnonzero(passing).astype(np.int32)
+    
+    def nutrition_distances(self, nutrition_targets):
+        """
+        Compute every recipe's distance to a set of target nutrition values
+        
+        The distance is the root mean square difference over the targeted fields in
+        the normalized space, computed for all recipes in one vectorized pass.
+        
+        Args:
+            nutrition_targets: Dict of nutrient -> target value, e.g. {'protein': 40, 'calories': 500}
+            
+        Returns:
+            numpy.ndarray: Distance per recipe (inf for recipes without nutrition data)
+        """
+        columns = self._nutrition_columns(nutrition_targets)
+        if not columns:
+            return np.zeros(len(self.recipes), dtype=np.float32)
+        
+        column_ids = list(columns.values())
+        targets = np.log1p(np.maximum([nutrition_targets[field] for field in columns], 0))
+        targets = (targets - self.nutrition_mean[column_ids]) / self.nutrition_std[column_ids]
+        differences = self.nutrition_normalized[:, column_ids] - targets.astype(np.float32)
+        distances = np.sqrt(np.einsum('ij,ij->i', differences, differences) / len(column_ids))
+        distances[np.isnan(distances)] = np.inf
+        return distances
+    
+    def _build_ingredient_hierarchy(self):
+        """Build the ingredient hierarchy from the vocabulary and the known ingredient categories"""
+        category_maps = []
+        categories_path = os.path.join(self.data_dir, 'ingredient_categories.json')
+        if os.path.exists(categories_path):
+            with open(categories_path, 'r') as f:
+                category_maps.append(json.load(f).get('categories', {}))
+        if self.substitution_kb is not None:
+            category_maps.append(self.substitution_kb.categories)
+        
+        self.ingredient_hierarchy = IngredientHierarchy(
+            self.ingredient_vocabulary, category_maps=category_maps
+        )
+    
+    def _build_sparse_index(self):
+        """
+        Build a sparse integer representation of the ingredient index
+        
+        Every indexed ingredient name gets an id. Recipes are stored as CSR rows of
+        ingredient ids (one entry per ingredient line) and every ingredient id gets
+        a sorted, de-duplicated posting list of recipe indices.
+        """
+        self.ingredient_vocabulary = list(self.ingredient_to_recipes.keys())
+        self.ingredient_ids = {name: i for i, name in enumerate(self.ingredient_vocabulary)}
+        self._vocabulary_match_cache = {}
+        self._exclusion_cache = {}
+        self._purchase_cache = OrderedDict()
+        self.recipe_id_to_index = {recipe.get('id'): i for i, recipe in enumerate(self.recipes)}
+        
+        # Recipe -> ingredient ids
+        self.recipe_ingredient_counts = np.array(
+            [len(parsed) for parsed in self.parsed_recipe_ingredients], dtype=np.int64
+        )
+        self.recipe_indptr = np.zeros(len(self.recipe_ingredient_counts) + 1, dtype=np.int64)
+        np.cumsum(self.recipe_ingredient_counts, out=self.recipe_indptr[1:])
+        self.recipe_ingredient_ids = np.array(
+            [self.ingredient_ids[canonicalize_ingredient(name)]
+             for parsed in self.parsed_recipe_ingredients for name, _ in parsed],
+            dtype=np.int32
+        )
+        self.occurrence_recipes = np.repeat(
+            np.arange(len(self.recipe_ingredient_counts), dtype=np.int32), self.recipe_ingredient_counts
+        )
+        
+        # Ingredient id -> recipe indices
+        postings = [np.unique(np.asarray(self.ingredient_to_recipes[name], dtype=np.int32))
+                    for name in self.ingredient_vocabulary]
+        self.postings_indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in postings], out=self.postings_indptr[1:])
+        self.postings_recipes = np.concatenate(postings) if postings else np.zeros(0, dtype=np.int32)
+        
+        # Raw ingredient line -> recipe indices, used for exclusions: the quantity parser
+        # sometimes keeps only part of a line ("1/4 walnut pieces" -> "pieces")
+        line_to_recipes = defaultdict(list)
+        for i, recipe in enumerate(self.recipes):
+            for line in set(ingredient.lower() for ingredient in recipe.get('ingredients', [])):
+                line_to_recipes[line].append(i)
+        self.ingredient_lines = list(line_to_recipes.keys())
+        self.line_postings_indptr = np.zeros(len(self.ingredient_lines) + 1, dtype=np.int64)
+        np.cumsum([len(line_to_recipes[line]) for line in self.ingredient_lines], out=self.line_postings_indptr[1:])
+        self.line_postings_recipes = np.array(
+            [i for line in self.ingredient_lines for i in line_to_recipes[line]], dtype=np.int32
+        )
+        # Ingredient id parsed from each raw line, so hierarchy exclusions can still see the line
+        self.ingredient_line_ids = np.array(
+            [self.ingredient_ids.get(canonicalize_ingredient(self._parse_ingredient(line)[0]), -1)
+             for line in self.ingredient_lines], dtype=np.int64
+        )
+    
+    def _get_postings(self, ingredient_ids):
+        """Get the union of the posting lists for a set of ingredient ids"""
+        if len(ingredient_ids) == 0:
+            return np.zeros(0, dtype=np.int32)
+        lists = [self.postings_recipes[self.postings_indptr[i]:self.postings_indptr[i + 1]]
+                 for i in ingredient_ids]
+        return np.unique(np.concatenate(lists))
+    
+    def _match_vocabulary(self, user_ingredient):
+        """
+        Get the ids of indexed ingredient names that match a parsed user ingredient
+        
+        The ingredient is canonicalized the same way as the index, then matched
+        through the ingredient hierarchy: the ingredient itself, its descendants
+        ("cheese" -> "cheddar cheese") and its ancestors. Results are memoized
+        per ingredient.
+        """
+        matches = self._vocabulary_match_cache.get(user_ingredient)
+        if matches is None:
+            matches = self.ingredient_hierarchy.related_ingredients(canonicalize_ingredient(user_ingredient))
+            self._vocabulary_match_cache[user_ingredient] = matches
+        return matches
+    
+    def _exclusion_terms(self, ingredient):
+        """Expand an excluded ingredient to itself plus any allergen group it names"""
+        name, _ = self._parse_ingredient(ingredient)
+        for key in (name, name + 's', name.rstrip('s')):
+            if key in ALLERGEN_GROUPS:
+                return [name] + ALLERGEN_GROUPS[key]
+        return [name]
+    
+    def _exclusion_term_pattern(self, term):
+        """Regex for an excluded term (plus plural) that skips its EXCLUSION_EXCEPTIONS phrases"""
+        lookbehinds, lookaheads = '', ''
+        for phrase in EXCLUSION_EXCEPTIONS.get(term, []):
+            before, _, after = phrase.partition(term)
+            if before:
+                lookbehinds += f'(?<!{re.escape(before)})'
+            if after:
+                lookaheads += f'(?!{re.escape(after)})'
+        return lookbehinds + re.escape(term) + r'(?:s|es)?\b' + lookaheads
+    
+    def _excluded_recipes(self, exclude_ingredients):
+        """
+        Get the recipes that use any excluded ingredient
+        
+        An ingredient line is excluded when an excluded term (or a member of the
+        allergen group it names) appears in it as a word, so "pecan" also removes
+        "chopped pecans". Hierarchy descendants of the term ("dairy" -> "skim milk")
+        are excluded too, except lines naming one of the term's EXCLUSION_EXCEPTIONS
+        ("butter" -> "peanut butter"). The result is the union of their posting lists.
+        
+        Args:
+            exclude_ingredients: List of ingredients or allergen groups to avoid
+            
+        Returns:
+            numpy.ndarray: Sorted recipe indices that must not be suggested
+        """
+        excluded = []
+        for ingredient in exclude_ingredients:
+            key = ingredient.lower().strip()
+            recipes = self._exclusion_cache.get(key)
+            if recipes is None:
+                terms = self._exclusion_terms(key)
+                pattern = re.compile(r'\b(?:' + '|'.join(self._exclusion_term_pattern(t) for t in terms) + r')')
+                lists = [self.line_postings_recipes[self.line_postings_indptr[i]:self.line_postings_indptr[i + 1]]
+                         for i, line in enumerate(self.ingredient_lines) if pattern.search(line)]
+                
+                # Plus lines whose parsed ingredient is below the term in the ingredient
+                # hierarchy, unless the raw line names one of the term's exceptions: the
+                # parser reads "1 coconut milk" as "milk", so the name alone can't tell
+                canonical = canonicalize_ingredient(key)
+                nodes = np.append(self.ingredient_hierarchy.descendants(canonical), self.ingredient_ids.get(canonical, -1))
+                exceptions = [phrase for term in terms for phrase in EXCLUSION_EXCEPTIONS.get(term, [])]
+                for i in np.flatnonzero(np.isin(self.ingredient_line_ids, nodes[nodes >= 0])):
+                    if not any(phrase in self.ingredient_lines[i] for phrase in exceptions):
+                        lists.append(self.line_postings_recipes[self.line_postings_indptr[i]:self.line_postings_indptr[i + 1]])
+                lists.append(np.zeros(0, dtype=np.int32))
+                recipes = np.unique(np.concatenate(lists))
+                self._exclusion_cache[key] = recipes
+            excluded.append(recipes)
+        
+        if not excluded:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(excluded))
+    
+    def _vocabulary_mask(self, parsed_user_ingredients):
+        """Get a boolean mask over the vocabulary of names matched by any user ingredient"""
+        mask = np.zeros(len(self.ingredient_vocabulary), dtype=bool)
+        for ingredient in parsed_user_ingredients:
+            mask[self._match_vocabulary(ingredient)] = True
+        return mask
+    
+    def _gather_occurrences(self, recipe_indices):
+        """
+        Get the positions of all ingredient lines of the given recipes
+        
+        Returns:
+            tuple: (positions into recipe_ingredient_ids, owning row in recipe_indices)
+        """
+        lengths = self.recipe_ingredient_counts[recipe_indices]
+        owners = np.repeat(np.arange(len(recipe_indices)), lengths)
+        row_offsets = np.cumsum(lengths) - lengths
+        positions = self.recipe_indptr[recipe_indices][owners] + (np.arange(len(owners)) - row_offsets[owners])
+        return positions, owners
+    
+    def _count_matches(self, recipe_indices, vocabulary_mask):
+        """Count the matched ingredient lines of each recipe in recipe_indices"""
+        positions, owners = self._gather_occurrences(recipe_indices)
+        matched = vocabulary_mask[self.recipe_ingredient_ids[positions]]
+        return np.bincount(owners, weights=matched, minlength=len(recipe_indices)).astype(np.int64)
+    
+    def _top_k(self, scores, k, tiebreak_keys, cluster_ids=None):
+        """
+        Select the positions of the k best scores without sorting every candidate
+        
+        Args:
+            scores: Array of scores (higher is better)
+            k: Number of positions to return
+            tiebreak_keys: Tuple of arrays ordering tied scores ascending,
+                           least significant key first (as in numpy.lexsort)
+            cluster_ids: Optional duplicate cluster id per position; only the best
+                         position of each cluster is kept
+            
+        Returns:
+            numpy.ndarray: Positions into scores, best first
+        """
+        if k <= 0:
+            return np.zeros(0, dtype=np.intp)
+        
+        pool_size = k
+        while True:
+            if pool_size < len(scores):
+                threshold = np.partition(scores, len(scores) - pool_size)[len(scores) - pool_size]
+                selected = np.flatnonzero(scores >= threshold)
+            else:
+                selected = np.arange(len(scores))
+            order = np.lexsort(tuple(key[selected] for key in tiebreak_keys) + (-scores[selected],))
+            ranked = selected[order]
+            if cluster_ids is None:
+                return ranked[:k]
+            
+            # Keep the first (best) position of every cluster; widen the pool if too few remain
+            _, first = np.unique(cluster_ids[ranked], return_index=True)
+            ranked = ranked[np.sort(first)]
+            if len(ranked) >= k or len(selected) == len(scores):
+                return ranked[:k]
+            pool_size *= 4
+    
+    def _build_result(self, recipe_idx, score, vocabulary_mask):
+        """Build a (recipe, score, matched_ingredients, missing_ingredients) tuple"""
+        start, end = self.recipe_indptr[recipe_idx], self.recipe_indptr[recipe_idx + 1]
+        matched_flags = vocabulary_mask[self.recipe_ingredient_ids[start:end]]
+        
+        matched_ingredients = []
+        missing_ingredients = []
+        for (name, _), is_matched in zip(self.parsed_recipe_ingredients[recipe_idx], matched_flags):
+            if is_matched:
+                matched_ingredients.append(name)
+            else:
+                missing_ingredients.append(name)
+        
+        return (self.recipes[recipe_idx], score, matched_ingredients, missing_ingredients)
+    
+    def _tokenize_instructions(self, text):
+        """Split instruction text into lowercase word tokens"""
+        return re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.lower())
+    
+    def _instruction_fingerprint(self):
+        """Fingerprint of the recipe instructions, used to detect a stale instruction index"""
+        digest = hashlib.md5()
+        for recipe in self.recipes:
+            digest.update(json.dumps([recipe.get('id'), recipe.get('instructions', [])]).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_instruction_index(self):
+        """
+        Load the positional instruction index saved in data_dir
+        
+        When the saved index is missing or stale it is built in memory only;
+        save_instruction_index (run by build_recipe_indexes.py) writes it.
+        """
+        index_path = os.path.join(self.data_dir, 'instruction_index.npz')
+        fingerprint = self._instruction_fingerprint()
+        
+        if os.path.exists(index_path):
+            try:
+                with np.load(index_path) as index:
+                    if str(index['fingerprint']) == fingerprint:
+                        self.instruction_terms = {term: i for i, term in enumerate(index['terms'].tolist())}
+                        self.instruction_indptr = index['indptr']
+                        self.instruction_post_recipes = index['recipes']
+                        self.instruction_post_positions = index['positions']
+                        return
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Warning: Could not load instruction index: {e}")
+        
+        self._build_instruction_index()
+    
+    def save_instruction_index(self):
+        """Save the positional instruction index to data_dir so later startups can load it"""
+        index_path = os.path.join(self.data_dir, 'instruction_index.npz')
+        try:
+            np.savez(
+                index_path,
+                fingerprint=np.array(self._instruction_fingerprint()),
+                terms=np.array(list(self.instruction_terms.keys()), dtype=str),
+                indptr=self.instruction_indptr,
+                recipes=self.instruction_post_recipes,
+                positions=self.instruction_post_positions
+            )
+        except OSError as e:
+            print(f"Warning: Could not save instruction index: {e}")
+            return
+        print("Instruction index saved")
+    
+    def _build_instruction_index(self):
+        """
+        Build a positional inverted index over the tokens of every recipe's instructions
+        
+        Each term gets a posting list of (recipe index, token position) pairs sorted
+        by recipe then position. Positions skip one slot between steps so phrases
+        never match across two steps.
+        """
+        print("Building instruction index...")
+        self.instruction_terms = {}
+        term_column, recipe_column, position_column = [], [], []
+        
+        for i, recipe in enumerate(self.recipes):
+            position = 0
+            for step in recipe.get('instructions', []):
+                for token in self._tokenize_instructions(step):
+                    term_column.append(self.instruction_terms.setdefault(token, len(self.instruction_terms)))
+                    recipe_column.append(i)
+                    position_column.append(position)
+                    position += 1
+                position += 1
+        
+        term_column = np.array(term_column, dtype=np.int32)
+        recipe_column = np.array(recipe_column, dtype=np.int32)
+        position_column = np.array(position_column, dtype=np.int32)
+        
+        # Tokens are generated in (recipe, position) order, so a stable sort by term keeps that order
+        order = np.argsort(term_column, kind='stable')
+        self.instruction_post_recipes = recipe_column[order]
+        self.instruction_post_positions = position_column[order]
+        self.instruction_indptr = np.zeros(len(self.instruction_terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_column, minlength=len(self.instruction_terms)), out=self.instruction_indptr[1:])
+        
+        print(f"Indexed {len(term_column)} instruction tokens ({len(self.instruction_terms)} distinct terms)")
+    
+    def _phrase_recipes(self, tokens):
+        """
+        Get the recipes whose instructions contain the tokens as a consecutive phrase
+        
+        Returns:
+            numpy.ndarray: Sorted recipe indices
+        """
+        # Key every occurrence by (recipe, phrase start); the phrase matches where all keys agree
+        stride = np.int64(1 << 32)
+        starts = None
+        for offset, token in enumerate(tokens):
+            term_id = self.instruction_terms.get(token)
+            if term_id is None:
+                return np.zeros(0, dtype=np.int32)
+            start, end = self.instruction_indptr[term_id], self.instruction_indptr[term_id + 1]
+            keys = (self.instruction_post_recipes[start:end].astype(np.int64) * stride
+                    + self.instruction_post_positions[start:end] - offset)
+            starts = keys if starts is None else np.intersect1d(starts, keys, assume_unique=True)
+            if len(starts) == 0:
+                break
+        return np.unique(starts // stride).astype(np.int32)
+    
+    def search_instructions(self, query):
+        """
+        Find recipes whose instructions match a query
+        
+        Bare words must all appear, "quoted words" must appear as a phrase, and a
+        word or phrase preceded by "-", "no" or "without" must not appear, e.g.
+        'no oven' or '"slow cooker" -fry'.
+        
+        Args:
+            query: Instruction query string
+            
+        Returns:
+            numpy.ndarray: Sorted indices of the matching recipes
+        """
+        required, forbidden = [], []
+        negate = False
+        for minus, phrase, word in re.findall(r'(-?)"([^"]*)"|(\S+)', query.lower()):
+            if minus or (word.startswith('-') and len(word) > 1):
+                negate, word = True, word[1:]
+            if word in ('no', 'without'):
+                negate = True
+                continue
+            if negate and word in ('a', 'an', 'the', 'any'):
+                continue
+            
+            tokens = self._tokenize_instructions(phrase or word)
+            if tokens:
+                (forbidden if negate else required).append(self._phrase_recipes(tokens))
+            negate = False
+        
+        matches = np.arange(len(self.recipes), dtype=np.int32)
+        for recipes in required:
+            matches = np.intersect1d(matches, recipes, assume_unique=True)
+        for recipes in forbidden:
+            matches = np.setdiff1d(matches, recipes, assume_unique=True)
+        return matches
+    
+    def _compute_recipe_embeddings(self):
+        """
+        Compute name, tag and ingredient embeddings for all recipes to enable semantic search
+        
+        Each field gets its own unit-length embedding matrix (all zeros for recipes
+        with an empty field). The matrices are stacked side by side in
+        field_embeddings and cached in data_dir as recipe_embeddings.npz.
+        """
+        if not self.recipes or not self.use_semantic_search:
+            return
+        
+        # Extract ingredient lists as text (using parsed ingredient names without quantities)
+        self.recipe_ingredients = [
+            ' '.join([name for name, _ in recipe_ingredients]) 
+            for recipe_ingredients in self.parsed_recipe_ingredients
+        ]
+        field_texts = {
+            'name': [recipe.get('name') or '' for recipe in self.recipes],
+            'tags': [' '.join(recipe.get('tags') or []) for recipe in self.recipes],
+            'ingredients': self.recipe_ingredients
+        }
+        
+        digest = hashlib.md5(str(self.embedding_model_name).encode('utf-8'))
+        for field in self.EMBEDDING_FIELDS:
+            digest.update(json.dumps(field_texts[field]).encode('utf-8'))
+        fingerprint = digest.hexdigest()
+        
+        # Reuse the cached matrices if they were computed from the same texts and model
+        cache_path = os.path.join(self.data_dir, 'recipe_embeddings.npz')
+        matrices = None
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cache:
+                    if str(cache['fingerprint']) == fingerprint:
+                        matrices = {field: cache[field] for field in self.EMBEDDING_FIELDS}
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Warning: Could not load recipe embeddings: {e}")
+        
+        if matrices is None:
+            print("Computing recipe embeddings for semantic search...")
+            matrices = {}
+            for field in self.EMBEDDING_FIELDS:
+                texts = field_texts[field]
+                embeddings = np.asarray(self.embedding_model.encode(texts), dtype=np.float32)
+                
+                # Unit-length rows so cosine similarity is a plain dot product
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                embeddings = embeddings / np.maximum(norms, 1e-12)
+                embeddings[[not text.strip() for text in texts]] = 0
+                matrices[field] = embeddings
+            
+            try:
+                np.savez(cache_path, fingerprint=np.array(fingerprint), **matrices)
+            except OSError as e:
+                print(f"Warning: Could not save recipe embeddings: {e}")
+        
+        self.recipe_embeddings = matrices['ingredients']
+        self.normalized_embeddings = matrices['ingredients']
+        self.field_embeddings = np.hstack([matrices[field] for field in self.EMBEDDING_FIELDS])
+        
+        print("Recipe embeddings computed")
+    
+    def _get_minhash_sketches(self, num_hashes=64):
+        """
+        Get MinHash sketches of every recipe's ingredient set (computed on first use)
+        
+        The fraction of equal positions in two sketches estimates the Jaccard
+        similarity of the two ingredient sets.
+        
+        Returns:
+            numpy.ndarray: (num_recipes, num_hashes) array of uint32 sketches
+        """
+        if self.minhash_sketches is None:
+            self.minhash_sketches = self._minhash_rows(self.recipe_indptr, self.recipe_ingredient_ids, num_hashes)
+        return self.minhash_sketches
+    
+    def _minhash_rows(self, indptr, feature_ids, num_hashes):
+        """
+        Compute a MinHash sketch for every row of a CSR matrix of integer features
+        
+        Args:
+            indptr: Row pointer array (one row per recipe)
+            feature_ids: Feature id of every entry
+            num_hashes: Number of hash functions (sketch length)
+            
+        Returns:
+            numpy.ndarray: (num_rows, num_hashes) array of uint32 sketches; empty rows
+                           get the maximum value in every position
+        """
+        prime = (1 << 31) - 1
+        rng = np.random.RandomState(42)
+        a = rng.randint(1, prime, size=num_hashes).astype(np.int64)
+        b = rng.randint(0, prime, size=num_hashes).astype(np.int64)
+        
+        # Hash every entry, then take the minimum over each row
+        sketches = np.full((len(indptr) - 1, num_hashes), prime, dtype=np.int64)
+        non_empty = np.diff(indptr) > 0
+        if non_empty.any():
+            entry_hashes = (np.asarray(feature_ids, dtype=np.int64)[:, None] * a + b) % prime
+            sketches[non_empty] = np.minimum.reduceat(entry_hashes, indptr[:-1][non_empty], axis=0)
+        return sketches.astype(np.uint32)
+    
+    def _cluster_fingerprint(self):
+        """Fingerprint of the recipe names and ingredients, used to detect stale duplicate clusters"""
+        digest = hashlib.md5()
+        digest.update(json.dumps([[recipe.get('id'), recipe.get('name')] for recipe in self.recipes]).encode('utf-8'))
+        digest.update(self.recipe_indptr.tobytes())
+        digest.update(self.recipe_ingredient_ids.tobytes())
+        return digest.hexdigest()
+    
+    def _load_duplicate_clusters(self):
+        """
+        Load the duplicate cluster ids saved in data_dir
+        
+        When the saved clusters are missing or stale they are built in memory only;
+        save_duplicate_clusters (run by build_recipe_indexes.py) writes them.
+        """
+        clusters_path = os.path.join(self.data_dir, 'recipe_clusters.npz')
+        if os.path.exists(clusters_path):
+            try:
+                with np.load(clusters_path) as clusters:
+                    if str(clusters['fingerprint']) == self._cluster_fingerprint():
+                        self.recipe_cluster_ids = clusters['cluster_ids']
+                        return
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Warning: Could not load duplicate clusters: {e}")
+        
+        self._build_duplicate_clusters()
+    
+    def save_duplicate_clusters(self):
+        """Save the duplicate cluster ids to data_dir so later startups can load them"""
+        try:
+            np.savez(
+                os.path.join(self.data_dir, 'recipe_clusters.npz'),
+                fingerprint=np.array(self._cluster_fingerprint()),
+                cluster_ids=self.recipe_cluster_ids
+            )
+        except OSError as e:
+            print(f"Warning: Could not save duplicate clusters: {e}")
+            return
+        print("Duplicate clusters saved")
+    
+    def _build_duplicate_clusters(self, num_hashes=64, bands=16, threshold=0.7, max_bucket_size=50):
+        """
+        Group near-duplicate recipes and store a cluster id per recipe
+        
+        Each recipe is described by its canonical ingredients plus the words of its
+        normalized name. MinHash sketches are split into bands; recipes sharing a
+        band are compared by sketch agreement and merged (union-find) when the
+        estimated Jaccard similarity reaches the threshold. The cluster id is the
+        lowest recipe index in the cluster.
+        
+        Comparing a bucket is quadratic in its size, so buckets larger than
+        max_bucket_size (typically very short, generic ingredient lists) are
+        skipped; true duplicates almost always also share a smaller bucket.
+        
+        Args:
+            num_hashes: MinHash sketch length
+            bands: Number of LSH bands (num_hashes must be divisible by it)
+            threshold: Minimum estimated Jaccard similarity for duplicates
+            max_bucket_size: Largest band bucket whose members are compared
+        """
+        num_recipes = len(self.recipes)
+        num_vocabulary = len(self.ingredient_vocabulary)
+        stop_words = {'a', 'an', 'and', 'the', 'with', 'of', 'in', 'my', 's'}
+        
+        # Features: ingredient ids, then name words offset past the vocabulary
+        name_words = {}
+        features, counts = [], []
+        for i, recipe in enumerate(self.recipes):
+            ids = set(self.recipe_ingredient_ids[self.recipe_indptr[i]:self.recipe_indptr[i + 1]].tolist())
+            for word in re.findall(r'[a-z]+', (recipe.get('name') or '').lower()):
+                if word not in stop_words:
+                    ids.add(num_vocabulary + name_words.setdefault(singularize(word), len(name_words)))
+            features.extend(sorted(ids))
+            counts.append(len(ids))
+        indptr = np.zeros(num_recipes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        sketches = self._minhash_rows(indptr, features, num_hashes)
+        
+        parent = np.arange(num_recipes)
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        # Recipes sharing any band are candidate pairs
+        rows = num_hashes // bands
+        has_features = np.diff(indptr) > 0
+        checked = set()
+        skipped = 0
+        for band in range(bands):
+            buckets = defaultdict(list)
+            band_keys = sketches[:, band * rows:(band + 1) * rows]
+            for i in np.flatnonzero(has_features):
+                buckets[band_keys[i].tobytes()].append(i)
+            for members in buckets.values():
+                if len(members) > max_bucket_size:
+                    skipped += 1
+                    continue
+                for i, j in itertools.combinations(members, 2):
+                    if (i, j) in checked:
+                        continue
+                    checked.add((i, j))
+                    if np.mean(sketches[i] == sketches[j]) >= threshold:
+                        root_i, root_j = find(i), find(j)
+                        if root_i != root_j:
+                            parent[max(root_i, root_j)] = min(root_i, root_j)
+        
+        self.recipe_cluster_ids = np.array([find(i) for i in range(num_recipes)], dtype=np.int32)
+        num_clusters = len(np.unique(self.recipe_cluster_ids))
+        print(f"Found {num_recipes - num_clusters} near-duplicate recipes ({num_clusters} clusters)")
+        if skipped:
+            print(f"Skipped {skipped} LSH buckets with more than {max_bucket_size} recipes")
+    
+    def build_similarity_graph(self, k=20, embedding_weight=0.5):
+        """
+        Precompute the k nearest neighbours of every recipe and save them to data_dir
+        
+        This compares every pair of recipes, so it is an offline step (see
+        build_recipe_indexes.py); searches never build the graph themselves.
+        Neighbour ids are stored as int32 and scores as float16 so the graph can be
+        memory-mapped cheaply at query time.
+        
+        Args:
+            k: Number of neighbours to keep per recipe
+            embedding_weight: Weight of the embedding cosine (Jaccard gets the rest)
+            
+        Returns:
+            tuple: (neighbour indices, neighbour scores) arrays of shape (num_recipes, k)
+        """
+        num_recipes = len(self.recipes)
+        k = max(0, min(k, num_recipes - 1))
+        use_embeddings = self.normalized_embeddings is not None
+        print(f"Building {k}-NN similarity graph for {num_recipes} recipes...")
+        
+        # Distinct ingredients per recipe (posting lists are de-duplicated)
+        set_sizes = np.bincount(self.postings_recipes, minlength=num_recipes)
+        
+        indices = np.zeros((num_recipes, k), dtype=np.int32)
+        scores = np.zeros((num_recipes, k), dtype=np.float16)
+        for i in range(num_recipes):
+            similarity = self._similarity_row(i, embedding_weight, set_sizes)
+            
+            # Highest similarity first, ties by recipe order
+            neighbours = self._top_k(similarity, k, [np.arange(num_recipes)])
+            indices[i] = neighbours
+            scores[i] = similarity[neighbours]
+        
+        # Save next to the processed recipes; the graph still works in memory if that fails
+        try:
+            np.save(os.path.join(self.data_dir, 'recipe_knn_indices.npy'), indices)
+            np.save(os.path.join(self.data_dir, 'recipe_knn_scores.npy'), scores)
+            with open(os.path.join(self.data_dir, 'recipe_knn_meta.json'), 'w') as f:
+                json.dump({
+                    'fingerprint': self._similarity_fingerprint(),
+                    'k': int(k),
+                    'embedding_weight': embedding_weight if use_embeddings else 0.0
+                }, f)
+            print("Similarity graph saved")
+        except OSError as e:
+            print(f"Warning: Could not save similarity graph: {e}")
+        
+        self.similarity_graph = (indices, scores)
+        return self.similarity_graph
+    
+    def _similarity_row(self, recipe_idx, embedding_weight=0.5, set_sizes=None):
+        """
+        Similarity of one recipe to every recipe
+        
+        Similarity is the Jaccard overlap of the two ingredient sets, blended with
+        the cosine similarity of the recipe embeddings when those are available.
+        
+        Args:
+            recipe_idx: Index of the recipe
+            embedding_weight: Weight of the embedding cosine (Jaccard gets the rest)
+            set_sizes: Optional distinct ingredient count per recipe, when computing many rows
+            
+        Returns:
+            numpy.ndarray: Similarity per recipe, -inf for the recipe itself
+        """
+        num_recipes = len(self.recipes)
+        if set_sizes is None:
+            set_sizes = np.bincount(self.postings_recipes, minlength=num_recipes)
+        
+        # Intersection sizes with every recipe from the postings of this recipe's ingredients
+        row_ids = np.unique(self.recipe_ingredient_ids[self.recipe_indptr[recipe_idx]:self.recipe_indptr[recipe_idx + 1]])
+        intersection = np.bincount(self._get_postings(row_ids), minlength=num_recipes)
+        union = set_sizes[recipe_idx] + set_sizes - intersection
+        similarity = np.divide(intersection, union, out=np.zeros(num_recipes), where=union > 0)
+        
+        if self.normalized_embeddings is not None:
+            cosine = self.normalized_embeddings @ self.normalized_embeddings[recipe_idx]
+            similarity = (1 - embedding_weight) * similarity + embedding_weight * cosine
+        similarity[recipe_idx] = -np.inf
+        return similarity
+    
+    def _similarity_fingerprint(self):
+        """Fingerprint of the indexed recipes, used to detect a stale similarity graph"""
+        digest = hashlib.md5()
+        digest.update(json.dumps([recipe.get('id') for recipe in self.recipes]).encode('utf-8'))
+        digest.update(self.recipe_indptr.tobytes())
+        digest.update(json.dumps(self.ingredient_vocabulary).encode('utf-8'))
+        digest.update(self.recipe_ingredient_ids.tobytes())
+        digest.update(b'embeddings' if self.normalized_embeddings is not None else b'keywords')
+        return digest.hexdigest()
+    
+    def _get_similarity_graph(self):
+        """
+        Get the k-NN similarity graph, memory-mapping the saved copy when it is current
+        
+        Returns:
+            tuple: (neighbour indices, neighbour scores) arrays, or None when no
+                   current graph has been built offline
+        """
+        if self.similarity_graph is None:
+            indices_path = os.path.join(self.data_dir, 'recipe_knn_indices.npy')
+            scores_path = os.path.join(self.data_dir, 'recipe_knn_scores.npy')
+            meta_path = os.path.join(self.data_dir, 'recipe_knn_meta.json')
+            
+            if all(os.path.exists(path) for path in (indices_path, scores_path, meta_path)):
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                indices = np.load(indices_path, mmap_mode='r')
+                scores = np.load(scores_path, mmap_mode='r')
+                if meta.get('fingerprint') == self._similarity_fingerprint() and indices.shape[0] == len(self.recipes):
+                    self.similarity_graph = (indices, scores)
+        return self.similarity_graph
+    
+    def similar_recipes(self, recipe_id, k=5):
+        """
+        Find the recipes most similar to a given recipe ("more like this")
+        
+        Uses the precomputed similarity graph when one is current and wide enough,
+        otherwise scores this one recipe against all others on the fly.
+        
+        Args:
+            recipe_id: ID of the recipe to find neighbours for
+            k: Maximum number of similar recipes to return
+            
+        Returns:
+            list: (recipe, similarity) tuples, most similar first
+        """
+        recipe_idx = self.recipe_id_to_index.get(recipe_id)
+        if recipe_idx is None:
+            return []
+        
+        graph = self._get_similarity_graph()
+        if graph is not None and k <= graph[0].shape[1]:
+            indices, scores = graph[0][recipe_idx][:k], graph[1][recipe_idx][:k]
+        else:
+            similarity = self._similarity_row(recipe_idx)
+            indices = self._top_k(similarity, k, [np.arange(len(self.recipes))])
+            scores = similarity[indices]
+        
+        return [
+            (self.recipes[int(neighbour)], float(score))
+            for neighbour, score in zip(indices, scores)
+            if score > 0
+        ]
+    
+    def parse_user_ingredients(self, user_ingredients):
+        """
+        Parse user-provided ingredients to handle cases with and without quantities
+        
+        Args:
+            user_ingredients: List of ingredient strings (may include quantities)
+            
+        Returns:
+            list: List of parsed ingredient names without quantities
+        """
+        parsed_ingredients = []
+        
+        for ingredient in user_ingredients:
+            # Parse to get just the ingredient name
+            name, _ = self._parse_ingredient(ingredient.lower())
+            parsed_ingredients.append(name)
+        
+        return parsed_ingredients
+    
+    def recipes_with_ingredient(self, ingredient_name):
+        """
+        Get the recipes that use an ingredient
+        
+        The ingredient is matched through the ingredient hierarchy the same way
+        as in find_recipes, so "cheese" also finds recipes using "cheddar cheese".
+        
+        Args:
+            ingredient_name: Parsed ingredient name (see parse_user_ingredients)
+            
+        Returns:
+            numpy.ndarray: Sorted recipe indices into self.recipes
+        """
+        return self._get_postings(self._match_vocabulary(ingredient_name))
+    
+    def excluded_recipe_indices(self, exclude_ingredients):
+        """
+        Get the recipes that use any of the excluded ingredients
+        
+        Args:
+            exclude_ingredients: List of ingredients or allergen groups to avoid
+            
+        Returns:
+            numpy.ndarray: Sorted recipe indices into self.recipes
+        """
+        return self._excluded_recipes(exclude_ingredients)
+    
+    def find_recipes(self, available_ingredients, max_results=10, min_ingredients_matched=1, search_mode='coverage',
+                     ingredient_weights=None, diversity=0.0, exclude_ingredients=None, instruction_query=None,
+                     deadline_ms=None, query_text=None, field_weights=None, collapse_duplicates=False,
+                     tags_all=None, tags_any=None, facets=False, nutrition_ranges=None,
+                     nutrition_targets=None, nutrition_weight=0.5):
+        """
+        Find recipes that can be made with available ingredients
+        
+        Args:
+            available_ingredients: List of ingredients the user has
+            max_results: Maximum number of recipes to return
+            min_ingredients_matched: Minimum number of ingredients that must match
+            search_mode: 'coverage' (% of recipe ingredients available) or 
+                        'count' (total number of matching ingredients) or
+                        'semantic' (semantic similarity to available ingredients) or
+                        'use_it_up' (weighted use of urgent ingredients, see ingredient_weights)
+            ingredient_weights: Optional dict of available ingredient -> urgency weight
+                        (e.g. from ConversationState.get_ingredient_urgency); ingredients
+                        without a weight count as 0 in 'use_it_up' mode
+            diversity: Optional weight (0-1) of the maximal-marginal-relevance re-ranking;
+                        0 keeps the plain score order
+            exclude_ingredients: Optional ingredients or allergen groups (e.g. "nuts",
+                        "shellfish") that no returned recipe may contain
+            instruction_query: Optional query the recipe instructions must match
+                        (see search_instructions), e.g. 'no oven' or '"slow cooker"'
+            deadline_ms: Optional time budget in milliseconds for keyword searches; the most
+                        promising candidates are scored first and the search returns the best
+                        found so far when the budget runs out
+            query_text: Optional free text for 'semantic' mode matched against recipe names
+                        and tags, e.g. "quick chicken soup"
+            field_weights: Optional dict of 'name'/'tags'/'ingredients' -> weight for 'semantic' mode
+            collapse_duplicates: If True, return at most one recipe per near-duplicate cluster
+            tags_all: Optional tags every returned recipe must have
+            tags_any: Optional tags of which every returned recipe must have at least one
+            facets: If True, count the tags of every matching recipe into .facets
+            nutrition_ranges: Optional dict of nutrient -> (min, max) limits, e.g.
+                        {'calories': (None, 600), 'protein': (30, None)} (see NUTRITION_FIELDS)
+            nutrition_targets: Optional dict of nutrient -> target value; keyword modes blend
+                        the score (scaled to [0, 1]) with the closeness to the targets
+            nutrition_weight: Weight (0-1) of the nutrition closeness in the blended score
+            
+        Returns:
+            SearchResults: List of (recipe, score, matched_ingredients, missing_ingredients)
+                           tuples; .exhaustive is False if the deadline cut the search short
+                           and .facets holds the tag counts when requested
+        """
+        start_time = time.perf_counter()
+        self.search_metrics['searches'] += 1
+        if not self.recipes:
+            return SearchResults()
+        
+        search_info = {}
+        if deadline_ms is not None:
+            search_info['deadline'] = start_time + deadline_ms / 1000.0
+            self.search_metrics['deadline_searches'] += 1
+        
+        # Parse user ingredients to extract names without quantities
+        parsed_user_ingredients = self.parse_user_ingredients(available_ingredients)
+        
+        # Hard exclusions are removed from the candidates before any scoring
+        excluded_recipes = self._excluded_recipes(exclude_ingredients or [])
+        
+        # Recipes whose instructions don't match the query are dropped the same way
+        if instruction_query:
+            not_matching = np.setdiff1d(np.arange(len(self.recipes), dtype=np.int32),
+                                        self.search_instructions(instruction_query), assume_unique=True)
+            excluded_recipes = np.union1d(excluded_recipes, not_matching)
+        
+        # And so are recipes failing the tag filters
+        if tags_all or tags_any:
+            not_matching = np.setdiff1d(np.arange(len(self.recipes), dtype=np.int32),
+                                        self._tag_filter(tags_all, tags_any), assume_unique=True)
+            excluded_recipes = np.union1d(excluded_recipes, not_matching)
+        
+        # And recipes outside the nutrition ranges
+        if nutrition_ranges:
+            not_matching = np.setdiff1d(np.arange(len(self.recipes), dtype=np.int32),
+                                        self._nutrition_filter(nutrition_ranges), assume_unique=True)
+            excluded_recipes = np.union1d(excluded_recipes, not_matching)
+        
+        # Closeness (0-1] to the target macros, blended into keyword scores
+        nutrition_closeness = None
+        if nutrition_targets:
+            nutrition_closeness = 1.0 / (1.0 + self.nutrition_distances(nutrition_targets))
+        
+        if facets:
+            search_info['matches'] = []
+        
+        if search_mode == 'semantic' and self.use_semantic_search:
+            results = self._semantic_search(parsed_user_ingredients, max_results, excluded_recipes,
+                                            query_text, field_weights, collapse_duplicates)
+        elif search_mode == 'use_it_up':
+            # Key the weights by parsed name so they line up with parsed_user_ingredients
+            parsed_weights = {}
+            for ingredient, weight in (ingredient_weights or {}).items():
+                name, _ = self._parse_ingredient(ingredient.lower())
+                parsed_weights[name] = max(weight, parsed_weights.get(name, 0.0))
+            results = self._keyword_search(parsed_user_ingredients, max_results, min_ingredients_matched,
+                                           search_mode, parsed_weights, diversity, excluded_recipes, search_info,
+                                           collapse_duplicates, nutrition_closeness, nutrition_weight)
+        else:
+            results = self._keyword_search(parsed_user_ingredients, max_results, min_ingredients_matched,
+                                           search_mode, diversity=diversity, excluded_recipes=excluded_recipes,
+                                           search_info=search_info, collapse_duplicates=collapse_duplicates,
+                                           nutrition_closeness=nutrition_closeness, nutrition_weight=nutrition_weight)
+        
+        # Facets count every recipe the search matched, not just the returned page
+        facet_counts = None
+        if facets:
+            matches = search_info.pop('matches')
+            if search_mode == 'semantic' and self.use_semantic_search:
+                matches = [np.setdiff1d(np.arange(len(self.recipes), dtype=np.int32), excluded_recipes)]
+            facet_counts = self.tag_facets(np.concatenate(matches) if matches else [])
+        
+        exhaustive = search_info.pop('exhaustive', True)
+        search_info.pop('deadline', None)
+        search_info['elapsed_ms'] = (time.perf_counter() - start_time) * 1000.0
+        if not exhaustive:
+            self.search_metrics['deadline_cutoffs'] += 1
+        return SearchResults(results, exhaustive, search_info, facet_counts)
+    
+    def _keyword_search(self, parsed_user_ingredients, max_results, min_ingredients_matched, search_mode,
+                        ingredient_weights=None, diversity=0.0, excluded_recipes=None, search_info=None,
+                        collapse_duplicates=False, nutrition_closeness=None, nutrition_weight=0.5):
+        """Find recipes using keyword matching of ingredients"""
+        # Re-ranking for diversity picks from a larger pool of top candidates
+        pool_size = max(max_results * 4, 20) if diversity else max_results
+        
+        vocabulary_mask = self._vocabulary_mask(parsed_user_ingredients)
+        top, scores = self._rank_keyword_candidates(parsed_user_ingredients, vocabulary_mask, pool_size,
+                                                    min_ingredients_matched, search_mode, ingredient_weights,
+                                                    excluded_recipes, search_info, collapse_duplicates,
+                                                    nutrition_closeness, nutrition_weight)
+        
+        if diversity and len(top) > max_results:
+            selected = self._mmr_rerank(top, scores, max_results, diversity)
+            top, scores = [top[i] for i in selected], [scores[i] for i in selected]
+        
+        return [self._build_result(recipe_idx, score, vocabulary_mask) for recipe_idx, score in zip(top, scores)]
+    
+    def _mmr_rerank(self, recipe_indices, scores, k, diversity):
+        """
+        Re-rank candidates with maximal marginal relevance
+        
+        Each step picks the candidate with the best trade-off between its own score
+        and its similarity to the recipes already picked, keeping a running maximum
+        similarity per candidate so the whole selection costs O(N * k).
+        
+        Args:
+            recipe_indices: Candidate recipe indices, best first
+            scores: Candidate scores
+            k: Number of recipes to select
+            diversity: Weight of the similarity penalty (0-1)
+            
+        Returns:
+            list: Positions into recipe_indices in selection order
+        """
+        recipe_indices = np.asarray(recipe_indices)
+        relevance = np.asarray(scores, dtype=np.float64)
+        spread = relevance.max() - relevance.min()
+        relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+        
+        # Compare with embeddings when available, otherwise with MinHash sketches
+        if self.normalized_embeddings is not None:
+            vectors = self.normalized_embeddings[recipe_indices]
+            similarity_to = lambda i: vectors @ vectors[i]
+        else:
+            sketches = self._get_minhash_sketches()[recipe_indices]
+            similarity_to = lambda i: (sketches == sketches[i]).mean(axis=1)
+        
+        max_similarity = np.zeros(len(recipe_indices))
+        available = np.ones(len(recipe_indices), dtype=bool)
+        selected = []
+        for _ in range(min(k, len(recipe_indices))):
+            mmr = (1 - diversity) * relevance - diversity * max_similarity
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            available[best] = False
+            max_similarity = np.maximum(max_similarity, similarity_to(best))
+        
+        return selected
+    
+    def _rank_keyword_candidates(self, parsed_user_ingredients, vocabulary_mask, max_results,
+                                 min_ingredients_matched, search_mode, ingredient_weights=None,
+                                 excluded_recipes=None, search_info=None, collapse_duplicates=False,
+                                 nutrition_closeness=None, nutrition_weight=0.5):
+        """
+        Score and rank the recipes that use at least one available ingredient
+        
+        Args:
+            parsed_user_ingredients: Parsed user ingredient names
+            vocabulary_mask: Boolean mask of vocabulary names the user has
+            max_results: Maximum number of recipes to return
+            min_ingredients_matched: Minimum number of ingredients that must match
+            search_mode: 'coverage', 'count' or 'use_it_up'
+            ingredient_weights: Dict of parsed ingredient name -> urgency weight
+            excluded_recipes: Optional sorted recipe indices to drop before scoring
+            search_info: Optional dict; a 'deadline' (time.perf_counter() value) in it bounds
+                         the search, and candidate counts and 'exhaustive' are written back
+            collapse_duplicates: If True, keep only the best recipe of each duplicate cluster
+            nutrition_closeness: Optional closeness (0-1] of every recipe to target macros,
+                                 blended into the scores after scaling them to [0, 1]
+            nutrition_weight: Weight (0-1) of the nutrition closeness in the blended score
+            
+        Returns:
+            tuple: (list of recipe indices, list of scores), best first
+        """
+        # Find candidate recipes (any recipe that uses at least one available ingredient
+        # or a more specific/generic form of one)
+        matched_ids = np.flatnonzero(vocabulary_mask)
+        candidates = self._get_postings(matched_ids)
+        if excluded_recipes is not None and len(excluded_recipes):
+            candidates = np.setdiff1d(candidates, excluded_recipes, assume_unique=True)
+        search_info = search_info if search_info is not None else {}
+        search_info['candidates'] = len(candidates)
+        search_info['candidates_scored'] = 0
+        if len(candidates) == 0:
+            return [], []
+        
+        if search_mode == 'use_it_up':
+            urgency = self._urgency_scores(parsed_user_ingredients, ingredient_weights or {})
+        
+        # Count and use_it_up scores are unbounded, so they are divided by their largest
+        # value among the candidates before blending with the closeness; the scale is
+        # fixed up front so every deadline batch uses the same one
+        if nutrition_closeness is not None:
+            if search_mode == 'count':
+                score_scale = float(self._count_matches(candidates, vocabulary_mask).max())
+            elif search_mode == 'use_it_up':
+                score_scale = float(urgency[candidates].max())
+            else:
+                score_scale = 1.0
+            score_scale = score_scale if score_scale > 0 else 1.0
+        
+        # Without a deadline every candidate is scored in one batch. With one, the most
+        # promising candidates (most matched postings per recipe ingredient) go first
+        # and the best-so-far top-k is kept between batches.
+        deadline = search_info.get('deadline')
+        if deadline is None:
+            batches = [candidates]
+        else:
+            hits = np.bincount(
+                np.concatenate([self.postings_recipes[self.postings_indptr[i]:self.postings_indptr[i + 1]]
+                                for i in matched_ids]),
+                minlength=len(self.recipes)
+            )[candidates]
+            priority = hits if search_mode == 'count' else hits / self.recipe_ingredient_counts[candidates]
+            ordered = candidates[np.lexsort((candidates, -priority))]
+            batches = [ordered[i:i + self.DEADLINE_BATCH_SIZE]
+                       for i in range(0, len(ordered), self.DEADLINE_BATCH_SIZE)]
+        
+        best_candidates = np.zeros(0, dtype=candidates.dtype)
+        best_scores = np.zeros(0)
+        best_coverage = np.zeros(0)
+        search_info['exhaustive'] = True
+        for batch_number, batch in enumerate(batches):
+            if batch_number and time.perf_counter() >= deadline:
+                search_info['exhaustive'] = False
+                break
+            search_info['candidates_scored'] += len(batch)
+            
+            # Count matching ingredient lines for every candidate at once
+            matched_counts = self._count_matches(batch, vocabulary_mask)
+            
+            # Skip if too few ingredients match
+            keep = matched_counts >= min_ingredients_matched
+            batch, matched_counts = batch[keep], matched_counts[keep]
+            if 'matches' in search_info:
+                search_info['matches'].append(batch)
+            
+            # Percentage of recipe ingredients that are available
+            coverage = matched_counts / self.recipe_ingredient_counts[batch]
+            
+            # Calculate score based on search mode
+            if search_mode == 'count':
+                # Total number of matching ingredients
+                scores = matched_counts
+            elif search_mode == 'use_it_up':
+                # Sum of the urgency weights of the pantry items each recipe uses,
+                # with coverage breaking ties between equally urgent recipes
+                scores = urgency[batch]
+            else:
+                # Default to coverage
+                scores = coverage
+            
+            if nutrition_closeness is not None:
+                scores = ((1 - nutrition_weight) * scores / score_scale
+                          + nutrition_weight * nutrition_closeness[batch])
+            
+            # Merge with the best results so far
+            if len(batches) > 1:
+                batch = np.concatenate([best_candidates, batch])
+                scores = np.concatenate([best_scores, scores])
+                coverage = np.concatenate([best_coverage, coverage])
+            tiebreak_keys = (batch, -coverage) if search_mode == 'use_it_up' else (batch,)
+            cluster_ids = self.recipe_cluster_ids[batch] if collapse_duplicates else None
+            top = self._top_k(scores, max_results, tiebreak_keys, cluster_ids)
+            best_candidates, best_scores, best_coverage = batch[top], scores[top], coverage[top]
+        
+        # Return top results
+        return best_candidates.tolist(), best_scores.tolist()
+    
+    def find_recipes_multi(self, pantries, max_results=10, min_ingredients_matched=1, search_mode='coverage',
+                           exclude_ingredients=None):
+        """
+        Find recipes that can be made by combining several people's pantries
+        
+        Recipes are scored against the union of the pantries, then each result
+        reports which of its matched ingredients every pantry can supply.
+        
+        Args:
+            pantries: Dict of owner -> list of ingredients (a plain list of
+                      ingredient lists is also accepted, owners are then 1, 2, ...)
+            max_results: Maximum number of recipes to return
+            min_ingredients_matched: Minimum number of ingredients that must match
+            search_mode: 'coverage' or 'count'
+            exclude_ingredients: Optional ingredients or allergen groups no member can eat
+            
+        Returns:
+            list: List of (recipe, score, matched_ingredients, missing_ingredients, contributions)
+                  tuples, where contributions maps each owner to the matched ingredients
+                  from their pantry
+        """
+        if not self.recipes or not pantries:
+            return []
+        
+        if not isinstance(pantries, dict):
+            pantries = {i + 1: pantry for i, pantry in enumerate(pantries)}
+        
+        # One vocabulary bitmask per pantry; the household can use anything in their union
+        parsed_pantries = {owner: self.parse_user_ingredients(pantry) for owner, pantry in pantries.items()}
+        pantry_masks = {owner: self._vocabulary_mask(parsed) for owner, parsed in parsed_pantries.items()}
+        union_ingredients = list(dict.fromkeys(name for parsed in parsed_pantries.values() for name in parsed))
+        union_mask = np.logical_or.reduce(list(pantry_masks.values()))
+        
+        top, scores = self._rank_keyword_candidates(union_ingredients, union_mask, max_results,
+                                                    min_ingredients_matched, search_mode,
+                                                    excluded_recipes=self._excluded_recipes(exclude_ingredients or []))
+        
+        # Attribute matches to pantries only for the returned recipes
+        results = []
+        for recipe_idx, score in zip(top, scores):
+            recipe, score, matched, missing = self._build_result(recipe_idx, score, union_mask)
+            recipe_ids = self.recipe_ingredient_ids[self.recipe_indptr[recipe_idx]:self.recipe_indptr[recipe_idx + 1]]
+            names = [name for name, _ in self.parsed_recipe_ingredients[recipe_idx]]
+            contributions = {
+                owner: [name for name, flag in zip(names, mask[recipe_ids]) if flag]
+                for owner, mask in pantry_masks.items()
+            }
+            results.append((recipe, score, matched, missing, contributions))
+        
+        return results
+    
+    def _urgency_scores(self, parsed_user_ingredients, ingredient_weights):
+        """
+        Score every recipe by the summed weight of the distinct pantry items it uses
+        
+        Args:
+            parsed_user_ingredients: Parsed user ingredient names
+            ingredient_weights: Dict of parsed ingredient name -> urgency weight
+            
+        Returns:
+            numpy.ndarray: Weighted usage score per recipe index
+        """
+        scores = np.zeros(len(self.recipes), dtype=np.float64)
+        for ingredient in set(parsed_user_ingredients):
+            weight = ingredient_weights.get(ingredient, 0.0)
+            if weight:
+                # Each recipe appears once in the union, so every pantry item counts once
+                scores[self._get_postings(self._match_vocabulary(ingredient))] += weight
+        return scores
+    
+    def suggest_purchases(self, available_ingredients, max_items=2, max_suggestions=5,
+                          exclude_ingredients=None):
+        """
+        Suggest what to buy to be able to make the most complete recipes
+        
+        For every purchase size from 1 to max_items, reports ingredient sets that
+        make many recipes fully makeable. This is a beam search, not an exhaustive
+        one: each size only scores the missing sets of that size plus one-item
+        extensions of the best smaller purchases, so a better combination can be
+        missed. Results are cached per pantry; callers get their own copy.
+        
+        Args:
+            available_ingredients: List of ingredients the user has
+            max_items: Largest number of ingredients to buy
+            max_suggestions: Number of purchase options to return per size
+            exclude_ingredients: Optional ingredients or allergen groups to avoid; recipes
+                                 using them are neither counted nor unlocked
+            
+        Returns:
+            dict: 'makeable_now' (recipes already fully covered) and 'options', a dict of
+                  size -> list of {'buy': [ingredient names], 'unlocked': recipe count}
+        """
+        parsed_user_ingredients = self.parse_user_ingredients(available_ingredients)
+        exclusions = frozenset(ingredient.lower().strip() for ingredient in exclude_ingredients or [])
+        cache_key = (frozenset(parsed_user_ingredients), max_items, max_suggestions, exclusions)
+        if cache_key in self._purchase_cache:
+            self._purchase_cache.move_to_end(cache_key)
+            return copy.deepcopy(self._purchase_cache[cache_key])
+        
+        allowed = np.ones(len(self.recipes), dtype=bool)
+        allowed[self._excluded_recipes(sorted(exclusions))] = False
+        
+        # Distinct missing ingredient ids per allowed recipe, from the unmatched ingredient lines
+        vocabulary_size = len(self.ingredient_vocabulary)
+        unmatched = ~self._vocabulary_mask(parsed_user_ingredients)[self.recipe_ingredient_ids]
+        unmatched &= allowed[self.occurrence_recipes]
+        missing_keys = np.unique(
+            self.occurrence_recipes[unmatched].astype(np.int64) * vocabulary_size
+            + self.recipe_ingredient_ids[unmatched]
+        )
+        missing_recipes = missing_keys // vocabulary_size
+        missing_ids = missing_keys % vocabulary_size
+        missing_counts = np.bincount(missing_recipes, minlength=len(self.recipes))
+        
+        makeable_now = int(np.count_nonzero((missing_counts == 0) & (self.recipe_ingredient_counts > 0) & allowed))
+        
+        # Group the recipes that are at most max_items purchases away by their missing set
+        near = missing_counts[missing_recipes] <= max_items
+        near_recipes, near_ids = missing_recipes[near], missing_ids[near]
+        _, starts = np.unique(near_recipes, return_index=True)
+        missing_sets = Counter(tuple(ids) for ids in np.split(near_ids, starts[1:]) if len(ids))
+        
+        def unlocked(purchase):
+            # A recipe becomes makeable when its whole missing set is bought
+            return sum(
+                missing_sets.get(subset, 0)
+                for size in range(1, len(purchase) + 1)
+                for subset in itertools.combinations(purchase, size)
+            )
+        
+        options = {}
+        beam = [()]
+        for size in range(1, max_items + 1):
+            # Candidates: missing sets of exactly this size, plus extensions of the best
+            # smaller purchases by an item that completes another missing set
+            candidates = {ids for ids in missing_sets if len(ids) == size}
+            for purchase in beam:
+                bought = set(purchase)
+                for ids in missing_sets:
+                    if len(ids) <= size:
+                        remaining = [i for i in ids if i not in bought]
+                        if len(remaining) == 1:
+                            candidates.add(tuple(sorted(bought | {remaining[0]})))
+            
+            scored = sorted(((unlocked(purchase), purchase) for purchase in candidates),
+                            key=lambda item: (-item[0], item[1]))
+            beam = [purchase for _, purchase in scored[:max(max_suggestions, 20)]]
+            options[size] = [
+                {'buy': [self.ingredient_vocabulary[i] for i in purchase], 'unlocked': count}
+                for count, purchase in scored[:max_suggestions]
+            ]
+        
+        result = {'makeable_now': makeable_now, 'options': options}
+        self._purchase_cache[cache_key] = result
+        if len(self._purchase_cache) > 128:
+            self._purchase_cache.popitem(last=False)
+        return copy.deepcopy(result)
+    
+    def _semantic_search(self, parsed_user_ingredients, max_results, excluded_recipes=None,
+                         query_text=None, field_weights=None, collapse_duplicates=False):
+        """
+        Find recipes using semantic similarity of their name, tags and ingredients
+        
+        The query is embedded once (ingredient list) or twice (ingredient list and
+        query_text), scaled by the field weights and laid out to match the stacked
+        field matrix, so all recipes are scored with a single matrix product.
+        
+        Args:
+            parsed_user_ingredients: Parsed user ingredient names
+            max_results: Maximum number of recipes to return
+            excluded_recipes: Optional sorted recipe indices to leave out
+            query_text: Optional free-text query (e.g. "quick chicken soup") compared with
+                        recipe names and tags; defaults to the ingredient list
+            field_weights: Optional dict of field -> weight overriding the defaults:
+                           DEFAULT_FIELD_WEIGHTS with a query_text, otherwise the
+                           ingredient field alone (as before field embeddings existed)
+            collapse_duplicates: If True, keep only the best recipe of each duplicate cluster
+            
+        Returns:
+            list: List of (recipe, score, matched_ingredients, missing_ingredients) tuples
+        """
+        if self.field_embeddings is None:
+            print("Semantic search unavailable - fallback to keyword search")
+            return self._keyword_search(parsed_user_ingredients, max_results, 1, 'coverage',
+                                        excluded_recipes=excluded_recipes, collapse_duplicates=collapse_duplicates)
+        
+        if query_text:
+            weights = dict(self.DEFAULT_FIELD_WEIGHTS)
+        else:
+            weights = {'name': 0.0, 'tags': 0.0, 'ingredients': 1.0}
+        weights.update(field_weights or {})
+        total_weight = sum(weights[field] for field in self.EMBEDDING_FIELDS) or 1.0
+        
+        # Create query embeddings from available ingredients (and the free-text query)
+        ingredient_query = ' '.join(parsed_user_ingredients)
+        texts = [ingredient_query] if not query_text else [ingredient_query, query_text]
+        query_embeddings = np.asarray(self.embedding_model.encode(texts), dtype=np.float32)
+        query_embeddings /= np.maximum(np.linalg.norm(query_embeddings, axis=1, keepdims=True), 1e-12)
+        ingredient_embedding, text_embedding = query_embeddings[0], query_embeddings[-1]
+        
+        # Calculate cosine similarity to all recipes in one product with the stacked fields
+        stacked_query = np.concatenate([
+            weights[field] / total_weight * (ingredient_embedding if field == 'ingredients' else text_embedding)
+            for field in self.EMBEDDING_FIELDS
+        ])
+        similarity = self.field_embeddings @ stacked_query
+        
+        # Create a combined score that considers both semantic similarity and ingredient coverage
+        vocabulary_mask = self._vocabulary_mask(parsed_user_ingredients)
+        all_recipes = np.arange(len(self.recipes), dtype=np.int32)
+        counts = self.recipe_ingredient_counts
+        coverage = np.divide(self._count_matches(all_recipes, vocabulary_mask), counts,
+                             out=np.zeros(len(counts)), where=counts > 0)
+        combined_scores = 0.7 * similarity + 0.3 * coverage  # Weight semantic similarity higher
+        
+        if excluded_recipes is not None and len(excluded_recipes):
+            combined_scores[excluded_recipes] = -np.inf
+            max_results = min(max_results, len(all_recipes) - len(excluded_recipes))
+        
+        # Return top results
+        cluster_ids = self.recipe_cluster_ids if collapse_duplicates else None
+        top = self._top_k(combined_scores, max_results, (all_recipes,), cluster_ids)
+        top = top[np.isfinite(combined_scores[top])]
+        return [self._build_result(int(i), float(combined_scores[i]), vocabulary_mask) for i in top]
+
+    def get_recipe_by_id(self, recipe_id):
+        """
+        Retrieve a specific recipe by ID
+        
+        Args:
+            recipe_id: ID of the recipe to retrieve
+            
+        Returns:
+            dict: Recipe details or None if not found
+        """
+        # Check if recipe_id is in the recipes dictionary
+        if isinstance(self.recipes, dict) and recipe_id in self.recipes:
+            return self.recipes[recipe_id]
+        
+        # If recipes is a list, search by id field
+        if isinstance(self.recipes, list):
+            for recipe in self.recipes:
+                if recipe.get('id') == recipe_id:
+                    return recipe
+        
+        # If we have a more complex structure, iterate through values
+        if isinstance(self.recipes, dict):
+            for recipe in self.recipes.values():
+                if recipe.get('id') == recipe_id:
+                    return recipe
+        
+        return None
+
+    def get_recipe_by_name(self, recipe_name):
+        """
+        Retrieve a recipe by its name
+        
+        Args:
+            recipe_name: Name of the recipe to retrieve
+            
+        Returns:
+            dict: Recipe details or None if not found
+        """
+        recipe_name_lower = recipe_name.lower()
+        
+        # If recipes is a list, search by name field
+        if isinstance(self.recipes, list):
+            for recipe in self.recipes:
+                if recipe.get('name', '').lower() == recipe_name_lower:
+                    return recipe
+        
+        # If recipes is a dictionary, search values
+        if isinstance(self.recipes, dict):
+            for recipe in self.recipes.values():
+                if recipe.get('name', '').lower() == recipe_name_lower:
+                    return recipe
+        
+        # If no exact match, try partial matching
+        if isinstance(self.recipes, list):
+            matching_recipes = []
+            for recipe in self.recipes:
+                if recipe_name_lower in recipe.get('name', '').lower():
+                    matching_recipes.append(recipe)
+        else:
+            matching_recipes = []
+            for recipe in self.recipes.values():
+                if recipe_name_lower in recipe.get('name', '').lower():
+                    matching_recipes.append(recipe)
+        
+        # Return the first partial match if any
+        return matching_recipes[0] if matching_recipes else None
+        
+    def get_recipe_details(self, recipe_id):
+        """
+        Get detailed information about a specific recipe
+        
+        Args:
+            recipe_id: ID of the recipe to retrieve
+            
+        Returns:
+            dict: Recipe details or None if not found
+        """
+        # Find recipe by ID
+        for recipe in self.recipes:
+            if recipe.get('id') == recipe_id:
+                return recipe
+        
+        return None
+    
+    def find_recipes_by_nutrition(self, nutrition_targets, max_results=10, nutrition_ranges=None,
+                                  exclude_ingredients=None):
+        """
+        Find the recipes closest to a set of target nutrition values
+        
+        Args:
+            nutrition_targets: Dict of nutrient -> target value, e.g. {'protein': 45, 'calories': 550}
+            max_results: Maximum number of recipes to return
+            nutrition_ranges: Optional dict of nutrient -> (min, max) limits
+            exclude_ingredients: Optional ingredients or allergen groups to avoid
+            
+        Returns:
+            list: List of (recipe, distance) tuples, closest first
+        """
+        distances = self.nutrition_distances(nutrition_targets)
+        if nutrition_ranges:
+            outside = np.ones(len(self.recipes), dtype=bool)
+            outside[self._nutrition_filter(nutrition_ranges)] = False
+            distances[outside] = np.inf
+        distances[self._excluded_recipes(exclude_ingredients or [])] = np.inf
+        
+        candidates = np.flatnonzero(np.isfinite(distances))
+        top = candidates[self._top_k(-distances[candidates], max_results, (candidates,))]
+        return [(self.recipes[i], float(distances[i])) for i in top]
+    
+    def find_recipes_by_name(self, query, max_results=10):
+        """
+        Search for recipes by name
+        
+        Args:
+            query: Search term to match against recipe names
+            max_results: Maximum number of results to return
+            
+        Returns:
+            list: Matching recipes
+        """
+        query = query.lower()
+        matching_recipes = []
+        
+        for recipe in self.recipes:
+            name = recipe.get('name', '').lower()
+            if query in name:
+                matching_recipes.append(recipe)
+        
+        # Sort by exact matches first, then alphabetically
+        matching_recipes.sort(key=lambda r: (0 if query == r.get('name', '').lower() else 1, r.get('name', '')))
+        
+        return matching_recipes[:max_results]
+    
+    def suggest_additional_ingredients(self, recipe, available_ingredients):
+        """
+        Suggest additional ingredients that would enhance a recipe
+        
+        Args:
+            recipe: Recipe to enhance
+            available_ingredients: Ingredients the user already has
+            
+        Returns:
+            list: Suggested additional ingredients
+        """
+        # Parse user ingredients
+        parsed_user_ingredients = self.parse_user_ingredients(available_ingredients)
+        
+        # Find recipe index
+        recipe_id = recipe.get('id')
+        recipe_idx = self.recipe_id_to_index.get(recipe_id)
+        
+        if recipe_idx is None:
+            return []
+            
+        # Get recipe ingredient names
+        recipe_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[recipe_idx]]
+        recipe_ingredients = set(recipe_ingredient_names)
+        
+        # Recipes with over 50% overlap share an ingredient, so only those are compared
+        similar_recipes = []
+        row_ids = self.recipe_ingredient_ids[self.recipe_indptr[recipe_idx]:self.recipe_indptr[recipe_idx + 1]]
+        for i in self._get_postings(np.unique(row_ids)):
+            i = int(i)
+            if i == recipe_idx:
+                continue
+            other_recipe = self.recipes[i]
+            other_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[i]]
+            other_ingredients = set(other_ingredient_names)
+            
+            # Calculate Jaccard similarity
+            intersection = len(recipe_ingredients.intersection(other_ingredients))
+            union = len(recipe_ingredients.union(other_ingredients))
+            similarity = intersection / union if union > 0 else 0
+            
+            if similarity > 0.5:  # Consider recipes with >50% ingredient overlap
+                similar_recipes.append((other_recipe, i, similarity))
+        
+        # Sort by similarity
+        similar_recipes.sort(key=lambda x: x[2], reverse=True)
+        
+        # Identify enhancement ingredients from similar recipes
+        vocabulary_mask = self._vocabulary_mask(parsed_user_ingredients)
+        enhancement_ingredients = set()
+        for _, similar_idx, _ in similar_recipes[:5]:  # Look at top 5 similar recipes
+            similar_ingredient_names = [name for name, _ in self.parsed_recipe_ingredients[similar_idx]]
+            similar_ingredients = set(similar_ingredient_names)
+            
+            # Find ingredients that are in similar recipe but not in original recipe
+            extra_ingredients = similar_ingredients - recipe_ingredients
+            
+            # Check if user has any of these extra ingredients
+            for extra in extra_ingredients:
+                if vocabulary_mask[self.ingredient_ids[canonicalize_ingredient(extra)]]:
+                    enhancement_ingredients.add(extra)
+        
+        return list(enhancement_ingredients)
+
+    def get_recipe_with_formatted_ingredients(self, recipe_id=None, recipe_name=None, recipe_index=None):
+        """
+        Retrieve a recipe with properly parsed ingredient quantities
+        
+        Args:
+            recipe_id: Optional ID to find by ID
+            recipe_name: Optional name to find by name
+            recipe_index: Optional index from suggested recipes
+            
+        Returns:
+            dict: Recipe with formatted ingredients or None if not found
+        """
+        recipe = None
+        recipe_idx = None
+        
+        # Try to get by ID first
+        if recipe_id:
+            for i, r in enumerate(self.recipes):
+                if r.get('id') == recipe_id:
+                    recipe = r
+                    recipe_idx = i
+                    break
+        
+        # Try to get by name
+        if not recipe and recipe_name:
+            for i, r in enumerate(self.recipes):
+                if r.get('name', '').lower() == recipe_name.lower():
+                    recipe = r
+                    recipe_idx = i
+                    break
+        
+        # Try to get by index
+        if not recipe and recipe_index is not None:
+            if isinstance(self.recipes, list) and 0 <= recipe_index < len(self.recipes):
+                recipe = self.recipes[recipe_index]
+                recipe_idx = recipe_index
+        
+        if not recipe or recipe_idx is None:
+            return None
+        
+        # Create a deep copy to avoid modifying original
+        import copy
+        formatted_recipe = copy.deepcopy(recipe)
+        
+        # Get parsed ingredients if available
+        if recipe_idx < len(self.parsed_recipe_ingredients):
+            parsed_ingredients = self.parsed_recipe_ingredients[recipe_idx]
+            
+            # Format ingredients with quantities
+            ingredient_list = []
+            for i, (name, quantity) in enumerate(parsed_ingredients):
+                # Get the original ingredient string
+                original = recipe.get('ingredients', [])[i] if i < len(recipe.get('ingredients', [])) else f"{quantity} {name}"
+                
+                ingredient_list.append({
+                    'name': name,
+                    'quantity': quantity,
+                    'original': original
+                })
+            
+            formatted_recipe['formatted_ingredients'] = ingredient_list
+        else:
+            # Fallback to the original implementation if parsed ingredients not available
+            ingredient_list = []
+            for ingredient in formatted_recipe.get('ingredients', []):
+                name, quantity = self._parse_ingredient(ingredient)
+                
+                ingredient_list.append({
+                    'name': name,
+                    'quantity': quantity,
+                    'original': ingredient
+                })
+            
+            formatted_recipe['formatted_ingredients'] = ingredient_list
+        
+        return formatted_recipe
+
+# Test the recipe retriever if run directly
+if __name__ == "__main__":
+    retriever = RecipeRetriever()
+    
+    # Example search
+    test_ingredients = ["flour", "sugar", "eggs", "butter"]
+    print(f"\nSearching for recipes with ingredients: {', '.join(test_ingredients)}")
+    
+    results = retriever.find_recipes(test_ingredients, max_results=5)
+    
+    print(f"\nFound {len(results)} matching recipes:")
+    for recipe, score, matched, missing in results:
+        print(f"Recipe: {recipe.get('name')} (Score: {score:.2f})")
+        print(f"  Matched ingredients: {', '.join(matched[:3])}{'...' if len(matched) > 3 else ''}")
         print(f"  Missing ingredients: {', '.join(missing[:3])}{'...' if len(missing) > 3 else ''}")
\ No newline at end of file
@@ -0,0 +1,39 @@
+# food_rescuer/tests/conftest.py
+# Shared fixtures: small synthetic recipe databases so tests don't need data/processed
+
+import os
+import sys
+import json
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_recipe(recipe_id, name, ingredients, minutes=30, tags=None, nutrition=None, instructions=None):
+    """Build a recipe dict in the processed_recipes.json format"""
+    return {
+        'id': recipe_id,
+        'name': name,
+        'ingredients': ingredients,
+        'instructions': instructions or [f"Combine the {name.lower()} ingredients.", "Serve."],
+        'minutes': minutes,
+        'tags': tags or [],
+        'nutrition': nutrition or [300.0, 10.0, 3.0, 5.0, 10.0, 10.0, 2.0, 5.0, 12.0],
+        'n_steps': len(instructions or [0, 0]),
+        'n_ingredients': len(ingredients),
+    }
+
+
+@pytest.fixture
+def make_retriever(tmp_path):
+    """Factory that writes recipes to a temporary data dir and loads a RecipeRetriever on it"""
+    from models.recipe_retrieval import RecipeRetriever
+
+    def _make(recipes, **kwargs):
+        with open(os.path.join(tmp_path, 'processed_recipes.json'), 'w') as f:
+            json.dump(recipes, f)
+        return RecipeRetriever(data_dir=str(tmp_path), **kwargs)
+
+    return _make
@@ -0,0 +1,49 @@
+# food_rescuer/tests/test_cascade_intent_classifier.py
+
+import pytest
+
+from models.cascade_intent_classifier import CascadeIntentClassifier
+
+
+class KeywordClassifier:
+    """Stand-in for the embedding classifier that knows a few keywords"""
+
+    KEYWORDS = {'pizza': 'search_by_ingredients', 'cheers': 'greeting'}
+
+    def __init__(self):
+        self.seen = []
+
+    def classify(self, text):
+        self.seen.append(text)
+        for keyword, intent in self.KEYWORDS.items():
+            if keyword in text.lower():
+                return {'intent': intent, 'confidence': 0.9, 'entities': {}}
+        return {'intent': 'unknown', 'confidence': 0.2, 'entities': {}}
+
+    def classify_batch(self, texts):
+        return [self.classify(text) for text in texts]
+
+
+@pytest.fixture
+def cascade():
+    return CascadeIntentClassifier(dl_classifier=KeywordClassifier())
+
+
+def test_tiers(cascade):
+    assert cascade.classify("hello")['tier'] == 'regex'
+    assert cascade.classify("I want pizza")['tier'] == 'embedding'
+    fallback = cascade.classify("tell me about the moon")
+    assert fallback['tier'] == 'fallback'
+    assert fallback['intent'] == cascade.regex_classifier.classify("tell me about the moon")['intent']
+
+    assert cascade.dl_classifier.seen == ["I want pizza", "tell me about the moon"]
+    stats = cascade.get_stats()
+    assert stats['counts'] == {'regex': 1, 'embedding': 1, 'fallback': 1}
+    assert sum(stats['latency_ms']['regex'].values()) == 1
+
+
+def test_classify_batch_matches_classify(cascade):
+    texts = ["hello", "I want pizza", "cheers mate", "tell me about the moon", "next"]
+    batch = cascade.classify_batch(texts)
+    assert [(r['intent'], r['tier']) for r in batch] == \
+        [(r['intent'], r['tier']) for r in (cascade.classify(text) for text in texts)]
@@ -0,0 +1,74 @@
+# food_rescuer/tests/test_conversation_flow.py
+
+import pytest
+
+from conftest import make_recipe
+from conversation.state_manager import ConversationManager
+
+RECIPES = [
+    make_recipe(1, 'Microwave Mug Cake', ['1 flour', '1 sugar', '1 egg'],
+                instructions=['Mix everything in a mug.', 'Microwave for 90 seconds.', 'Let it cool.']),
+    make_recipe(2, 'Slow Cooker Chili', ['1 ground beef', '1 kidney beans', '1 tomatoes'],
+                instructions=['Brown the beef.', 'Cook in the slow cooker for 6 hours.', 'Serve.']),
+]
+
+
+@pytest.fixture
+def manager(make_retriever):
+    return ConversationManager(recipe_retriever=make_retriever(RECIPES))
+
+
+def start_recipe(manager):
+    manager.state.current_recipe = manager.recipe_retriever.recipes[0]
+    manager.state.current_step_index = 0
+
+
+def test_explicit_method_sets_constraint(manager):
+    manager.process("I only have a microwave")
+    assert manager.state.instruction_query == 'microwave'
+
+
+def test_bare_appliance_noun_is_not_a_constraint(manager):
+    manager.process("my microwave is broken")
+    assert manager.state.instruction_query is None
+
+
+def test_negated_method_is_not_also_positive(manager):
+    manager.process("I don't have a microwave")
+    assert manager.state.instruction_query == 'no microwave'
+
+
+@pytest.mark.parametrize('text', [
+    "can I use the microwave to reheat it?",
+    "can I do this in the slow cooker?",
+    "what should I buy?",
+    "is this good for a meal plan?",
+    "the milk expires tomorrow",
+])
+def test_mid_recipe_questions_keep_the_recipe(manager, text):
+    start_recipe(manager)
+    manager.process(text)
+    assert manager.state.current_recipe['name'] == 'Microwave Mug Cake'
+    assert manager.state.instruction_query is None
+    assert manager.state.ingredient_expiry == {}
+
+    manager.process("next")
+    assert manager.state.current_recipe['name'] == 'Microwave Mug Cake'
+    assert manager.state.current_step_index == 1
+
+
+def test_expiry_is_recorded_while_browsing(manager):
+    manager.process("the milk expires tomorrow")
+    assert manager.state.ingredient_expiry == {'milk': 1}
+
+
+def test_allergy_is_confirmed_as_an_exclusion(manager):
+    response = manager.process("I am allergic to nuts")
+    assert manager.state.excluded_ingredients == ['nuts']
+    assert 'nuts' in response
+    assert 'prefer' not in response and 'preference' not in response
+
+
+def test_dietary_preference_excludes_nothing(manager):
+    manager.process("dietary preference: low sodium")
+    assert manager.state.excluded_ingredients == []
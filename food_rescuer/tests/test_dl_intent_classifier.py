@@ -0,0 +1,67 @@
+# food_rescuer/tests/test_dl_intent_classifier.py
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sentence_transformers')
+
+from models.dl_intent_classifier import DeepLearningIntentClassifier
+from utils.utterance_cache import UtteranceCache
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(DeepLearningIntentClassifier, '_get_data_dir', lambda self: str(tmp_path))
+    return tmp_path
+
+
+def test_repeated_utterances_hit_the_cache(data_dir):
+    cache = UtteranceCache()
+    classifier = DeepLearningIntentClassifier(cache=cache)
+    first = classifier.classify("What's the next step?")
+    second = classifier.classify("  what's the NEXT step? ")
+
+    assert second == first
+    assert cache.stats()['tiers']['result']['hits'] == 1
+
+
+def test_saved_model_is_reloaded_memory_mapped(data_dir):
+    classifier = DeepLearningIntentClassifier()
+    reloaded = DeepLearningIntentClassifier()
+
+    assert (data_dir / 'intent_model_manifest.all-MiniLM-L6-v2.json').exists()
+    assert isinstance(reloaded.example_embeddings, np.memmap)
+    assert reloaded.example_texts == classifier.example_texts
+    for text in ["Hello", "What's the next step?", "I have eggs and flour"]:
+        assert reloaded.classify(text)['intent'] == classifier.classify(text)['intent']
+
+
+def test_retrain_encodes_only_new_examples(data_dir, monkeypatch):
+    classifier = DeepLearningIntentClassifier()
+    encoded = []
+    encode = classifier.model.encode
+
+    def recording_encode(texts, *args, **kwargs):
+        encoded.append(list(texts))
+        return encode(texts, *args, **kwargs)
+
+    monkeypatch.setattr(classifier.model, 'encode', recording_encode)
+
+    classifier.retrain(new_examples={'greeting': ["Howdy partner"]},
+                       removed_examples={'show_more_recipes': None})
+    assert encoded == [["Howdy partner"]]
+
+    reloaded = DeepLearningIntentClassifier()
+    assert "Howdy partner" in reloaded.intent_examples['greeting']
+    assert 'show_more_recipes' not in reloaded.intents
+    assert reloaded.example_texts == classifier.example_texts
+
+
+def test_classify_batch_matches_classify(data_dir):
+    classifier = DeepLearningIntentClassifier()
+    texts = ["Hello", "What's the next step?", "I have eggs and flour", "", "hello", "Search recipes"]
+    batch = classifier.classify_batch(texts)
+    for text, result in zip(texts, batch):
+        expected = classifier.classify(text)
+        assert result['intent'] == expected['intent']
+        assert result['confidence'] == pytest.approx(expected['confidence'], abs=1e-5)
@@ -0,0 +1,34 @@
+# food_rescuer/tests/test_ingredient_normalizer.py
+
+import pytest
+
+from conftest import make_recipe
+from utils.ingredient_normalizer import canonicalize_ingredient, singularize
+
+
+@pytest.mark.parametrize('word, singular', [
+    ('eggs', 'egg'), ('berries', 'berry'), ('tomatoes', 'tomato'), ('peaches', 'peach'),
+    ('glass', 'glass'), ('asparagus', 'asparagus'),
+])
+def test_singularize(word, singular):
+    assert singularize(word) == singular
+
+
+@pytest.mark.parametrize('name, canonical', [
+    ('Garlic, minced', 'garlic'),
+    ('2 cups chopped tomatoes', 'tomato'),
+    ('fresh basil (packed)', 'basil'),
+    ('extra-virgin olive oil', 'olive oil'),
+    ('pecans', 'pecan'),
+    ('cream of tartar', 'cream of tartar'),
+    ('chopped', 'chopped'),
+])
+def test_canonicalize_ingredient(name, canonical):
+    assert canonicalize_ingredient(name) == canonical
+
+
+def test_queries_and_index_share_canonical_names(make_retriever):
+    retriever = make_retriever([make_recipe(1, 'Tomato Salad', ['2 cups tomatoes, diced', '1 tbsp basil'])])
+    results = retriever.find_recipes(['Fresh Tomato', 'basil leaves, torn'])
+    assert [recipe['name'] for recipe, _, _, _ in results] == ['Tomato Salad']
+    assert results[0][3] == []
@@ -0,0 +1,42 @@
+# food_rescuer/tests/test_intent_benchmark.py
+
+from intent_benchmark import split_examples, evaluate_classifier
+from models.cascade_intent_classifier import CascadeIntentClassifier
+from models.intent_classifier import IntentClassifier
+
+
+class UnknownClassifier:
+    """Stand-in for the embedding classifier that never recognizes anything"""
+
+    def classify(self, text):
+        return {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+
+    def classify_batch(self, texts):
+        return [self.classify(text) for text in texts]
+
+
+def test_split_examples_is_deterministic():
+    examples = {'greeting': [f"hello {i}" for i in range(10)], 'affirm': ["yes", "sure"]}
+    train, held_out = split_examples(examples, holdout_every=5)
+
+    assert held_out == [("hello 4", 'greeting'), ("hello 9", 'greeting')]
+    assert len(train['greeting']) == 8
+    assert train['affirm'] == ["yes", "sure"]
+    assert split_examples(examples, holdout_every=5) == (train, held_out)
+
+
+def test_evaluate_classifier_reports_the_sequential_pass():
+    corpus = [("hello", 'greeting'), ("next step", 'next_step'), ("yes", 'affirm'), ("zzz", 'greeting')]
+    report = evaluate_classifier(CascadeIntentClassifier(dl_classifier=UnknownClassifier()), corpus)
+
+    assert report['utterances'] == 4
+    assert report['accuracy'] == 0.75
+    assert report['per_intent']['greeting']['recall'] == 0.5
+    assert sum(report['classifier_stats']['counts'].values()) == len(corpus)
+    assert 'batch_throughput_per_s' in report
+
+
+def test_evaluate_plain_classifier_has_no_stats():
+    report = evaluate_classifier(IntentClassifier(), [("hello", 'greeting')])
+    assert report['accuracy'] == 1.0
+    assert 'classifier_stats' not in report
@@ -0,0 +1,74 @@
+# food_rescuer/tests/test_intent_classifier.py
+
+import re
+import random
+
+import pytest
+
+from models.intent_classifier import IntentClassifier
+
+PHRASES = [
+    "What can I make with eggs, flour, and milk?", "I have cheese, tomatoes, and basil",
+    "Show me that recipe", "I don't have butter, what can I use instead?", "What's the next step?",
+    "How much flour do I need?", "I'm allergic to nuts", "Help me", "I've finished cooking",
+    "That was delicious!", "yes", "no", "next", "y", "n", "a", "", "hi there", "no milk please",
+    "i am vegan", "go back", "that is not right", "i got chicken and rice", "quantity of salt",
+    "I'd rather not", "nothing here at all", "replace butter with what",
+]
+WORDS = ("i have no yes what can make with recipe next back the and chicken butter help done "
+         "good don't want that is it how much step search of for please").split()
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.fixture(scope='module')
+def phrases(classifier):
+    rng = random.Random(0)
+    generated = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 7))) for _ in range(500)]
+    examples = [text for intent in classifier.intent_patterns for text in classifier.get_example_phrases(intent)]
+    return PHRASES + examples + generated
+
+
+def per_pattern_classify(classifier, text):
+    """The original classify: try every pattern in turn, anchored first, then unanchored"""
+    clean_text = classifier._clean_text(text)
+    if not clean_text or len(clean_text) < 2:
+        return {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+
+    for intent, patterns in classifier.compiled_patterns.items():
+        for pattern in patterns:
+            match = pattern.match(clean_text)
+            if match:
+                return {'intent': intent, 'confidence': 1.0,
+                        'entities': classifier._extract_entities(intent, match.groups(), clean_text)}
+
+    for intent, patterns in classifier.intent_patterns.items():
+        for pattern_str in patterns:
+            match = re.compile(pattern_str.lstrip('^').rstrip('$'), re.IGNORECASE).search(clean_text)
+            if match:
+                return {'intent': intent, 'confidence': 0.8,
+                        'entities': classifier._extract_entities(intent, match.groups(), clean_text)}
+
+    if classifier._contains_ingredients(clean_text):
+        return {'intent': 'discuss_ingredient', 'confidence': 0.7,
+                'entities': classifier._extract_ingredients(clean_text)}
+    return {'intent': 'unknown', 'confidence': 0.0, 'entities': {}}
+
+
+def test_combined_regex_matches_the_per_pattern_loop(classifier, phrases):
+    for text in phrases:
+        assert classifier.classify(text) == per_pattern_classify(classifier, text), text
+
+
+def test_classify_batch_matches_classify(classifier, phrases):
+    batch = classifier.classify_batch(phrases + phrases[:20])
+    assert batch == [classifier.classify(text) for text in phrases + phrases[:20]]
+
+
+def test_classify_batch_results_are_independent(classifier):
+    first, second = classifier.classify_batch(["I have eggs and milk", "i have EGGS and milk"])
+    first['entities']['ingredients'].append('flour')
+    assert 'flour' not in second['entities']['ingredients']
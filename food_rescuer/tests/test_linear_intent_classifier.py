@@ -0,0 +1,51 @@
+# food_rescuer/tests/test_linear_intent_classifier.py
+
+import pytest
+
+from models.linear_intent_classifier import LinearIntentClassifier
+
+EXAMPLES = {
+    'greeting': ["hello", "hi there", "good morning", "hey"],
+    'next_step': ["next step", "what's next", "go on", "continue to the next step"],
+    'affirm': ["yes", "yes please", "sure", "sounds good"],
+    'search_by_ingredients': ["what can I make with eggs", "find recipes with chicken",
+                              "recipes using rice and beans", "what can I cook with tomatoes"],
+}
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    classifier = LinearIntentClassifier(num_features=2 ** 12, model_path=str(tmp_path / 'linear.npz'))
+    texts = [text for examples in EXAMPLES.values() for text in examples]
+    labels = [intent for intent, examples in EXAMPLES.items() for _ in examples]
+    assert classifier.train(texts, labels, epochs=100)
+    return classifier
+
+
+def test_learns_the_training_examples(classifier):
+    assert classifier.classify("hello there")['intent'] == 'greeting'
+    assert classifier.classify("next step please")['intent'] == 'next_step'
+
+
+def test_classify_batch_matches_classify(classifier):
+    texts = ["hello", "", "what can I make with eggs and rice", "sure", "???", "next"]
+    batch = classifier.classify_batch(texts)
+    for text, result in zip(texts, batch):
+        expected = classifier.classify(text)
+        assert result['intent'] == expected['intent']
+        assert result['confidence'] == pytest.approx(expected['confidence'], abs=1e-5)
+        assert result['entities'] == expected['entities']
+
+
+def test_save_and_load_round_trip(classifier):
+    classifier.save()
+    loaded = LinearIntentClassifier(model_path=classifier.model_path)
+    assert loaded.intents == classifier.intents
+    assert loaded.classify("good morning") == classifier.classify("good morning")
+
+
+def test_training_on_featureless_texts_keeps_the_model(tmp_path):
+    classifier = LinearIntentClassifier(model_path=str(tmp_path / 'linear.npz'))
+    assert not classifier.train(['', '   '], ['greeting', 'affirm'])
+    assert classifier.weights is None
+    assert classifier.classify("hello")['intent'] == 'unknown'
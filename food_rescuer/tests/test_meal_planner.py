@@ -0,0 +1,55 @@
+# food_rescuer/tests/test_meal_planner.py
+
+import pytest
+
+from conftest import make_recipe
+from models.meal_planner import MealPlanner
+
+RECIPES = [
+    make_recipe(1, 'Chicken Rice Bowl', ['1 chicken', '1 rice', '1 spinach'], minutes=40),
+    make_recipe(2, 'Spinach Omelette', ['2 eggs', '1 spinach'], minutes=10),
+    make_recipe(3, 'Tomato Soup', ['3 tomatoes', '1 onion'], minutes=30, nutrition=[900.0] + [0.0] * 8),
+    make_recipe(4, 'Fried Rice', ['1 rice', '2 eggs', '1 onion'], minutes=20),
+    make_recipe(5, 'Chicken Soup', ['1 chicken', '1 onion'], minutes=90),
+]
+
+
+@pytest.fixture
+def planner(make_retriever):
+    return MealPlanner(make_retriever(RECIPES))
+
+
+def meal_names(plan):
+    return [recipe['name'] for recipe, _ in plan['meals']]
+
+
+def test_greedy_plan_covers_the_pantry(planner):
+    plan = planner.plan_meals(['chicken', 'rice', 'spinach', 'eggs', 'onion', 'tomatoes'], num_meals=3)
+    assert meal_names(plan)[0] == 'Chicken Rice Bowl'
+    assert sorted(plan['covered']) == ['chicken', 'eggs', 'onion', 'rice', 'spinach', 'tomatoes']
+    assert plan['uncovered'] == []
+
+
+def test_plan_skips_recipes_adding_nothing(planner):
+    plan = planner.plan_meals(['eggs', 'spinach'], num_meals=5)
+    assert meal_names(plan) == ['Spinach Omelette']
+
+
+def test_plan_limits(planner):
+    pantry = ['chicken', 'rice', 'spinach', 'eggs', 'onion', 'tomatoes']
+    names = meal_names(planner.plan_meals(pantry, max_minutes=30, max_calories=500))
+    assert 'Chicken Rice Bowl' not in names
+    assert 'Tomato Soup' not in names
+    assert 'Chicken Soup' not in names
+
+
+def test_plan_exclusions(planner):
+    names = meal_names(planner.plan_meals(['chicken', 'rice', 'spinach', 'eggs', 'onion'], exclude_ingredients=['eggs']))
+    assert 'Spinach Omelette' not in names
+    assert 'Fried Rice' not in names
+
+
+def test_ingredient_weights_steer_the_first_pick(planner):
+    plan = planner.plan_meals(['chicken', 'onion', 'eggs', 'spinach'], num_meals=1,
+                              ingredient_weights={'eggs': 5.0})
+    assert meal_names(plan) == ['Spinach Omelette']
@@ -0,0 +1,48 @@
+# food_rescuer/tests/test_purchase_suggestions.py
+
+import pytest
+
+from conftest import make_recipe
+
+RECIPES = [
+    make_recipe(1, 'Pasta With Butter', ['1 pasta', '1 butter']),
+    make_recipe(2, 'Buttered Rice', ['1 rice', '1 butter']),
+    make_recipe(3, 'Tomato Pasta', ['1 pasta', '1 tomatoes']),
+    make_recipe(4, 'Plain Pasta', ['1 pasta', '1 salt']),
+    make_recipe(5, 'Pesto Pasta', ['1 pasta', '1 walnuts', '1 basil']),
+]
+
+
+@pytest.fixture
+def retriever(make_retriever):
+    return make_retriever(RECIPES)
+
+
+def best_buys(suggestions, size=1):
+    return [option['buy'] for option in suggestions['options'][size]]
+
+
+def test_single_purchase_ranked_by_unlocked_recipes(retriever):
+    suggestions = retriever.suggest_purchases(['pasta', 'rice', 'salt'])
+    assert suggestions['makeable_now'] == 1
+    assert suggestions['options'][1][0] == {'buy': ['butter'], 'unlocked': 2}
+    assert suggestions['options'][2][0]['unlocked'] == 3
+    assert {'basil', 'walnut'} in [set(buy) for buy in best_buys(suggestions, 2)]
+
+
+def test_exclusions_drop_recipes_from_purchases(retriever):
+    suggestions = retriever.suggest_purchases(['pasta', 'rice', 'salt'], exclude_ingredients=['dairy', 'tree nuts'])
+    assert ['butter'] not in best_buys(suggestions)
+    assert suggestions['options'][1][0] == {'buy': ['tomato'], 'unlocked': 1}
+    assert all('basil' not in buy for buy in best_buys(suggestions, 2))
+
+
+def test_exclusions_drop_makeable_now(retriever):
+    assert retriever.suggest_purchases(['pasta', 'butter'])['makeable_now'] == 1
+    assert retriever.suggest_purchases(['pasta', 'butter'], exclude_ingredients=['butter'])['makeable_now'] == 0
+
+
+def test_cached_results_are_copies(retriever):
+    first = retriever.suggest_purchases(['pasta'])
+    first['options'][1].clear()
+    assert retriever.suggest_purchases(['pasta'])['options'][1]
@@ -0,0 +1,61 @@
+# food_rescuer/tests/test_recipe_exclusions.py
+
+import pytest
+
+from conftest import make_recipe
+from models.recipe_retrieval import DIET_EXCLUSIONS
+
+RECIPES = [
+    make_recipe(1, 'Coconut Rice', ['2 rice', '1 coconut milk', '1 salt']),
+    make_recipe(2, 'Peanut Butter Toast', ['2 bread', '1 peanut butter']),
+    make_recipe(3, 'Buttered Toast', ['2 bread', '1 butter']),
+    make_recipe(4, 'Rice Pudding', ['1 rice', '2 milk', '1 sugar']),
+    make_recipe(5, 'Dairy-Free Pancakes', ['1 flour', '1 non-dairy milk substitute', '1 egg substitute']),
+    make_recipe(6, 'Cheese Omelette', ['3 eggs', '1 cheddar cheese']),
+    make_recipe(7, 'Pecan Pie', ['1 chopped pecans', '1 sugar', '1 pie crust']),
+]
+
+
+@pytest.fixture
+def retriever(make_retriever):
+    return make_retriever(RECIPES)
+
+
+def excluded_names(retriever, exclude_ingredients):
+    return {retriever.recipes[i]['name'] for i in retriever.excluded_recipe_indices(exclude_ingredients)}
+
+
+def test_dairy_keeps_coconut_and_non_dairy_milk(retriever):
+    excluded = excluded_names(retriever, ['dairy'])
+    assert 'Rice Pudding' in excluded
+    assert 'Buttered Toast' in excluded
+    assert 'Cheese Omelette' in excluded
+    assert 'Coconut Rice' not in excluded
+    assert 'Dairy-Free Pancakes' not in excluded
+
+
+def test_milk_keeps_coconut_milk(retriever):
+    excluded = excluded_names(retriever, ['milk'])
+    assert 'Rice Pudding' in excluded
+    assert 'Coconut Rice' not in excluded
+    assert 'Dairy-Free Pancakes' not in excluded
+
+
+def test_butter_keeps_peanut_butter(retriever):
+    excluded = excluded_names(retriever, ['butter'])
+    assert 'Buttered Toast' in excluded
+    assert 'Peanut Butter Toast' not in excluded
+
+
+def test_vegan_diet_keeps_plant_substitutes(retriever):
+    excluded = excluded_names(retriever, DIET_EXCLUSIONS['vegan'])
+    assert {'Rice Pudding', 'Buttered Toast', 'Cheese Omelette'} <= excluded
+    assert 'Coconut Rice' not in excluded
+    assert 'Dairy-Free Pancakes' not in excluded
+    assert 'Peanut Butter Toast' not in excluded
+
+
+def test_plural_and_allergen_group_matches(retriever):
+    assert 'Pecan Pie' in excluded_names(retriever, ['pecan'])
+    assert 'Pecan Pie' in excluded_names(retriever, ['tree nuts'])
+    assert 'Cheese Omelette' in excluded_names(retriever, ['egg'])
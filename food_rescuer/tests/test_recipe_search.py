@@ -0,0 +1,205 @@
+# food_rescuer/tests/test_recipe_search.py
+
+import pytest
+
+from conftest import make_recipe
+
+RECIPES = [
+    make_recipe(1, 'Spinach Salad', ['1 spinach', '1 olive oil', '1 lemon']),
+    make_recipe(2, 'Chicken Spinach Pasta', ['1 chicken', '1 spinach', '1 pasta', '1 garlic']),
+    make_recipe(3, 'Garlic Pasta', ['1 pasta', '1 garlic', '1 olive oil']),
+    make_recipe(4, 'Lemon Chicken', ['1 chicken', '1 lemon', '1 garlic']),
+]
+
+
+@pytest.fixture
+def retriever(make_retriever):
+    return make_retriever(RECIPES)
+
+
+def names(results):
+    return [recipe['name'] for recipe, _, _, _ in results]
+
+
+def test_use_it_up_favours_urgent_ingredients(retriever):
+    pantry = ['spinach', 'chicken', 'pasta', 'garlic', 'olive oil', 'lemon']
+    results = retriever.find_recipes(pantry, max_results=2, search_mode='use_it_up',
+                                     ingredient_weights={'spinach': 3.0, 'chicken': 2.0})
+    assert names(results)[0] == 'Chicken Spinach Pasta'
+    spinach_first = names(retriever.find_recipes(pantry, search_mode='use_it_up', ingredient_weights={'spinach': 1.0}))
+    assert set(spinach_first[:2]) == {'Spinach Salad', 'Chicken Spinach Pasta'}
+
+
+def test_mmr_diversity_spreads_the_top_results(make_retriever):
+    retriever = make_retriever([
+        make_recipe(1, 'Garlic Chicken Rice', ['1 chicken', '1 rice', '1 garlic']),
+        make_recipe(2, 'Garlic Chicken Rice Bowl', ['1 chicken', '1 rice', '1 garlic']),
+        make_recipe(3, 'Easy Garlic Chicken Rice', ['1 chicken', '1 rice', '1 garlic']),
+        make_recipe(4, 'Lemon Pasta', ['1 pasta', '1 lemon', '1 basil']),
+    ])
+    pantry = ['chicken', 'rice', 'garlic', 'pasta', 'lemon']
+
+    plain = names(retriever.find_recipes(pantry, max_results=2))
+    assert 'Lemon Pasta' not in plain
+    diverse = names(retriever.find_recipes(pantry, max_results=2, diversity=0.7))
+    assert diverse[0] in plain
+    assert diverse[1] == 'Lemon Pasta'
+
+
+FRIED_RICE = [
+    make_recipe(1, 'Chicken Fried Rice', ['1 chicken', '1 rice', '1 eggs', '1 onion', '1 soy sauce']),
+    make_recipe(2, 'Chicken Fried Rice', ['1 chicken', '1 rice', '1 eggs', '1 onion', '1 soy sauce']),
+    make_recipe(3, 'Egg Fried Rice', ['1 rice', '1 eggs', '1 peas']),
+]
+
+
+def test_collapse_duplicates_keeps_one_recipe_per_cluster(make_retriever):
+    retriever = make_retriever(FRIED_RICE)
+    pantry = ['chicken', 'rice', 'eggs', 'onion', 'soy sauce', 'peas']
+
+    assert names(retriever.find_recipes(pantry)).count('Chicken Fried Rice') == 2
+    collapsed = names(retriever.find_recipes(pantry, collapse_duplicates=True))
+    assert collapsed.count('Chicken Fried Rice') == 1
+    assert 'Egg Fried Rice' in collapsed
+
+
+def test_saved_duplicate_clusters_are_reloaded(make_retriever, tmp_path):
+    retriever = make_retriever(FRIED_RICE)
+    retriever.save_duplicate_clusters()
+    assert (tmp_path / 'recipe_clusters.npz').exists()
+
+    reloaded = make_retriever(FRIED_RICE)
+    assert reloaded.recipe_cluster_ids.tolist() == retriever.recipe_cluster_ids.tolist() == [0, 0, 2]
+
+
+TAGGED = [
+    make_recipe(1, 'Veggie Stir Fry', ['1 rice', '1 broccoli', '1 soy sauce'], tags=['vegetarian', 'asian', 'quick']),
+    make_recipe(2, 'Beef Stir Fry', ['1 rice', '1 beef', '1 soy sauce'], tags=['asian', 'quick']),
+    make_recipe(3, 'Broccoli Bake', ['1 broccoli', '1 cheese'], tags=['vegetarian', 'oven']),
+    make_recipe(4, 'Beef Stew', ['1 beef', '1 potatoes'], tags=['slow-cooker']),
+]
+
+
+def test_tag_filters(make_retriever):
+    retriever = make_retriever(TAGGED)
+    pantry = ['rice', 'broccoli', 'soy sauce', 'beef', 'cheese', 'potatoes']
+
+    assert set(names(retriever.find_recipes(pantry, tags_all=['vegetarian', 'quick']))) == {'Veggie Stir Fry'}
+    assert set(names(retriever.find_recipes(pantry, tags_any=['oven', 'slow-cooker']))) == {'Broccoli Bake', 'Beef Stew'}
+    assert names(retriever.find_recipes(pantry, tags_all=['no-such-tag'])) == []
+
+
+def test_facets_count_every_match_not_just_the_page(make_retriever):
+    retriever = make_retriever(TAGGED)
+    results = retriever.find_recipes(['rice', 'broccoli'], max_results=1, facets=True)
+
+    assert len(results) == 1
+    assert results.facets == {'asian': 2, 'quick': 2, 'vegetarian': 2, 'oven': 1}
+    assert list(results.facets)[-1] == 'oven'
+
+
+def nutrition(calories, protein):
+    # calories, fat, saturated_fat, cholesterol, sodium, carbohydrates, fiber, sugar, protein
+    return [calories, 10.0, 2.0, 20.0, 300.0, 40.0, 5.0, 5.0, protein]
+
+
+NUTRITION = [
+    make_recipe(1, 'Chicken Salad', ['1 chicken', '1 lettuce'], nutrition=nutrition(350, 40)),
+    make_recipe(2, 'Chicken Pasta', ['1 chicken', '1 pasta'], nutrition=nutrition(800, 45)),
+    make_recipe(3, 'Lettuce Wraps', ['1 lettuce', '1 rice'], nutrition=nutrition(250, 8)),
+    dict(make_recipe(4, 'Mystery Dish', ['1 chicken', '1 rice']), nutrition=[]),
+]
+
+
+def test_nutrition_ranges_filter_searches(make_retriever):
+    retriever = make_retriever(NUTRITION)
+    pantry = ['chicken', 'lettuce', 'pasta', 'rice']
+
+    light = names(retriever.find_recipes(pantry, nutrition_ranges={'calories': (None, 500)}))
+    assert set(light) == {'Chicken Salad', 'Lettuce Wraps'}
+    high_protein = names(retriever.find_recipes(pantry, nutrition_ranges={'protein': (30, None), 'calories': (None, 500)}))
+    assert high_protein == ['Chicken Salad']
+
+
+def test_find_recipes_by_nutrition_ranks_by_closeness(make_retriever):
+    retriever = make_retriever(NUTRITION)
+
+    closest = retriever.find_recipes_by_nutrition({'calories': 780, 'protein': 44})
+    assert [recipe['name'] for recipe, _ in closest][0] == 'Chicken Pasta'
+    assert 'Mystery Dish' not in [recipe['name'] for recipe, _ in closest]
+    limited = retriever.find_recipes_by_nutrition({'protein': 44}, nutrition_ranges={'calories': (None, 500)})
+    assert [recipe['name'] for recipe, _ in limited][0] == 'Chicken Salad'
+
+
+def test_generic_ingredient_matches_specific_ones(make_retriever):
+    retriever = make_retriever([
+        make_recipe(1, 'Cheddar Toast', ['2 slices bread', '1 cup cheddar cheese']),
+        make_recipe(2, 'Plain Toast', ['2 slices bread', '1 tbsp butter']),
+    ])
+    with_cheese = [retriever.recipes[i]['name'] for i in retriever.recipes_with_ingredient('cheese')]
+    assert with_cheese == ['Cheddar Toast']
+    assert names(retriever.find_recipes(['bread', 'cheese'], max_results=1)) == ['Cheddar Toast']
+
+
+def test_multi_pantry_search_reports_contributions(retriever):
+    results = retriever.find_recipes_multi({'alex': ['chicken', 'garlic'], 'sam': ['lemon']}, max_results=1)
+    recipe, _, matched, missing, contributions = results[0]
+    assert recipe['name'] == 'Lemon Chicken'
+    assert missing == []
+    assert sorted(contributions['alex']) == ['chicken', 'garlic']
+    assert contributions['sam'] == ['lemon']
+
+
+def test_similar_recipes_with_and_without_the_graph(make_retriever, tmp_path):
+    retriever = make_retriever([
+        make_recipe(1, 'Chicken Rice', ['1 chicken', '1 rice', '1 garlic', '1 onion', '1 ginger']),
+        make_recipe(2, 'Lemon Pasta', ['1 pasta', '1 lemon', '1 basil']),
+        make_recipe(3, 'Chicken Rice With Peas', ['1 chicken', '1 rice', '1 garlic', '1 onion', '1 peas']),
+        make_recipe(4, 'Pasta Salad', ['1 pasta', '1 tomatoes', '1 cucumber']),
+    ])
+    on_the_fly = retriever.similar_recipes(1, k=2)
+    assert on_the_fly[0][0]['name'] == 'Chicken Rice With Peas'
+    assert all(recipe['id'] != 1 for recipe, _ in on_the_fly)
+
+    retriever.build_similarity_graph(k=2)
+    assert any(path.name.startswith('recipe_knn') for path in tmp_path.iterdir())
+    assert retriever.similar_recipes(1, k=1)[0][0]['name'] == 'Chicken Rice With Peas'
+
+
+INSTRUCTIONS = [
+    make_recipe(1, 'Slow Cooker Chili', ['1 beef', '1 beans'],
+                instructions=['Brown the beef.', 'Cook in the slow cooker on low for 8 hours.']),
+    make_recipe(2, 'Baked Beans', ['1 beans', '1 bacon'],
+                instructions=['Preheat the oven.', 'Bake the beans for an hour.']),
+    make_recipe(3, 'Bean Salad', ['1 beans', '1 onion'],
+                instructions=['Toss the beans with the onion.', 'Let the salad rest, then serve cooked slow.']),
+]
+
+
+def test_instruction_queries(make_retriever):
+    retriever = make_retriever(INSTRUCTIONS)
+
+    def matching(query):
+        return {retriever.recipes[i]['name'] for i in retriever.search_instructions(query)}
+
+    assert matching('"slow cooker"') == {'Slow Cooker Chili'}
+    assert matching('slow') == {'Slow Cooker Chili', 'Bean Salad'}
+    assert matching('no oven') == {'Slow Cooker Chili', 'Bean Salad'}
+    assert matching('beans -bake') == {'Bean Salad'}
+    assert names(retriever.find_recipes(['beans'], instruction_query='no oven')) != []
+    assert 'Baked Beans' not in names(retriever.find_recipes(['beans'], instruction_query='no oven'))
+
+
+def test_deadline_search(retriever):
+    pantry = ['spinach', 'chicken', 'pasta', 'garlic', 'olive oil', 'lemon']
+    unbounded = retriever.find_recipes(pantry)
+
+    relaxed = retriever.find_recipes(pantry, deadline_ms=60000)
+    assert relaxed.exhaustive
+    assert names(relaxed) == names(unbounded)
+
+    retriever.DEADLINE_BATCH_SIZE = 1
+    expired = retriever.find_recipes(pantry, deadline_ms=0)
+    assert not expired.exhaustive
+    assert 0 < len(expired) < len(unbounded)
+    assert retriever.search_metrics['deadline_cutoffs'] == 1
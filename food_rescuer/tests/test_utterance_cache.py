@@ -0,0 +1,38 @@
+# food_rescuer/tests/test_utterance_cache.py
+
+import numpy as np
+
+from utils.utterance_cache import UtteranceCache, normalize_utterance
+
+
+def test_normalize_utterance():
+    assert normalize_utterance("  Yes   PLEASE ") == 'yes please'
+
+
+def test_lru_eviction_and_tier_stats():
+    cache = UtteranceCache(capacity=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a', tier='result') == 1
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('b', tier='embedding') is None
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['tiers']['result'] == {'hits': 1, 'misses': 0, 'hit_rate': 1.0}
+    assert stats['tiers']['embedding']['misses'] == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = UtteranceCache(capacity=4, path=path)
+    cache.put(('embedding', 'hello'), np.arange(3, dtype=np.float32))
+    cache.put('result', {'intent': 'greeting'})
+    cache.save()
+
+    loaded = UtteranceCache(capacity=4, path=path)
+    embedding = loaded.get(('embedding', 'hello'))
+    assert embedding.dtype == np.float32
+    assert embedding.tolist() == [0.0, 1.0, 2.0]
+    assert loaded.get('result') == {'intent': 'greeting'}
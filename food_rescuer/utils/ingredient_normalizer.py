@@ -0,0 +1,70 @@
+# food_rescuer/utils/ingredient_normalizer.py
+# Canonical forms for ingredient names, shared by the recipe index and user queries
+
+import re
+from functools import lru_cache
+
+# Preparation and size words that don't change what the ingredient is
+DESCRIPTOR_WORDS = {
+    'chopped', 'minced', 'diced', 'sliced', 'grated', 'shredded', 'crushed', 'cubed',
+    'peeled', 'seeded', 'cored', 'trimmed', 'halved', 'quartered', 'julienned', 'mashed',
+    'beaten', 'softened', 'melted', 'sifted', 'packed', 'drained', 'rinsed', 'thawed',
+    'fresh', 'freshly', 'finely', 'coarsely', 'roughly', 'thinly', 'lightly', 'firmly',
+    'large', 'medium', 'small', 'extra', 'jumbo', 'whole', 'ground', 'boneless', 'skinless',
+    'optional', 'divided', 'cold', 'warm', 'room', 'temperature', 'virgin', 'piece', 'chunk',
+    'halve', 'none'
+}
+
+# Measuring units that sometimes survive quantity parsing ("cup flour")
+UNIT_WORDS = {
+    'cup', 'tablespoon', 'teaspoon', 'tbsp', 'tsp', 'oz', 'ounce', 'lb', 'pound', 'g', 'gram',
+    'kg', 'ml', 'l', 'liter', 'litre', 'pint', 'quart', 'gallon', 'pinch', 'dash', 'can',
+    'package', 'pkg', 'jar', 'bottle', 'stick', 'slice', 'bunch', 'handful', 'of'
+}
+
+def singularize(word: str) -> str:
+    """
+    Reduce a word to a rough singular form so "eggs" and "egg" share a key
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        str: Singular form of the word
+    """
+    if len(word) > 3 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('oes'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith(('xes', 'ches', 'shes')):
+        return word[:-2]
+    if len(word) > 2 and word.endswith('s') and not word.endswith(('ss', 'us')):
+        return word[:-1]
+    return word
+
+@lru_cache(maxsize=4096)
+def canonicalize_ingredient(name: str) -> str:
+    """
+    Reduce an ingredient name to the key used for exact lookups
+
+    Lowercases, drops anything after a comma or in parentheses, strips leading
+    quantities and units, removes preparation/size descriptors and folds every
+    word to its singular, so "Garlic, minced", "2 cups chopped tomatoes" and
+    "tomato" become "garlic", "tomato" and "tomato".
+
+    Args:
+        name: Ingredient name (with or without a quantity)
+
+    Returns:
+        str: Canonical ingredient name (the lowercased input if nothing is left)
+    """
+    text = name.lower().strip()
+    text = re.sub(r'\([^)]*\)', ' ', text).split(',')[0]
+    words = [singularize(word) for word in re.findall(r"[a-z]+(?:'[a-z]+)?", text.replace('-', ' '))]
+
+    # Units only count at the start, so "can" in "pecan" or "of" in "cream of tartar" stay
+    while words and words[0] in UNIT_WORDS:
+        words.pop(0)
+    words = [word for word in words if word not in DESCRIPTOR_WORDS]
+
+    return ' '.join(words) or name.lower().strip()
@@ -0,0 +1,184 @@
+# food_rescuer/utils/utterance_cache.py
+# Bounded LRU cache for per-utterance work such as embeddings and intent results
+
+import os
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+def normalize_utterance(text: str) -> str:
+    """
+    Normalize an utterance into a cache key
+
+    Lowercases and collapses whitespace, so "Yes", " yes " and "YES" share an
+    entry. The sentence embedding model is uncased, so this doesn't change
+    the embedding.
+
+    Args:
+        text: User input text
+
+    Returns:
+        str: Normalized text
+    """
+    return ' '.join(text.lower().split())
+
+def _encode_value(value: Any) -> Any:
+    """JSON fallback for the numpy values stored in the cache (embeddings, scores)"""
+    if isinstance(value, np.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot save {type(value).__name__} in the utterance cache")
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    """JSON object hook restoring the numpy arrays written by _encode_value"""
+    if '__ndarray__' in value:
+        return np.array(value['__ndarray__'], dtype=value['dtype'])
+    return value
+
+class UtteranceCache:
+    """
+    Thread-safe least-recently-used cache with hit-rate statistics
+
+    One instance can be shared by several classifiers or conversation sessions.
+    Lookups name a tier (e.g. 'result' or 'embedding'), and hits and misses are
+    counted per tier, so one utterance missing in two tiers is not reported as
+    two misses of the same kind. When a path is given the entries are loaded
+    from it on creation and written back by save() as JSON; values must be
+    JSON types or numpy arrays.
+    """
+
+    def __init__(self, capacity: int = 1024, path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            capacity: Maximum number of entries kept
+            path: Optional JSON file used to persist the entries between restarts
+        """
+        self.capacity = capacity
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._tier_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        self.evictions = 0
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def get(self, key: Hashable, default: Any = None, tier: str = 'default') -> Any:
+        """
+        Look up an entry and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+            tier: Name the hit or miss is counted under
+
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._tier_stats[tier]['hits'] += 1
+                return self._entries[key]
+            self._tier_stats[tier]['misses'] += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones beyond capacity
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry (the statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache statistics
+
+        Returns:
+            dict: evictions, size, capacity and 'tiers', a dict of tier ->
+                  hits, misses and hit_rate
+        """
+        with self._lock:
+            tiers = {}
+            for tier, counts in self._tier_stats.items():
+                lookups = counts['hits'] + counts['misses']
+                tiers[tier] = dict(counts, hit_rate=counts['hits'] / lookups if lookups else 0.0)
+            return {
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'tiers': tiers
+            }
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the entries to disk, least recently used first
+
+        The file is written next to its destination and moved into place, so
+        a crash mid-write never leaves a truncated cache behind.
+
+        Args:
+            path: Destination file (defaults to the path given at creation)
+        """
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump([[list(key) if isinstance(key, tuple) else key, value] for key, value in entries],
+                      f, default=_encode_value)
+        os.replace(temp_path, path)
+
+    def load(self, path: Optional[str] = None) -> None:
+        """
+        Load entries saved by save(), keeping the most recent ones up to capacity
+
+        Args:
+            path: Source file (defaults to the path given at creation)
+        """
+        path = path or self.path
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f, object_hook=_decode_value)
+        except Exception as e:
+            print(f"Error loading utterance cache from {path}: {e}")
+            return
+
+        # JSON turns tuple keys into lists
+        entries = [(tuple(key) if isinstance(key, list) else key, value) for key, value in entries]
+
+        with self._lock:
+            for key, value in entries[-self.capacity:] if self.capacity else []:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)